@@ -0,0 +1,84 @@
+"""Import-time check: report what ``import flow_ir`` costs and fail on regressions.
+
+Runs each module import in a fresh interpreter under ``python -X importtime``.
+The check fails when a module that should be imported lazily shows up, or when
+the cumulative import time exceeds ``--budget-ms``. Intended for CI::
+
+    PYTHONPATH=src python benchmarks/importtime.py --budget-ms 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULES = ("flow_ir", "flow_ir.cli")
+
+# Only imported when a command actually needs them.
+LAZY_MODULES = (
+    "flow_ir.parsers.python_parser",
+    "flow_ir.parsers.c_simple_parser",
+    "flow_ir.parsers.tree_sitter_adapter",
+    "flow_ir.project",
+    "tree_sitter",
+    "multiprocessing",
+    "importlib.metadata",
+)
+
+
+def measure(module: str, runs: int) -> Tuple[float, Dict[str, float]]:
+    """Best-of-``runs`` cumulative import time of ``module`` in ms, plus every imported module's own time."""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+            check=True,
+        )
+        modules: Dict[str, float] = {}
+        total = 0.0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            own, cumulative, name = line[len("import time:") :].split("|", 2)
+            modules[name.strip()] = int(own) / 1000
+            if name.strip() == module:
+                total = int(cumulative) / 1000
+        if best is None or total < best[0]:
+            best = (total, modules)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", help="Module to import (repeatable).")
+    parser.add_argument("--runs", type=int, default=5, help="Take the best of this many runs (default: 5).")
+    parser.add_argument("--budget-ms", type=float, help="Fail when a module's cumulative import time exceeds this.")
+    parser.add_argument("--top", type=int, default=8, help="Show the slowest N modules (default: 8).")
+    args = parser.parse_args(argv)
+
+    failures: List[str] = []
+    for module in args.module or DEFAULT_MODULES:
+        total, modules = measure(module, args.runs)
+        print(f"{module:<12} {total:8.1f} ms")
+        for name, own in sorted(modules.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"    {own:7.1f} ms  {name}")
+        eager = [name for name in LAZY_MODULES if name in modules]
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} eagerly")
+        if args.budget_ms is not None and total > args.budget_ms:
+            failures.append(f"{module} took {total:.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
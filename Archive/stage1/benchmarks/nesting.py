@@ -0,0 +1,64 @@
+"""Stress benchmark: build control-flow graphs for very deeply nested code.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/nesting.py --depth 1000 --depth 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+from flow_ir.parsers.python_parser import PythonParser
+
+
+def nested_c(depth: int) -> str:
+    """A C function with ``depth`` nested ``if`` blocks."""
+    opening = "".join(f"if (x > {i}) {{\n" for i in range(depth))
+    return f"int f(int x) {{\n{opening}x++;\n{'}' * depth}\nreturn x;\n}}\n"
+
+
+def elif_chain(depth: int) -> str:
+    """A Python function with an ``if``/``elif`` chain ``depth`` branches long.
+
+    Python caps indentation at 100 levels, but every ``elif`` is another nested
+    ``ast.If`` so the chain exercises the same nesting in the builder.
+    """
+    branches = "".join(f"    elif x == {i}:\n        y = {i}\n" for i in range(1, depth))
+    return f"def f(x):\n    if x == 0:\n        y = 0\n{branches}    return y\n"
+
+
+def _time(parser, code: str) -> tuple:
+    start = time.perf_counter()
+    module = parser.parse_code(code)
+    elapsed = time.perf_counter() - start
+    nodes = len(module.functions[0].nodes) if module.functions else 0
+    return elapsed, nodes
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, action="append", help="Nesting depth (repeatable).")
+    parser.add_argument(
+        "--language", choices=("c", "python"), action="append", help="Only run these languages."
+    )
+    args = parser.parse_args(argv)
+
+    cases = {"c": (CSimpleParser, nested_c), "python": (PythonParser, elif_chain)}
+    for depth in args.depth or [1000, 5000]:
+        for language in args.language or list(cases):
+            build, generate = cases[language]
+            code = generate(depth)
+            try:
+                elapsed, nodes = _time(build(), code)
+            except (RecursionError, MemoryError):
+                # CPython's own parser gives up on very deep nesting; the builders do not.
+                print(f"{language:<7} depth={depth:<6} skipped: the language's own parser hit the recursion limit")
+                continue
+            print(f"{language:<7} depth={depth:<6} nodes={nodes:<7} {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
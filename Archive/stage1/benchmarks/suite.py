@@ -0,0 +1,290 @@
+"""Parser benchmark suite on synthetic Python and C sources.
+
+Each case generates a source file that scales one dimension (function count,
+nesting depth, statements per function or total size), then times parsing plus
+JSON serialization end to end for every parser that handles the language.
+``run`` writes the results as JSON; ``compare`` checks a run against a baseline
+and exits non-zero when a case got slower than the allowed threshold::
+
+    PYTHONPATH=src python benchmarks/suite.py run --output baseline.json
+    PYTHONPATH=src python benchmarks/suite.py run --output current.json
+    PYTHONPATH=src python benchmarks/suite.py compare baseline.json current.json --threshold 0.15
+
+``--preset large`` adds inputs of tens of MB; ``--preset quick`` is a smoke test.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from flow_ir import serializer
+from flow_ir.parsers.base import LanguageParser
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+from flow_ir.parsers.python_parser import PythonParser
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.15
+
+C_FUNCTION_QUERY = """
+(function_definition
+  declarator: (function_declarator
+    declarator: (identifier) @name)
+  body: (compound_statement) @body)
+"""
+
+
+def python_function(index: int, statements: int, depth: int) -> str:
+    """A function with ``statements`` simple statements inside ``depth`` nested blocks."""
+    lines = [f"def func_{index}(items, limit):", '    """Synthetic benchmark function."""', "    total = 0"]
+    for level in range(depth):
+        pad = "    " * (level + 1)
+        header = f"for item_{level} in items:" if level % 2 else f"if total < limit + {level}:"
+        lines.append(pad + header)
+    pad = "    " * (depth + 1)
+    for step in range(statements):
+        if step % 3 == 0:
+            lines.append(f"{pad}total = total + {step} * limit")
+        elif step % 3 == 1:
+            lines.append(f"{pad}log_value(total, {step})")
+        else:
+            lines.append(f"{pad}limit -= 1")
+    lines.append("    return total")
+    return "\n".join(lines) + "\n\n\n"
+
+
+def c_function(index: int, statements: int, depth: int) -> str:
+    """C counterpart of :func:`python_function`, with comments for the tokenizer to drop."""
+    lines = [f"/* Synthetic benchmark function {index}. */", f"int func_{index}(int *items, int limit)", "{"]
+    lines.append("    int total = 0; // running total")
+    for level in range(depth):
+        pad = "    " * (level + 1)
+        if level % 2:
+            lines.append(f"{pad}for (int i{level} = 0; i{level} < limit; i{level}++) {{")
+        else:
+            lines.append(f"{pad}if (total < limit + {level}) {{")
+    pad = "    " * (depth + 1)
+    for step in range(statements):
+        if step % 3 == 0:
+            lines.append(f"{pad}total = total + {step} * limit;")
+        elif step % 3 == 1:
+            lines.append(f"{pad}log_value(total, {step});")
+        else:
+            lines.append(f"{pad}limit--;")
+    for level in reversed(range(depth)):
+        lines.append("    " * (level + 1) + "}")
+    lines.append("    return total;")
+    lines.append("}")
+    return "\n".join(lines) + "\n\n"
+
+
+GENERATORS: Dict[str, Callable[[int, int, int], str]] = {"python": python_function, "c": c_function}
+
+
+def generate(language: str, functions: int, statements: int, depth: int) -> str:
+    make = GENERATORS[language]
+    return "".join(make(index, statements, depth) for index in range(functions))
+
+
+def generate_size(language: str, megabytes: float, statements: int = 12, depth: int = 3) -> Tuple[str, int]:
+    """A source of roughly ``megabytes`` MB and the number of functions it holds."""
+    per_function = len(GENERATORS[language](0, statements, depth).encode("utf-8"))
+    functions = max(1, int(megabytes * 1024 * 1024 / per_function))
+    return generate(language, functions, statements, depth), functions
+
+
+@dataclass
+class Case:
+    name: str
+    language: str
+    functions: int
+    statements: int = 10
+    depth: int = 2
+    megabytes: Optional[float] = None
+
+    def source(self) -> Tuple[str, int]:
+        if self.megabytes is not None:
+            return generate_size(self.language, self.megabytes)
+        return generate(self.language, self.functions, self.statements, self.depth), self.functions
+
+
+def cases(preset: str) -> List[Case]:
+    if preset == "quick":
+        functions, depths, statements, sizes = (50,), (5,), (50,), (0.25,)
+    elif preset == "large":
+        functions, depths, statements, sizes = (100, 1000, 10000), (10, 40), (100, 1000), (1, 5, 20, 50)
+    else:
+        functions, depths, statements, sizes = (100, 1000, 5000), (10, 40), (100, 1000), (1, 5)
+    result: List[Case] = []
+    for language in ("python", "c"):
+        result += [Case(f"{language}-functions-{n}", language, n) for n in functions]
+        result += [Case(f"{language}-depth-{d}", language, 50, depth=d) for d in depths]
+        result += [Case(f"{language}-statements-{s}", language, 20, statements=s, depth=1) for s in statements]
+        result += [Case(f"{language}-size-{mb:g}mb", language, 0, megabytes=mb) for mb in sizes]
+    return result
+
+
+def parsers_for(language: str) -> Iterator[Tuple[str, LanguageParser]]:
+    if language == "python":
+        yield "python", PythonParser()
+        return
+    yield "c", CSimpleParser()
+    adapter = _tree_sitter_c()
+    if adapter is not None:
+        yield "tree-sitter-c", adapter
+
+
+def _tree_sitter_c() -> Optional[LanguageParser]:
+    try:
+        from flow_ir.parsers.tree_sitter_adapter import TreeSitterAdapter, TreeSitterLanguageConfig
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            return TreeSitterAdapter(
+                TreeSitterLanguageConfig(
+                    language="tree-sitter-c", tree_sitter_language="c", function_query=C_FUNCTION_QUERY
+                )
+            )
+    except (ImportError, RuntimeError):
+        return None
+
+
+class _CountingWriter:
+    """Text sink that keeps only the number of characters written."""
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        return len(text)
+
+
+def time_case(parser: LanguageParser, code: str, repeat: int) -> Tuple[float, int]:
+    """Best wall time over ``repeat`` runs of parse + streamed JSON serialization, and the output size."""
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        sink = _CountingWriter()
+        start = time.perf_counter()
+        serializer.write_parsed_json(parser, code, sink, file_path="synthetic", indent=None)
+        best = min(best, time.perf_counter() - start)
+        size = sink.size
+    return best, size
+
+
+def run(args: argparse.Namespace) -> None:
+    selected = [case for case in cases(args.preset) if not args.only or any(key in case.name for key in args.only)]
+    results: Dict[str, Dict[str, object]] = {}
+    for case in selected:
+        code, functions = case.source()
+        size = len(code.encode("utf-8"))
+        repeat = args.repeat if size < 4 * 1024 * 1024 else 1
+        for parser_name, parser in parsers_for(case.language):
+            key = f"{parser_name}/{case.name}"
+            try:
+                seconds, output = time_case(parser, code, repeat)
+            except (RecursionError, MemoryError) as exc:
+                print(f"{key:<44} skipped: {type(exc).__name__}", file=sys.stderr)
+                continue
+            results[key] = {
+                "parser": parser_name,
+                "functions": functions,
+                "input_bytes": size,
+                "output_chars": output,
+                "seconds": round(seconds, 6),
+                "mb_per_s": round(size / 1024 / 1024 / seconds, 3) if seconds else None,
+            }
+            print(f"{key:<44} {size / 1024 / 1024:7.2f} MB {seconds * 1000:10.1f} ms", file=sys.stderr)
+
+    document = {"version": RESULTS_VERSION, "environment": _environment(args.preset), "results": results}
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        # stdout may be carrying the results JSON, so the table joins the progress lines.
+        raise SystemExit(compare_files(args.baseline, document, args.threshold, stream=sys.stderr))
+
+
+def compare_files(baseline_path: str, current, threshold: float, *, stream: Optional[TextIO] = None) -> int:
+    """Print a comparison table to ``stream`` (stdout by default) and return 1 on any regression."""
+    stream = stream or sys.stdout
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]
+    if isinstance(current, str):
+        with open(current, encoding="utf-8") as handle:
+            current = json.load(handle)
+    current = current["results"]
+
+    regressions = 0
+    print(f"{'case':<44}{'baseline ms':>13}{'current ms':>13}{'change':>9}", file=stream)
+    for key in sorted(set(baseline) | set(current)):
+        if key not in current:
+            print(f"{key:<44}{baseline[key]['seconds'] * 1000:>13.1f}{'missing':>13}", file=stream)
+            continue
+        if key not in baseline:
+            print(f"{key:<44}{'new':>13}{current[key]['seconds'] * 1000:>13.1f}", file=stream)
+            continue
+        before, after = baseline[key]["seconds"], current[key]["seconds"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{key:<44}{before * 1000:>13.1f}{after * 1000:>13.1f}{change:>+9.0%}{flag}", file=stream)
+    if regressions:
+        print(f"{regressions} case(s) slower than the baseline by more than {threshold:.0%}.", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def _environment(preset: str) -> Dict[str, object]:
+    return {
+        "preset": preset,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="Run the benchmark cases and write JSON results.")
+    run_cmd.add_argument("--preset", choices=("quick", "standard", "large"), default="standard")
+    run_cmd.add_argument("--only", action="append", help="Only run cases whose name contains this text.")
+    run_cmd.add_argument("--repeat", type=int, default=3, help="Best of this many runs for inputs under 4 MB.")
+    run_cmd.add_argument("--output", "-o", help="Write results here instead of stdout.")
+    run_cmd.add_argument("--baseline", help="Compare against this results file after running; the table goes to stderr.")
+    run_cmd.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare_cmd = commands.add_parser("compare", help="Compare two results files.")
+    compare_cmd.add_argument("baseline")
+    compare_cmd.add_argument("current")
+    compare_cmd.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction (default: %(default)s).",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args)
+    else:
+        raise SystemExit(compare_files(args.baseline, args.current, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
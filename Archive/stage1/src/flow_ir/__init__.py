@@ -1,18 +1,29 @@
 """Flow IR generation toolkit for Stage 1 of the bidirectional code–flowchart system."""
 
+from .blocks import BlockStats, merge_basic_blocks, merge_module_blocks
+from .lazy import LazyModuleIR
 from .models import EdgeIR, FunctionIR, ModuleIR, NodeIR
-from .registry import get_parser, list_languages, register_parser
-
-# Ensure default parser plugins are registered on import.
-from .parsers import python_parser as _python_parser  # noqa: F401
-from .parsers import c_simple_parser as _c_simple_parser  # noqa: F401
+# Parsers, including the built-in ones, are imported by the registry on first use.
+from .registry import (
+    get_parser,
+    list_languages,
+    pooled_parser,
+    register_lazy_parser,
+    register_parser,
+)
 
 __all__ = [
     "ModuleIR",
+    "LazyModuleIR",
     "FunctionIR",
     "NodeIR",
     "EdgeIR",
+    "BlockStats",
+    "merge_basic_blocks",
+    "merge_module_blocks",
     "register_parser",
+    "register_lazy_parser",
     "get_parser",
+    "pooled_parser",
     "list_languages",
 ]
@@ -0,0 +1,346 @@
+"""Compact binary container for ModuleIR with a lazily decoding, memory-mapped loader.
+
+Layout (all integers little-endian)::
+
+    header          magic, format version, function count, module string indices,
+                    string table offset, function index offset
+    functions       one record per function (see ``_FUNCTION``), followed by its
+                    parameter string indices, fixed-width node records and edge records
+    string table    count, end offsets, then one UTF-8 blob; every string is stored once
+    function index  (record offset, name string index) per function
+
+Node lines and columns are delta-encoded against the previous node of the same
+function. Metadata dictionaries are stored as JSON strings in the string table, so
+repeated shapes such as ``{}`` cost one entry for the whole file.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .models import EdgeIR, FunctionIR, ModuleIR, NodeIR, NodeKind, SourceLocation
+
+MAGIC = b"FIRB"
+FORMAT_VERSION = 1
+
+_NONE = 0xFFFFFFFF
+_HAS_LOCATION = 0x80
+
+_HEADER = struct.Struct("<4sHHIIIQQ")
+_FUNCTION = struct.Struct("<IIIIIII")
+_NODE = struct.Struct("<BIIIIiiI")
+_EDGE = struct.Struct("<IIII")
+_INDEX_ENTRY = struct.Struct("<QI")
+_U32 = struct.Struct("<I")
+
+_KINDS: List[NodeKind] = list(NodeKind)
+_KIND_CODES: Dict[NodeKind, int] = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._indices: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        index = self._indices.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._indices[value] = index
+            self._strings.append(value)
+        return index
+
+    def add_json(self, value: Optional[Dict[str, Any]]) -> int:
+        return self.add(json.dumps(value, sort_keys=True) if value else "{}")
+
+    def to_bytes(self) -> bytes:
+        blobs = [value.encode("utf-8") for value in self._strings]
+        ends = []
+        total = 0
+        for blob in blobs:
+            total += len(blob)
+            ends.append(total)
+        header = _U32.pack(len(blobs)) + struct.pack(f"<{len(ends)}I", *ends)
+        return header + b"".join(blobs)
+
+
+def module_to_bytes(module: ModuleIR) -> bytes:
+    """Encode a ModuleIR into the binary container format."""
+    strings = _StringTable()
+    language = strings.add(module.language)
+    metadata = strings.add_json(module.metadata)
+    body = bytearray()
+    index = []
+    for function in module.functions:
+        index.append((_HEADER.size + len(body), strings.add(function.name)))
+        _encode_function(function, strings, body)
+
+    string_offset = _HEADER.size + len(body)
+    string_bytes = strings.to_bytes()
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        len(module.functions),
+        language,
+        metadata,
+        string_offset,
+        string_offset + len(string_bytes),
+    )
+    index_bytes = b"".join(_INDEX_ENTRY.pack(offset, name) for offset, name in index)
+    return header + bytes(body) + string_bytes + index_bytes
+
+
+def _encode_function(function: FunctionIR, strings: _StringTable, out: bytearray) -> None:
+    out += _FUNCTION.pack(
+        strings.add(function.name),
+        strings.add(function.returns),
+        strings.add(function.docstring),
+        strings.add_json(function.metadata),
+        len(function.parameters),
+        len(function.nodes),
+        len(function.edges),
+    )
+    for parameter in function.parameters:
+        out += _U32.pack(strings.add(parameter))
+    prev_line = prev_column = 0
+    for node in function.nodes:
+        kind = _KIND_CODES[node.kind]
+        location = node.location
+        if location is not None:
+            kind |= _HAS_LOCATION
+            file_path = strings.add(location.file_path)
+            line_delta = location.line - prev_line
+            column_delta = location.column - prev_column
+            prev_line, prev_column = location.line, location.column
+        else:
+            file_path, line_delta, column_delta = _NONE, 0, 0
+        out += _NODE.pack(
+            kind,
+            strings.add(node.id),
+            strings.add(node.label),
+            strings.add(node.summary),
+            file_path,
+            line_delta,
+            column_delta,
+            strings.add_json(node.metadata if node.has_metadata else None),
+        )
+    for edge in function.edges:
+        out += _EDGE.pack(
+            strings.add(edge.source),
+            strings.add(edge.target),
+            strings.add(edge.label),
+            strings.add_json(edge.metadata if edge.has_metadata else None),
+        )
+
+
+def dump_module_binary(module: ModuleIR, path: Union[str, Path]) -> None:
+    """Write the binary encoding of a ModuleIR to disk."""
+    Path(path).write_bytes(module_to_bytes(module))
+
+
+class BinaryModule:
+    """Read-only view over a binary IR file.
+
+    The file is memory-mapped and only the header and function index are read on
+    open. Functions and strings are decoded the first time they are requested.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        size = len(self._buffer)
+        if size < _HEADER.size:
+            raise self._invalid("is too short to be a flow IR binary file")
+        (
+            magic,
+            version,
+            _reserved,
+            self._function_count,
+            language_index,
+            metadata_index,
+            string_offset,
+            index_offset,
+        ) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise self._invalid("is not a flow IR binary file")
+        if version != FORMAT_VERSION:
+            raise self._invalid(f"uses unsupported flow IR binary version {version}")
+        # The index is written last, so checking the table extents against the file
+        # size catches truncation anywhere before struct would hit the end.
+        if not _HEADER.size <= string_offset <= index_offset - _U32.size or (
+            index_offset + self._function_count * _INDEX_ENTRY.size != size
+        ):
+            raise self._invalid("is truncated or corrupt")
+        (string_count,) = _U32.unpack_from(self._buffer, string_offset)
+        self._blob_offset = string_offset + 4 + 4 * string_count
+        if self._blob_offset > index_offset:
+            raise self._invalid("is truncated or corrupt")
+        self._string_ends = struct.unpack_from(f"<{string_count}I", self._buffer, string_offset + 4)
+        if string_count and self._blob_offset + self._string_ends[-1] > index_offset:
+            raise self._invalid("is truncated or corrupt")
+        self._index_offset = index_offset
+        self._strings: Dict[int, str] = {}
+        self._json: Dict[int, Dict[str, Any]] = {}
+        self._names: Optional[Dict[str, int]] = None
+        self.language = self._string(language_index)
+        self.metadata = self._json_value(metadata_index)
+
+    def _invalid(self, reason: str) -> ValueError:
+        self.close()
+        return ValueError(f"{self.path} {reason}.")
+
+    def __enter__(self) -> "BinaryModule":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is None:
+            return
+        try:
+            self._buffer.release()
+            self._mmap.close()
+        except BufferError:
+            # Decoded slices still point into the map; it closes once they are freed.
+            pass
+        self._mmap = None
+
+    def __len__(self) -> int:
+        return self._function_count
+
+    @property
+    def function_names(self) -> List[str]:
+        return [self._string(name) for _, name in self._index_entries()]
+
+    def function(self, position: int) -> FunctionIR:
+        """Decode the function stored at ``position`` in the index."""
+        if not 0 <= position < self._function_count:
+            raise IndexError(position)
+        offset, _ = _INDEX_ENTRY.unpack_from(self._buffer, self._index_offset + position * _INDEX_ENTRY.size)
+        return self._decode_function(offset)
+
+    def get(self, name: str) -> Optional[FunctionIR]:
+        """Decode the first function called ``name``, or return None."""
+        position = self._name_index().get(name)
+        return self.function(position) if position is not None else None
+
+    def __iter__(self) -> Iterator[FunctionIR]:
+        for position in range(self._function_count):
+            yield self.function(position)
+
+    def to_module(self) -> ModuleIR:
+        return ModuleIR(language=self.language, functions=list(self), metadata=dict(self.metadata))
+
+    def _index_entries(self) -> Iterator[tuple]:
+        return _INDEX_ENTRY.iter_unpack(
+            self._buffer[self._index_offset : self._index_offset + self._function_count * _INDEX_ENTRY.size]
+        )
+
+    def _name_index(self) -> Dict[str, int]:
+        if self._names is None:
+            names: Dict[str, int] = {}
+            for position, (_, name) in enumerate(self._index_entries()):
+                names.setdefault(self._string(name), position)
+            self._names = names
+        return self._names
+
+    def _string(self, index: int) -> Optional[str]:
+        if index == _NONE:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            start = self._string_ends[index - 1] if index else 0
+            end = self._string_ends[index]
+            value = str(self._buffer[self._blob_offset + start : self._blob_offset + end], "utf-8")
+            self._strings[index] = value
+        return value
+
+    def _json_value(self, index: int) -> Dict[str, Any]:
+        value = self._json.get(index)
+        if value is None:
+            value = json.loads(self._string(index))
+            self._json[index] = value
+        # Callers may mutate the returned metadata, so hand out a copy.
+        return dict(value)
+
+    def _optional_json(self, index: int) -> Optional[Dict[str, Any]]:
+        # Nodes and edges allocate metadata lazily, so empty dictionaries stay unallocated.
+        if self._string(index) == "{}":
+            return None
+        return self._json_value(index)
+
+    def _decode_function(self, offset: int) -> FunctionIR:
+        buffer = self._buffer
+        name, returns, docstring, metadata, param_count, node_count, edge_count = _FUNCTION.unpack_from(
+            buffer, offset
+        )
+        offset += _FUNCTION.size
+        params = [self._string(i) for i in struct.unpack_from(f"<{param_count}I", buffer, offset)]
+        offset += 4 * param_count
+
+        nodes: List[NodeIR] = []
+        line = column = 0
+        for kind, node_id, label, summary, file_path, line_delta, column_delta, node_meta in _NODE.iter_unpack(
+            buffer[offset : offset + node_count * _NODE.size]
+        ):
+            location = None
+            if kind & _HAS_LOCATION:
+                line += line_delta
+                column += column_delta
+                location = SourceLocation(file_path=self._string(file_path), line=line, column=column)
+            nodes.append(
+                NodeIR(
+                    id=self._string(node_id),
+                    kind=_KINDS[kind & ~_HAS_LOCATION],
+                    label=self._string(label),
+                    summary=self._string(summary),
+                    location=location,
+                    metadata=self._optional_json(node_meta),
+                )
+            )
+        offset += node_count * _NODE.size
+
+        edges = [
+            EdgeIR(
+                source=self._string(source),
+                target=self._string(target),
+                label=self._string(label),
+                metadata=self._optional_json(edge_meta),
+            )
+            for source, target, label, edge_meta in _EDGE.iter_unpack(
+                buffer[offset : offset + edge_count * _EDGE.size]
+            )
+        ]
+        return FunctionIR(
+            name=self._string(name),
+            nodes=nodes,
+            edges=edges,
+            parameters=params,
+            returns=self._string(returns),
+            docstring=self._string(docstring),
+            metadata=self._json_value(metadata),
+        )
+
+
+def load_module_binary(path: Union[str, Path]) -> BinaryModule:
+    """Open a binary IR file for lazy access."""
+    return BinaryModule(path)
+
+
+__all__ = [
+    "BinaryModule",
+    "FORMAT_VERSION",
+    "dump_module_binary",
+    "load_module_binary",
+    "module_to_bytes",
+]
@@ -0,0 +1,172 @@
+"""Basic-block compaction for function graphs.
+
+The parsers emit one node per statement, so straight-line code becomes a long
+chain of nodes. :func:`merge_basic_blocks` folds every maximal chain of plain
+statements that has a single entry and a single exit into one node whose label
+joins the statements in order. The pass visits each node and edge a constant
+number of times.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .models import EdgeIR, FunctionIR, ModuleIR, NodeIR, NodeKind
+
+MERGEABLE_KINDS = frozenset({NodeKind.STATEMENT, NodeKind.CALL})
+
+
+@dataclass
+class BlockStats:
+    """Node and edge counts before and after basic-block compaction."""
+
+    nodes_before: int = 0
+    nodes_after: int = 0
+    edges_before: int = 0
+    edges_after: int = 0
+
+    @property
+    def node_reduction(self) -> float:
+        return 1 - self.nodes_after / self.nodes_before if self.nodes_before else 0.0
+
+    @property
+    def edge_reduction(self) -> float:
+        return 1 - self.edges_after / self.edges_before if self.edges_before else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "nodes_before": self.nodes_before,
+            "nodes_after": self.nodes_after,
+            "edges_before": self.edges_before,
+            "edges_after": self.edges_after,
+            "node_reduction": self.node_reduction,
+            "edge_reduction": self.edge_reduction,
+        }
+
+    def describe(self) -> str:
+        return (
+            f"basic blocks: nodes {self.nodes_before} -> {self.nodes_after} "
+            f"({self.node_reduction:.0%} fewer), edges {self.edges_before} -> {self.edges_after} "
+            f"({self.edge_reduction:.0%} fewer)"
+        )
+
+
+def merge_basic_blocks(function: FunctionIR, stats: Optional[BlockStats] = None) -> FunctionIR:
+    """Return a copy of ``function`` with straight-line statement chains merged.
+
+    Two nodes are merged when both are plain statements without metadata, the
+    first has exactly one outgoing edge, that edge is unlabeled, and it is the
+    second node's only incoming edge. The merged node keeps the first node's id
+    and location; its metadata lists the merged node ids and the location of
+    the last statement in the block.
+    """
+    nodes = {node.id: node for node in function.nodes}
+    outgoing: Dict[str, List[EdgeIR]] = {}
+    incoming_count: Dict[str, int] = {}
+    for edge in function.edges:
+        outgoing.setdefault(edge.source, []).append(edge)
+        incoming_count[edge.target] = incoming_count.get(edge.target, 0) + 1
+
+    def mergeable(node: Optional[NodeIR]) -> bool:
+        return node is not None and node.kind in MERGEABLE_KINDS and not node.has_metadata
+
+    def next_in_block(node: NodeIR) -> Optional[NodeIR]:
+        edges = outgoing.get(node.id)
+        if not edges or len(edges) != 1 or edges[0].label is not None:
+            return None
+        successor = nodes.get(edges[0].target)
+        if successor is node or not mergeable(successor) or incoming_count.get(successor.id) != 1:
+            return None
+        return successor
+
+    # A node continues a block when its single predecessor links to it; every other
+    # mergeable node starts one.
+    continues = set()
+    for node in function.nodes:
+        if mergeable(node):
+            successor = next_in_block(node)
+            if successor is not None:
+                continues.add(successor.id)
+
+    merged_into: Dict[str, str] = {}
+    tails: Dict[str, str] = {}
+    new_nodes: List[NodeIR] = []
+    for node in function.nodes:
+        if node.id in continues:
+            continue
+        if not mergeable(node):
+            new_nodes.append(node)
+            continue
+        members = [node]
+        successor = next_in_block(node)
+        while successor is not None and successor.id not in merged_into and successor is not node:
+            members.append(successor)
+            merged_into[successor.id] = node.id
+            successor = next_in_block(successor)
+        merged_into[node.id] = node.id
+        tails[node.id] = members[-1].id
+        new_nodes.append(_block_node(members) if len(members) > 1 else node)
+    # A closed ring of statements has no block head; keep such (unreachable) nodes as they are.
+    new_nodes.extend(node for node in function.nodes if node.id in continues and node.id not in merged_into)
+
+    new_edges: List[EdgeIR] = []
+    for edge in function.edges:
+        head = merged_into.get(edge.source)
+        if head is None:
+            new_edges.append(edge)
+        elif tails[head] == edge.source:
+            # Only the block's last statement leaves the block.
+            if head != edge.source:
+                edge = EdgeIR(
+                    source=head,
+                    target=edge.target,
+                    label=edge.label,
+                    metadata=edge.metadata if edge.has_metadata else None,
+                )
+            new_edges.append(edge)
+
+    if stats is not None:
+        stats.nodes_before += len(function.nodes)
+        stats.nodes_after += len(new_nodes)
+        stats.edges_before += len(function.edges)
+        stats.edges_after += len(new_edges)
+
+    return FunctionIR(
+        name=function.name,
+        nodes=new_nodes,
+        edges=new_edges,
+        parameters=function.parameters,
+        returns=function.returns,
+        docstring=function.docstring,
+        metadata=function.metadata,
+    )
+
+
+def _block_node(members: List[NodeIR]) -> NodeIR:
+    head, tail = members[0], members[-1]
+    kinds = {member.kind for member in members}
+    summaries = [member.summary for member in members if member.summary]
+    block = {"node_ids": [member.id for member in members]}
+    if tail.location is not None:
+        block["end"] = tail.location.to_dict()
+    return NodeIR(
+        id=head.id,
+        kind=head.kind if len(kinds) == 1 else NodeKind.STATEMENT,
+        label="\n".join(member.label for member in members),
+        summary="\n".join(summaries) if summaries else None,
+        location=head.location,
+        metadata={"basic_block": block},
+    )
+
+
+def merge_module_blocks(module: ModuleIR, stats: Optional[BlockStats] = None) -> ModuleIR:
+    """Apply :func:`merge_basic_blocks` to every function of ``module``."""
+    return ModuleIR(
+        language=module.language,
+        functions=[merge_basic_blocks(function, stats) for function in module.functions],
+        metadata=module.metadata,
+    )
+
+
+__all__ = ["BlockStats", "MERGEABLE_KINDS", "merge_basic_blocks", "merge_module_blocks"]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .models import FunctionIR
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a FunctionCache was used."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def describe(self) -> str:
+        lookups = self.hits + self.misses
+        ratio = f"{self.hits / lookups:.0%}" if lookups else "n/a"
+        return (
+            f"cache: {self.hits} hit(s), {self.misses} miss(es) ({ratio} hit rate), "
+            f"{self.writes} write(s), {self.evictions} eviction(s)"
+        )
+
+
+class FunctionCache:
+    """Content-addressed on-disk cache of FunctionIR graphs.
+
+    Entries are keyed by a hash of the parser language, parser version and the
+    function's source span, so an edit to one function only invalidates that
+    function. The span is exactly what the graph is built from: a Python span
+    starts at ``def`` (so it covers the return annotation) and decorators are
+    left out because the graph does not record them; a tree-sitter span starts
+    at the function name because the adapter records neither return type nor
+    signature. Line numbers are stored relative to the function's first line and
+    rebased on lookup, which keeps entries valid when the function moves within
+    its file. Least recently used entries are evicted once the directory grows
+    beyond ``max_bytes``; recency is tracked through file modification times.
+    """
+
+    def __init__(self, directory: Union[str, Path], *, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(language: str, version: str, source: str, column: int = 0) -> str:
+        digest = hashlib.sha256()
+        for part in (language, version, str(column)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, *, line: int, file_path: str) -> Optional[FunctionIR]:
+        path = self._path(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            function = FunctionIR.from_dict(payload["function"])
+            delta = line - payload["line"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # A torn or hand-edited entry is a miss; the rebuild overwrites it.
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats.hits += 1
+        for node in function.nodes:
+            if node.location is not None:
+                node.location.line += delta
+                node.location.file_path = file_path
+        return function
+
+    def put(self, key: str, function: FunctionIR, *, line: int) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"line": line, "function": function.to_dict()}).encode("utf-8")
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            return
+        self.stats.writes += 1
+        self._size = self._current_size() + len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self._size = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Tuple[Path, float, int]]:
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        return self._size
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        # Trim to 90% of the budget so eviction does not run on every subsequent write.
+        target = int(self.max_bytes * 0.9)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.stats.evictions += 1
+        self._size = total
+
+
+__all__ = ["CacheStats", "FunctionCache", "DEFAULT_MAX_BYTES"]
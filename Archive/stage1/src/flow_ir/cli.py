@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, TextIO
 
-from . import serializer
+from . import profiling, serializer
+from .binary import dump_module_binary
+from .blocks import BlockStats, merge_basic_blocks
+from .cache import DEFAULT_MAX_BYTES, FunctionCache
+from .models import ModuleIR
 from .registry import get_parser, list_languages
 
 
@@ -16,8 +25,92 @@ def main(argv: Optional[list[str]] = None) -> None:
     parse_cmd = subparsers.add_parser("parse", help="Parse a single source file into Flow IR JSON.")
     parse_cmd.add_argument("path", type=Path, help="Source file to parse.")
     parse_cmd.add_argument("--language", "-l", required=True, help="Language identifier (see list-languages).")
-    parse_cmd.add_argument("--out", "-o", type=Path, help="Optional output file (defaults to stdout).")
+    parse_cmd.add_argument(
+        "--out",
+        "-o",
+        type=Path,
+        help=(
+            "Optional output file, replaced only when parsing succeeds (defaults to stdout, which is "
+            "streamed and complete only when the exit status is 0)."
+        ),
+    )
+    parse_cmd.add_argument(
+        "--buffer",
+        action="store_true",
+        help="Hold stdout output until the whole file has parsed, so a failed parse prints nothing.",
+    )
     parse_cmd.add_argument("--indent", type=int, default=2, help="JSON indentation (default: 2).")
+    parse_cmd.add_argument(
+        "--format",
+        choices=("json", "ndjson", "binary"),
+        default="json",
+        help=(
+            "Output format: one JSON document, NDJSON with one function per line, "
+            "or the compact binary container (requires --out) (default: json)."
+        ),
+    )
+    parse_cmd.add_argument(
+        "--join-threshold",
+        type=int,
+        help="Insert a join node when more than this many branches converge on one statement.",
+    )
+    parse_cmd.add_argument(
+        "--basic-blocks",
+        action="store_true",
+        help="Merge straight-line statement chains into single basic-block nodes.",
+    )
+    parse_cmd.add_argument(
+        "--block-stats",
+        action="store_true",
+        help="With --basic-blocks, print the node and edge reduction to stderr.",
+    )
+    parse_cmd.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase and per-function timings and allocation counts to stderr.",
+    )
+    parse_cmd.add_argument(
+        "--profile-trace",
+        type=Path,
+        help="Write the per-phase profile as Chrome trace-event JSON to this file.",
+    )
+    parse_cmd.add_argument(
+        "--cache-dir", type=Path, help="Reuse function graphs from this on-disk cache directory."
+    )
+    parse_cmd.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Evict least recently used cache entries beyond this size (default: %(default)s).",
+    )
+    parse_cmd.add_argument(
+        "--cache-stats", action="store_true", help="Print cache hit/miss counters to stderr."
+    )
+
+    project_cmd = subparsers.add_parser(
+        "parse-project", help="Parse every supported source file under a directory."
+    )
+    project_cmd.add_argument("root", type=Path, help="Project directory to walk.")
+    project_cmd.add_argument(
+        "--language",
+        "-l",
+        action="append",
+        dest="languages",
+        help="Only parse files of this language (repeatable; default: all registered).",
+    )
+    project_cmd.add_argument(
+        "--out-dir", type=Path, help="Write one <file>.flow.json per source file, mirroring the tree."
+    )
+    project_cmd.add_argument(
+        "--index", type=Path, help="Write all modules into one combined JSON index file."
+    )
+    project_cmd.add_argument(
+        "--workers", "-j", type=int, help="Worker processes (default: CPU count; 1 disables the pool)."
+    )
+    project_cmd.add_argument(
+        "--chunksize", type=int, default=8, help="Files handed to a worker at a time (default: 8)."
+    )
+    project_cmd.add_argument("--indent", type=int, default=2, help="JSON indentation (default: 2).")
 
     subparsers.add_parser("list-languages", help="List registered languages.")
 
@@ -29,13 +122,132 @@ def main(argv: Optional[list[str]] = None) -> None:
         return
 
     if args.command == "parse":
-        module = get_parser(args.language).parse_file(args.path)
-        output = serializer.module_to_json(module, indent=args.indent)
-        if args.out:
-            args.out.write_text(output, encoding="utf-8")
+        if not (args.profile or args.profile_trace):
+            _run_parse(args)
+            return
+        with profiling.profile() as profiler:
+            _run_parse(args)
+        if args.profile:
+            print(profiler.format_table(), file=sys.stderr)
+        if args.profile_trace:
+            profiler.write_chrome_trace(args.profile_trace)
+        return
+
+    if args.command == "parse-project":
+        _run_parse_project(args)
+
+
+def _run_parse(args: argparse.Namespace) -> None:
+    language_parser = get_parser(args.language)
+    language_parser.join_threshold = args.join_threshold
+    if args.cache_dir:
+        language_parser.cache = FunctionCache(
+            args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024
+        )
+    code = args.path.read_text(encoding="utf-8")
+    file_path = str(args.path)
+    # Functions are built, written and released one at a time.
+    functions = language_parser.iter_functions(code, file_path=file_path)
+    block_stats = None
+    if args.basic_blocks:
+        block_stats = BlockStats()
+        functions = (merge_basic_blocks(function, block_stats) for function in functions)
+    metadata = {"file_path": file_path}
+    if args.format == "binary":
+        if not args.out:
+            raise SystemExit("--out is required with --format binary")
+        module = ModuleIR(language=language_parser.language, functions=list(functions), metadata=metadata)
+        with profiling.phase("serialize"):
+            dump_module_binary(module, args.out)
+    elif args.out:
+        with _replace_on_success(args.out) as handle:
+            _write_functions(language_parser.language, metadata, functions, handle, args)
+    elif args.buffer:
+        buffer = io.StringIO()
+        _write_functions(language_parser.language, metadata, functions, buffer, args)
+        sys.stdout.write(buffer.getvalue() + ("\n" if args.format == "json" else ""))
+    else:
+        # Streamed: a parse error part way through leaves the output already written.
+        _write_functions(language_parser.language, metadata, functions, sys.stdout, args)
+        sys.stdout.write("\n" if args.format == "json" else "")
+    if args.cache_stats and language_parser.cache is not None:
+        print(language_parser.cache.stats.describe(), file=sys.stderr)
+    if block_stats is not None and args.block_stats:
+        print(block_stats.describe(), file=sys.stderr)
+
+
+@contextmanager
+def _replace_on_success(path: Path) -> Iterator[TextIO]:
+    """Write to a temporary file next to ``path`` and move it into place only if the block succeeds.
+
+    Streaming output is written while parsing, so an error part way through must not leave
+    truncated JSON behind or clobber an earlier good file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            yield handle
+        # mkstemp creates the file private to the user; give it the mode a plain open() would.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _write_functions(language: str, metadata: dict, functions, fp, args: argparse.Namespace) -> None:
+    if args.format == "ndjson":
+        serializer.write_functions_ndjson(fp, language, metadata, functions)
+    else:
+        serializer.write_functions_json(fp, language, metadata, functions, indent=args.indent)
+
+
+def _run_parse_project(args: argparse.Namespace) -> None:
+    # Imported here: the process pool pulls in multiprocessing, which single-file runs never need.
+    from .project import parse_project
+
+    root: Path = args.root
+    if not root.is_dir():
+        raise SystemExit(f"Project directory not found: {root}")
+
+    index_modules = []
+    parsed = failed = 0
+    results = parse_project(
+        root, languages=args.languages, workers=args.workers, chunksize=args.chunksize
+    )
+    for result in results:
+        relative = Path(result.path).relative_to(root)
+        if result.error is not None:
+            failed += 1
+            print(f"Failed to parse {relative}: {result.error}", file=sys.stderr)
+            continue
+        parsed += 1
+        if args.out_dir:
+            target = args.out_dir / relative.parent / f"{relative.name}.flow.json"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            serializer.dump_module(result.module, target, indent=args.indent)
+        if args.index or not args.out_dir:
+            payload = serializer.module_to_dict(result.module)
+            payload["path"] = relative.as_posix()
+            index_modules.append(payload)
+
+    if args.index or not args.out_dir:
+        index = {"root": str(root), "modules": index_modules}
+        output = json.dumps(index, indent=args.indent)
+        if args.index:
+            args.index.write_text(output, encoding="utf-8")
         else:
             print(output)
 
+    print(f"Parsed {parsed} file(s), {failed} failed.", file=sys.stderr)
+    if failed:
+        raise SystemExit(1)
+
 
 if __name__ == "__main__":  # pragma: no cover
     main()
@@ -0,0 +1,335 @@
+"""Columnar in-memory storage for function graphs.
+
+:class:`ColumnarFunctionIR` keeps a function's nodes and edges as parallel
+columns instead of one Python object per node and edge: node kinds, lines and
+columns live in ``array`` buffers, edge endpoints are stored as node indices, and
+the rarely populated fields (summaries, edge labels, metadata) are sparse
+dictionaries keyed by position. Holding many modules this way costs a fraction
+of the memory of the object graph.
+
+``nodes`` and ``edges`` are read-only sequences of thin views that expose the
+same attributes as :class:`NodeIR` and :class:`EdgeIR`, so serializers and other
+read-only consumers work unchanged. Call :meth:`ColumnarFunctionIR.to_function`
+to get a mutable :class:`FunctionIR` back.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .models import EdgeIR, FunctionIR, ModuleIR, NodeIR, NodeKind, SourceLocation
+
+_NO_LOCATION = 0xFFFFFFFF
+
+_KINDS: List[NodeKind] = list(NodeKind)
+_KIND_CODES: Dict[NodeKind, int] = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+class ColumnarFunctionIR:
+    """Column-oriented, read-only counterpart of :class:`FunctionIR`."""
+
+    __slots__ = (
+        "name",
+        "parameters",
+        "returns",
+        "docstring",
+        "metadata",
+        "_ids",
+        "_labels",
+        "_kinds",
+        "_paths",
+        "_path_codes",
+        "_lines",
+        "_columns",
+        "_summaries",
+        "_node_metadata",
+        "_sources",
+        "_targets",
+        "_edge_labels",
+        "_edge_metadata",
+        "_node_count",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        nodes: Iterable[NodeIR],
+        edges: Iterable[EdgeIR],
+        parameters: Optional[List[str]] = None,
+        returns: Optional[str] = None,
+        docstring: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.parameters = list(parameters or [])
+        self.returns = returns
+        self.docstring = docstring
+        self.metadata = metadata if metadata is not None else {}
+
+        self._ids: List[str] = []
+        self._labels: List[str] = []
+        self._kinds = array("B")
+        self._paths: List[str] = []
+        self._path_codes = array("I")
+        self._lines = array("i")
+        self._columns = array("i")
+        self._summaries: Dict[int, str] = {}
+        self._node_metadata: Dict[int, Dict[str, Any]] = {}
+        path_index: Dict[str, int] = {}
+        for position, node in enumerate(nodes):
+            self._ids.append(node.id)
+            self._labels.append(node.label)
+            self._kinds.append(_KIND_CODES[node.kind])
+            location = node.location
+            if location is None:
+                self._path_codes.append(_NO_LOCATION)
+                self._lines.append(0)
+                self._columns.append(0)
+            else:
+                code = path_index.get(location.file_path)
+                if code is None:
+                    code = path_index[location.file_path] = len(self._paths)
+                    self._paths.append(location.file_path)
+                self._path_codes.append(code)
+                self._lines.append(location.line)
+                self._columns.append(location.column)
+            if node.summary is not None:
+                self._summaries[position] = node.summary
+            if node.has_metadata:
+                self._node_metadata[position] = node.metadata
+        self._node_count = len(self._ids)
+
+        # Endpoints index into ``_ids``; ids that name no node are appended after the nodes.
+        id_index = {node_id: position for position, node_id in enumerate(self._ids)}
+        self._sources = array("I")
+        self._targets = array("I")
+        self._edge_labels: Dict[int, str] = {}
+        self._edge_metadata: Dict[int, Dict[str, Any]] = {}
+        for position, edge in enumerate(edges):
+            self._sources.append(self._id_code(edge.source, id_index))
+            self._targets.append(self._id_code(edge.target, id_index))
+            if edge.label is not None:
+                self._edge_labels[position] = edge.label
+            if edge.has_metadata:
+                self._edge_metadata[position] = edge.metadata
+
+    def _id_code(self, node_id: str, id_index: Dict[str, int]) -> int:
+        code = id_index.get(node_id)
+        if code is None:
+            code = id_index[node_id] = len(self._ids)
+            self._ids.append(node_id)
+        return code
+
+    @classmethod
+    def from_function(cls, function: FunctionIR) -> "ColumnarFunctionIR":
+        return cls(
+            name=function.name,
+            nodes=function.nodes,
+            edges=function.edges,
+            parameters=function.parameters,
+            returns=function.returns,
+            docstring=function.docstring,
+            metadata=function.metadata,
+        )
+
+    @property
+    def nodes(self) -> "_NodeColumns":
+        return _NodeColumns(self)
+
+    @property
+    def edges(self) -> "_EdgeColumns":
+        return _EdgeColumns(self)
+
+    def to_function(self) -> FunctionIR:
+        """Materialize a regular, mutable :class:`FunctionIR`."""
+        return FunctionIR(
+            name=self.name,
+            nodes=[view.to_node() for view in self.nodes],
+            edges=[view.to_edge() for view in self.edges],
+            parameters=list(self.parameters),
+            returns=self.returns,
+            docstring=self.docstring,
+            metadata=dict(self.metadata),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "parameters": self.parameters,
+            "returns": self.returns,
+            "docstring": self.docstring,
+            "metadata": self.metadata,
+            "nodes": [node.to_dict() for node in self.nodes],
+            "edges": [edge.to_dict() for edge in self.edges],
+        }
+
+
+class _NodeColumns(Sequence):
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: ColumnarFunctionIR):
+        self._owner = owner
+
+    def __len__(self) -> int:
+        return self._owner._node_count
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [NodeView(self._owner, i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return NodeView(self._owner, position)
+
+
+class _EdgeColumns(Sequence):
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: ColumnarFunctionIR):
+        self._owner = owner
+
+    def __len__(self) -> int:
+        return len(self._owner._sources)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [EdgeView(self._owner, i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return EdgeView(self._owner, position)
+
+
+class NodeView:
+    """Read-only view of one node stored in a :class:`ColumnarFunctionIR`."""
+
+    __slots__ = ("_owner", "_position")
+
+    def __init__(self, owner: ColumnarFunctionIR, position: int):
+        self._owner = owner
+        self._position = position
+
+    @property
+    def id(self) -> str:
+        return self._owner._ids[self._position]
+
+    @property
+    def kind(self) -> NodeKind:
+        return _KINDS[self._owner._kinds[self._position]]
+
+    @property
+    def label(self) -> str:
+        return self._owner._labels[self._position]
+
+    @property
+    def summary(self) -> Optional[str]:
+        return self._owner._summaries.get(self._position)
+
+    @property
+    def location(self) -> Optional[SourceLocation]:
+        owner, position = self._owner, self._position
+        code = owner._path_codes[position]
+        if code == _NO_LOCATION:
+            return None
+        return SourceLocation(
+            file_path=owner._paths[code], line=owner._lines[position], column=owner._columns[position]
+        )
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._owner._node_metadata.get(self._position, {})
+
+    @property
+    def has_metadata(self) -> bool:
+        return self._position in self._owner._node_metadata
+
+    def to_node(self) -> NodeIR:
+        metadata = self._owner._node_metadata.get(self._position)
+        return NodeIR(
+            id=self.id,
+            kind=self.kind,
+            label=self.label,
+            summary=self.summary,
+            location=self.location,
+            metadata=dict(metadata) if metadata is not None else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_node().to_dict()
+
+    def __repr__(self) -> str:
+        return f"NodeView({self.to_node()!r})"
+
+
+class EdgeView:
+    """Read-only view of one edge stored in a :class:`ColumnarFunctionIR`."""
+
+    __slots__ = ("_owner", "_position")
+
+    def __init__(self, owner: ColumnarFunctionIR, position: int):
+        self._owner = owner
+        self._position = position
+
+    @property
+    def source(self) -> str:
+        return self._owner._ids[self._owner._sources[self._position]]
+
+    @property
+    def target(self) -> str:
+        return self._owner._ids[self._owner._targets[self._position]]
+
+    @property
+    def label(self) -> Optional[str]:
+        return self._owner._edge_labels.get(self._position)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._owner._edge_metadata.get(self._position, {})
+
+    @property
+    def has_metadata(self) -> bool:
+        return self._position in self._owner._edge_metadata
+
+    def to_edge(self) -> EdgeIR:
+        metadata = self._owner._edge_metadata.get(self._position)
+        return EdgeIR(
+            source=self.source,
+            target=self.target,
+            label=self.label,
+            metadata=dict(metadata) if metadata is not None else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_edge().to_dict()
+
+    def __repr__(self) -> str:
+        return f"EdgeView({self.to_edge()!r})"
+
+
+def compact_function(function: Union[FunctionIR, ColumnarFunctionIR]) -> ColumnarFunctionIR:
+    """Return the columnar form of ``function`` (unchanged if it already is one)."""
+    if isinstance(function, ColumnarFunctionIR):
+        return function
+    return ColumnarFunctionIR.from_function(function)
+
+
+def compact_module(module: ModuleIR) -> ModuleIR:
+    """Return a ModuleIR whose functions are stored in columnar form."""
+    return ModuleIR(
+        language=module.language,
+        functions=[compact_function(function) for function in module.functions],
+        metadata=module.metadata,
+    )
+
+
+__all__ = [
+    "ColumnarFunctionIR",
+    "EdgeView",
+    "NodeView",
+    "compact_function",
+    "compact_module",
+]
@@ -0,0 +1,162 @@
+"""Lazily built modules: function graphs are constructed the first time they are read."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from .models import FunctionIR, ModuleIR
+
+DEFAULT_MAX_CACHED = 32
+
+
+@dataclass
+class FunctionEntry:
+    """A function located by a parser's cheap indexing pass, plus how to build its graph."""
+
+    name: str
+    build: Callable[[], FunctionIR]
+    line: Optional[int] = None
+
+
+def build_entries(
+    entries: Iterable[FunctionEntry], skip_errors: Tuple[Type[BaseException], ...] = ()
+) -> Iterator[FunctionIR]:
+    """Build each entry in order, leaving out functions that fail with ``skip_errors``."""
+    for entry in entries:
+        if not skip_errors:
+            yield entry.build()
+            continue
+        try:
+            yield entry.build()
+        except skip_errors:
+            continue
+
+
+class LazyModuleIR:
+    """A ModuleIR whose function graphs are built on first access.
+
+    Parsing only indexes function names and spans. Built graphs are kept in a
+    least-recently-used cache of ``max_cached`` functions, so holding a large
+    file open costs little more than the functions actually being looked at.
+    ``functions`` is a read-only sequence, which lets the serializers stream a
+    lazy module like a regular one.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        entries: List[FunctionEntry],
+        metadata: Optional[Dict[str, Any]] = None,
+        *,
+        max_cached: int = DEFAULT_MAX_CACHED,
+        skip_errors: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.language = language
+        self.metadata = metadata if metadata is not None else {}
+        self.max_cached = max_cached
+        self.skip_errors = skip_errors
+        self._entries = entries
+        self._built: "OrderedDict[int, FunctionIR]" = OrderedDict()
+        self._names: Optional[Dict[str, int]] = None
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def function_names(self) -> List[str]:
+        return [entry.name for entry in self._entries]
+
+    @property
+    def entries(self) -> List[FunctionEntry]:
+        return list(self._entries)
+
+    @property
+    def functions(self) -> "_LazyFunctions":
+        return _LazyFunctions(self)
+
+    def function(self, position: int) -> FunctionIR:
+        """Return the graph of the function at ``position``, building it if needed.
+
+        Errors raised while building propagate, even those listed in ``skip_errors``.
+        """
+        function = self._built.get(position)
+        if function is not None:
+            self._built.move_to_end(position)
+            return function
+        function = self._entries[position].build()
+        self.builds += 1
+        if self.max_cached > 0:
+            self._built[position] = function
+            while len(self._built) > self.max_cached:
+                self._built.popitem(last=False)
+        return function
+
+    def get(self, name: str) -> Optional[FunctionIR]:
+        """Return the first function called ``name``, or None."""
+        if self._names is None:
+            names: Dict[str, int] = {}
+            for position, entry in enumerate(self._entries):
+                names.setdefault(entry.name, position)
+            self._names = names
+        position = self._names.get(name)
+        return self.function(position) if position is not None else None
+
+    def __iter__(self) -> Iterator[FunctionIR]:
+        for position in range(len(self._entries)):
+            if not self.skip_errors:
+                yield self.function(position)
+                continue
+            try:
+                function = self.function(position)
+            except self.skip_errors:
+                continue
+            yield function
+
+    def to_module(self) -> ModuleIR:
+        """Build every function and return a regular ModuleIR (identical to eager parsing)."""
+        return ModuleIR(language=self.language, functions=list(self), metadata=self.metadata)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "language": self.language,
+            "metadata": self.metadata,
+            "functions": [fn.to_dict() for fn in self],
+        }
+
+    def to_json(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+
+class _LazyFunctions(Sequence):
+    """Sequence view over a LazyModuleIR's functions.
+
+    Indexing builds a single function. Iteration matches eager parsing and
+    leaves out functions that fail with the module's ``skip_errors``.
+    """
+
+    __slots__ = ("_module",)
+
+    def __init__(self, module: LazyModuleIR):
+        self._module = module
+
+    def __len__(self) -> int:
+        return len(self._module)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._module.function(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._module.function(position)
+
+    def __iter__(self) -> Iterator[FunctionIR]:
+        return iter(self._module)
+
+
+__all__ = ["DEFAULT_MAX_CACHED", "FunctionEntry", "LazyModuleIR", "build_entries"]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+from .models import SourceLocation
+
+
+_UNIVERSAL_NEWLINE = re.compile(r"\r\n|\r|\n")
+
+
+class LineIndex:
+    """Maps character offsets to (line, column) pairs using a precomputed line-start table.
+
+    The table is built once per source text, so each lookup is a binary search instead of
+    a scan from the beginning of the file.
+    """
+
+    __slots__ = ("text", "line_starts", "_ascii", "_encoded_lines")
+
+    def __init__(self, text: str, *, universal_newlines: bool = False):
+        self.text = text
+        starts: List[int] = [0]
+        if universal_newlines and "\r" in text:
+            # Number lines the way Python's tokenizer does: "\r\n" and a lone "\r" also end a line.
+            starts.extend(match.end() for match in _UNIVERSAL_NEWLINE.finditer(text))
+        else:
+            find = text.find
+            pos = find("\n")
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find("\n", pos + 1)
+        self.line_starts = starts
+        self._ascii = text.isascii()
+        self._encoded_lines: Dict[int, bytes] = {}
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        """Return the 1-based line and 0-based column for a character offset."""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+
+    def offset(self, line: int, column: int = 0) -> int:
+        """Return the character offset for a 1-based line and 0-based column."""
+        if line < 1:
+            return column
+        if line > len(self.line_starts):
+            return len(self.text)
+        return self.line_starts[line - 1] + column
+
+    def utf8_offset(self, line: int, byte_column: int) -> int:
+        """Return the character offset for a 1-based line and a UTF-8 byte column.
+
+        ``ast`` reports ``col_offset``/``end_col_offset`` in bytes; for ASCII text
+        bytes and characters coincide and no line is ever encoded.
+        """
+        start = self.offset(line)
+        if self._ascii or byte_column == 0 or line < 1 or line > len(self.line_starts):
+            return start + byte_column
+        encoded = self._encoded_lines.get(line)
+        if encoded is None:
+            end = self.line_starts[line] if line < len(self.line_starts) else len(self.text)
+            encoded = self.text[start:end].encode("utf-8")
+            self._encoded_lines[line] = encoded
+        return start + len(encoded[:byte_column].decode("utf-8"))
+
+    def location(self, offset: int, file_path: str = "") -> SourceLocation:
+        line, column = self.line_col(offset)
+        return SourceLocation(file_path=file_path, line=line, column=column)
+
+
+__all__ = ["LineIndex"]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .lazy import LazyModuleIR
 
 
 class NodeKind(str, Enum):
@@ -17,9 +21,15 @@ class NodeKind(str, Enum):
     RETURN = "return"
     EXCEPTION = "exception"
     UNKNOWN = "unknown"
+    # Synthetic merge point inserted when many branches converge (see ``join_threshold``).
+    JOIN = "join"
 
 
-@dataclass
+# ``dataclass(slots=True)`` needs Python 3.10; older interpreters fall back to a plain dataclass.
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class SourceLocation:
     """Represents a single source location for traceability."""
 
@@ -34,17 +44,83 @@ class SourceLocation:
             "column": self.column,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SourceLocation":
+        return cls(file_path=data["file_path"], line=data["line"], column=data.get("column", 0))
+
 
-@dataclass
 class NodeIR:
-    """A normalized control-flow node."""
+    """A normalized control-flow node.
 
-    id: str
-    kind: NodeKind
-    label: str
-    summary: Optional[str] = None
-    location: Optional[SourceLocation] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    Instances use ``__slots__`` and only allocate a metadata dictionary once
+    ``metadata`` is read or assigned, since most nodes never carry any.
+    """
+
+    __slots__ = ("id", "kind", "label", "summary", "location", "_metadata")
+
+    def __init__(
+        self,
+        id: str,
+        kind: NodeKind,
+        label: str,
+        summary: Optional[str] = None,
+        location: Optional[SourceLocation] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.id = id
+        self.kind = kind
+        self.label = label
+        self.summary = summary
+        self.location = location
+        self._metadata = metadata
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value
+
+    @property
+    def has_metadata(self) -> bool:
+        """True when the node carries metadata; unlike ``metadata`` this never allocates."""
+        return bool(self._metadata)
+
+    def copy(self, **changes: Any) -> "NodeIR":
+        """Return a shallow copy with ``changes`` applied, like ``dataclasses.replace``."""
+        fields = {
+            "id": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "summary": self.summary,
+            "location": self.location,
+            "metadata": self._metadata,
+        }
+        fields.update(changes)
+        return NodeIR(**fields)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NodeIR):
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self.kind == other.kind
+            and self.label == other.label
+            and self.summary == other.summary
+            and self.location == other.location
+            and (self._metadata or {}) == (other._metadata or {})
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"NodeIR(id={self.id!r}, kind={self.kind!r}, label={self.label!r}, "
+            f"summary={self.summary!r}, location={self.location!r}, metadata={self._metadata or {}!r})"
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         data = {
@@ -52,30 +128,96 @@ class NodeIR:
             "kind": self.kind.value,
             "label": self.label,
             "summary": self.summary,
-            "metadata": self.metadata,
+            "metadata": self._metadata if self._metadata is not None else {},
         }
         if self.location is not None:
             data["location"] = self.location.to_dict()
         return data
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NodeIR":
+        location = data.get("location")
+        metadata = data.get("metadata")
+        return cls(
+            id=data["id"],
+            kind=NodeKind(data["kind"]),
+            label=data["label"],
+            summary=data.get("summary"),
+            location=SourceLocation.from_dict(location) if location is not None else None,
+            metadata=dict(metadata) if metadata else None,
+        )
+
 
-@dataclass
 class EdgeIR:
-    """A directed edge in the control-flow graph."""
+    """A directed edge in the control-flow graph.
 
-    source: str
-    target: str
-    label: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    Like :class:`NodeIR`, edges are slotted and allocate ``metadata`` lazily.
+    """
+
+    __slots__ = ("source", "target", "label", "_metadata")
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        label: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.source = source
+        self.target = target
+        self.label = label
+        self._metadata = metadata
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value
+
+    @property
+    def has_metadata(self) -> bool:
+        return bool(self._metadata)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EdgeIR):
+            return NotImplemented
+        return (
+            self.source == other.source
+            and self.target == other.target
+            and self.label == other.label
+            and (self._metadata or {}) == (other._metadata or {})
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"EdgeIR(source={self.source!r}, target={self.target!r}, label={self.label!r}, "
+            f"metadata={self._metadata or {}!r})"
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         data = {"source": self.source, "target": self.target}
         if self.label is not None:
             data["label"] = self.label
-        if self.metadata:
-            data["metadata"] = self.metadata
+        if self._metadata:
+            data["metadata"] = self._metadata
         return data
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EdgeIR":
+        metadata = data.get("metadata")
+        return cls(
+            source=data["source"],
+            target=data["target"],
+            label=data.get("label"),
+            metadata=dict(metadata) if metadata else None,
+        )
+
 
 @dataclass
 class FunctionIR:
@@ -100,6 +242,18 @@ class FunctionIR:
             "edges": [edge.to_dict() for edge in self.edges],
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FunctionIR":
+        return cls(
+            name=data["name"],
+            nodes=[NodeIR.from_dict(node) for node in data.get("nodes", [])],
+            edges=[EdgeIR.from_dict(edge) for edge in data.get("edges", [])],
+            parameters=list(data.get("parameters") or []),
+            returns=data.get("returns"),
+            docstring=data.get("docstring"),
+            metadata=dict(data.get("metadata") or {}),
+        )
+
 
 @dataclass
 class ModuleIR:
@@ -119,3 +273,22 @@ class ModuleIR:
     def to_json(self) -> Dict[str, Any]:
         """Alias used by serializers to produce JSON payloads."""
         return self.to_dict()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModuleIR":
+        return cls(
+            language=data["language"],
+            functions=[FunctionIR.from_dict(fn) for fn in data.get("functions", [])],
+            metadata=dict(data.get("metadata") or {}),
+        )
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "LazyModuleIR":
+        """Index a JSON or NDJSON module document; functions are decoded on first access.
+
+        See :func:`flow_ir.serializer.loads_module`; call ``to_module()`` on the result
+        for a fully built ModuleIR.
+        """
+        from .serializer import loads_module
+
+        return loads_module(data)
@@ -2,15 +2,60 @@ from __future__ import annotations
 
 import abc
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Iterator, List, Optional, Tuple, Type
 
-from ..models import ModuleIR
+from ..lazy import DEFAULT_MAX_CACHED, FunctionEntry, LazyModuleIR, build_entries
+from ..models import FunctionIR, ModuleIR
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..cache import FunctionCache
+
+
+def run_stack(root: Generator[Any, Any, Any]) -> Any:
+    """Run a recursive computation written as generators on an explicit stack.
+
+    Instead of calling itself, a step ``yield``s the generator for the nested step
+    and receives that step's return value back from the ``yield``. Exceptions
+    propagate outwards exactly as they would through ordinary calls, so nesting
+    depth is bounded by memory rather than the interpreter's recursion limit.
+    """
+    stack: List[Generator[Any, Any, Any]] = [root]
+    value: Any = None
+    error: Optional[BaseException] = None
+    while stack:
+        try:
+            if error is not None:
+                pending, error = error, None
+                child = stack[-1].throw(pending)
+            else:
+                child = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        except BaseException as exc:
+            stack.pop()
+            if not stack:
+                raise
+            error = exc
+            continue
+        stack.append(child)
+        value = None
+    return value
 
 
 class LanguageParser(abc.ABC):
     """Abstract base class for language-specific parsers."""
 
     language: str
+    # Bump when a parser's output changes so cached function graphs are invalidated.
+    version: str = "1"
+    cache: Optional["FunctionCache"] = None
+    # When set, more than this many branches converging on one statement are routed
+    # through a single join node instead of one edge per branch and target.
+    join_threshold: Optional[int] = None
+    # Errors that make a parser leave a function out of the module instead of failing.
+    skip_errors: Tuple[Type[BaseException], ...] = ()
 
     def __init__(self) -> None:
         if not getattr(self, "language", None):
@@ -30,3 +75,77 @@ class LanguageParser(abc.ABC):
         """Parse multiple files, yielding ModuleIR objects."""
         for path in paths:
             yield self.parse_file(path)
+
+    def iter_functions(self, code: str, *, file_path: Optional[str] = None) -> Iterator[FunctionIR]:
+        """Yield the function graphs of ``code`` one at a time, in source order.
+
+        Only the function currently being yielded is held, so huge sources can be
+        converted with bounded memory (see ``serializer.write_functions_json``).
+        The functions are the same ones ``parse_code`` would return.
+        """
+        entries = self._function_entries(code, file_path)
+        if entries is None:
+            yield from self.parse_code(code, file_path=file_path).functions
+            return
+        yield from build_entries(entries, self.skip_errors)
+
+    def parse_lazy(
+        self, code: str, *, file_path: Optional[str] = None, max_cached: int = DEFAULT_MAX_CACHED
+    ) -> LazyModuleIR:
+        """Index the functions in ``code`` and return a module that builds each graph on first access.
+
+        Parsers that cannot index functions separately fall back to parsing eagerly.
+        """
+        found = self._function_entries(code, file_path)
+        metadata = {"file_path": file_path}
+        if found is None:
+            module = self.parse_code(code, file_path=file_path)
+            entries = [FunctionEntry(fn.name, lambda fn=fn: fn) for fn in module.functions]
+            metadata = module.metadata
+        else:
+            entries = list(found)
+        return LazyModuleIR(
+            self.language,
+            entries,
+            metadata,
+            max_cached=max_cached,
+            skip_errors=self.skip_errors,
+        )
+
+    def parse_file_lazy(self, path: str | Path, *, max_cached: int = DEFAULT_MAX_CACHED) -> LazyModuleIR:
+        path_obj = Path(path)
+        code = path_obj.read_text(encoding="utf-8")
+        return self.parse_lazy(code, file_path=str(path_obj), max_cached=max_cached)
+
+    def _function_entries(self, code: str, file_path: Optional[str]) -> Optional[Iterable[FunctionEntry]]:
+        """Locate functions without building their graphs; None when unsupported.
+
+        The result may be a generator, letting ``iter_functions`` index and build in one pass.
+        """
+        return None
+
+    def _build_cached(
+        self,
+        source: str,
+        build: Callable[[], FunctionIR],
+        *,
+        line: int,
+        column: int,
+        file_path: str,
+    ) -> FunctionIR:
+        """Return the function graph for ``source`` from the cache, building it on a miss.
+
+        ``line``/``column`` give where the span starts in the current file and
+        ``file_path`` is the path recorded on node locations.
+        """
+        if self.cache is None:
+            return build()
+        version = self.version
+        if self.join_threshold is not None:
+            version = f"{version}+join{self.join_threshold}"
+        key = self.cache.key(self.language, version, source, column)
+        function = self.cache.get(key, line=line, file_path=file_path)
+        if function is None:
+            function = build()
+            self.cache.put(key, function, line=line)
+        return function
@@ -18,6 +18,7 @@ try:
                 declarator: (identifier) @name)
               body: (compound_statement) @body)
             """,
+            extensions=(".c", ".h"),
         )
     )
 except RuntimeError:
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import re
+import string
 from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from functools import partial
+from typing import Dict, Generator, List, Optional, Sequence, Tuple, Union
 
+from .. import profiling
+from ..lazy import FunctionEntry, build_entries
+from ..line_index import LineIndex
 from ..models import EdgeIR, FunctionIR, ModuleIR, NodeIR, NodeKind, SourceLocation
 from ..registry import register_parser
-from ..text_utils import summarize_expression, summarize_loop, summarize_statement
-from .base import LanguageParser
+from ..text_utils import summarize_node
+from .base import LanguageParser, run_stack
 
 
 _KEYWORDS = {
@@ -29,142 +34,97 @@ _KEYWORDS = {
     "__attribute__",
 }
 
-
-def _is_identifier_char(ch: str) -> bool:
-    return ch.isalnum() or ch == "_"
-
-
-def _is_identifier_start(ch: str) -> bool:
-    return ch.isalpha() or ch == "_"
-
-
-def _count_newlines(text: str, start: int, end: int) -> int:
-    return text.count("\n", start, end)
+# Whitespace is never matched, so ``finditer`` skips it without a Python-level step.
+# Comments are matched only so their contents are not tokenized; they are dropped.
+_TOKEN_PATTERN = re.compile(
+    r"""
+      //[^\n]*
+    | /\*.*?(?:\*/|\Z)
+    | "(?:\\.|[^"\\])*(?:"|\Z)
+    | '(?:\\.|[^'\\])*(?:'|\Z)
+    | \w+
+    | [(){}\[\];]
+    | [^\s\w"'(){}\[\];/]+
+    | /
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Token kinds. Brackets and semicolons use the character itself as their kind, and
+# the control-flow keywords the statement parser dispatches on use the keyword text.
+_WORD = "w"
+_NUMBER = "n"
+_STRING = "s"
+_CHAR = "c"
+_OTHER = "o"
+
+_CONTROL_WORDS = frozenset({"if", "else", "for", "while", "do", "return", "__attribute__"})
+
+_FIRST_CHAR_KINDS = {ch: ch for ch in "(){}[];"}
+_FIRST_CHAR_KINDS.update({ch: _WORD for ch in string.ascii_letters + "_"})
+_FIRST_CHAR_KINDS.update({ch: _NUMBER for ch in string.digits})
+_FIRST_CHAR_KINDS.update({'"': _STRING, "'": _CHAR})
+
+_OPENERS = {")": "(", "]": "[", "}": "{"}
 
 
 class _CodeView:
-    """Holds both original and comment-stripped code while preserving indices."""
+    """Tokenizes C source once and exposes token spans plus bracket-match tables."""
 
     def __init__(self, code: str):
         self.original = code
-        self.cleaned = self._strip_comments(code)
-
-    def _strip_comments(self, code: str) -> str:
-        out = []
-        i = 0
-        n = len(code)
-        state = "base"
-        while i < n:
-            ch = code[i]
-            nx = code[i + 1] if i + 1 < n else ""
-            if state == "base":
-                if ch == "/" and nx == "/":
-                    out.append("  ")
-                    i += 2
-                    state = "line_comment"
-                elif ch == "/" and nx == "*":
-                    out.append("  ")
-                    i += 2
-                    state = "block_comment"
-                elif ch == '"':
-                    out.append(ch)
-                    i += 1
-                    state = "string"
-                elif ch == "'":
-                    out.append(ch)
-                    i += 1
-                    state = "char"
-                else:
-                    out.append(ch)
-                    i += 1
-            elif state == "line_comment":
-                if ch == "\n":
-                    out.append("\n")
-                    i += 1
-                    state = "base"
-                else:
-                    out.append(" ")
-                    i += 1
-            elif state == "block_comment":
-                if ch == "*" and nx == "/":
-                    out.append("  ")
-                    i += 2
-                    state = "base"
-                elif ch == "\n":
-                    out.append("\n")
-                    i += 1
-                else:
-                    out.append(" ")
-                    i += 1
-            elif state == "string":
-                out.append(ch)
-                if ch == "\\" and nx:
-                    out.append(nx)
-                    i += 2
-                elif ch == '"':
-                    i += 1
-                    state = "base"
-                else:
-                    i += 1
-            elif state == "char":
-                out.append(ch)
-                if ch == "\\" and nx:
-                    out.append(nx)
-                    i += 2
-                elif ch == "'":
-                    i += 1
-                    state = "base"
-                else:
-                    i += 1
-        return "".join(out)
-
-    def skip_whitespace(self, idx: int, limit: Optional[int] = None) -> int:
-        limit = len(self.cleaned) if limit is None else limit
-        while idx < limit and self.cleaned[idx].isspace():
-            idx += 1
-        return idx
-
-    def find_matching(self, start: int, open_char: str, close_char: str) -> int:
-        depth = 0
-        i = start
-        n = len(self.cleaned)
-        in_string = False
-        in_char = False
-        while i < n:
-            ch = self.cleaned[i]
-            if ch == '"' and not in_char:
-                in_string = not in_string
-            elif ch == "'" and not in_string:
-                in_char = not in_char
-            elif not in_string and not in_char:
-                if ch == open_char:
-                    depth += 1
-                elif ch == close_char:
-                    depth -= 1
-                    if depth == 0:
-                        return i
-            if ch == "/" and i + 1 < n and not in_string and not in_char:
-                nxt = self.cleaned[i + 1]
-                if nxt == "/":  # skip to end of line
-                    i += 2
-                    while i < n and self.cleaned[i] != "\n":
-                        i += 1
-                    continue
-                if nxt == "*":  # skip block
-                    i += 2
-                    while i + 1 < n and not (self.cleaned[i] == "*" and self.cleaned[i + 1] == "/"):
-                        i += 1
-                    i += 2
-                    continue
-            i += 1
-        return -1
+        self.lines = LineIndex(code)
+        self.kinds: List[str] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.match: List[int] = []
+        self._tokenize(code)
+
+    def _tokenize(self, code: str) -> None:
+        kinds = self.kinds
+        starts = self.starts
+        ends = self.ends
+        match = self.match
+        kind_of = _FIRST_CHAR_KINDS.get
+        # Each bracket type is matched independently, mirroring the per-character
+        # scanner this replaced, so a stray brace cannot derail parenthesis matching.
+        stacks: Dict[str, List[int]] = {"(": [], "[": [], "{": []}
+        for m in _TOKEN_PATTERN.finditer(code):
+            start, end = m.span()
+            first = code[start]
+            kind = kind_of(first, _OTHER)
+            if kind == _WORD:
+                text = code[start:end]
+                if text in _CONTROL_WORDS:
+                    kind = text
+            elif first == "/" and end - start > 1:
+                continue  # comment
+            idx = len(kinds)
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(end)
+            match.append(-1)
+            if kind in stacks:
+                stacks[kind].append(idx)
+            elif kind in _OPENERS:
+                stack = stacks[_OPENERS[kind]]
+                if stack:
+                    open_idx = stack.pop()
+                    match[open_idx] = idx
+                    match[idx] = open_idx
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def text(self, tok: int) -> str:
+        return self.original[self.starts[tok] : self.ends[tok]]
+
+    def span_text(self, first: int, last: int) -> str:
+        """Original text from the start of token ``first`` through the end of token ``last``."""
+        return self.original[self.starts[first] : self.ends[last]].strip()
 
     def index_to_location(self, idx: int) -> SourceLocation:
-        line = self.cleaned.count("\n", 0, idx) + 1
-        # column: count chars after last newline in original code
-        last_newline = self.cleaned.rfind("\n", 0, idx)
-        col = idx - last_newline - 1 if last_newline != -1 else idx
-        return SourceLocation(file_path="", line=line, column=col)
+        return self.lines.location(idx)
 
 
 @dataclass
@@ -204,162 +164,157 @@ class DoWhileStatement(Statement):
     body: List[Statement]
 
 
+@dataclass
+class _FunctionSpan:
+    """Location of a function definition: signature offset plus body brace token indices."""
+
+    name: str
+    start: int
+    body_open: int
+    body_close: int
+
+
 class _FunctionExtractor:
-    """Extracts function spans from C source using heuristic scanning."""
+    """Extracts function spans from the token stream using heuristic scanning."""
 
     def __init__(self, code: _CodeView):
         self.code = code
 
-    def extract(self) -> List[Tuple[str, int, int, int, int]]:
-        clean = self.code.cleaned
-        n = len(clean)
-        i = 0
-        results: List[Tuple[str, int, int, int, int]] = []
-        while i < n:
-            ch = clean[i]
-            if not _is_identifier_start(ch):
-                i += 1
+    def extract(self) -> List[_FunctionSpan]:
+        code = self.code
+        kinds = code.kinds
+        match = code.match
+        n = len(kinds)
+        results: List[_FunctionSpan] = []
+        t = 0
+        while t < n:
+            if kinds[t] != _WORD or t + 1 >= n or kinds[t + 1] != "(":
+                t += 1
                 continue
-
-            ident_start = i
-            while i < n and _is_identifier_char(clean[i]):
-                i += 1
-            ident = clean[ident_start:i]
-
+            ident = code.text(t)
             if ident in _KEYWORDS:
+                t += 1
                 continue
 
-            j = self.code.skip_whitespace(i)
-            if j >= n or clean[j] != "(":
-                i = j
-                continue
-
-            param_end = self.code.find_matching(j, "(", ")")
+            param_end = match[t + 1]
             if param_end == -1:
-                i = j + 1
+                t += 1
                 continue
 
-            k = self.code.skip_whitespace(param_end + 1)
-            if clean.startswith("__attribute__", k):
-                attr_start = k + len("__attribute__")
-                attr_start = self.code.skip_whitespace(attr_start)
-                if attr_start < n and clean[attr_start] == "(":
-                    attr_end = self.code.find_matching(attr_start, "(", ")")
-                    if attr_end != -1:
-                        k = self.code.skip_whitespace(attr_end + 1)
-
-            if k >= n or clean[k] != "{":
-                i = param_end + 1
+            k = param_end + 1
+            if k + 1 < n and kinds[k] == "__attribute__" and kinds[k + 1] == "(":
+                attr_end = match[k + 1]
+                if attr_end != -1:
+                    k = attr_end + 1
+
+            if k >= n or kinds[k] != "{":
+                t = param_end + 1
                 continue
 
-            body_end = self.code.find_matching(k, "{", "}")
+            body_end = match[k]
             if body_end == -1:
                 break
 
-            signature_start = self._find_signature_start(clean, ident_start)
-            results.append((ident, signature_start, k, k + 1, body_end))
-            i = body_end + 1
+            results.append(_FunctionSpan(ident, self._find_signature_start(t), k, body_end))
+            t = body_end + 1
         return results
 
-    def _find_signature_start(self, clean: str, ident_start: int) -> int:
-        k = ident_start - 1
-        while k > 0 and clean[k] not in ";}":
-            k -= 1
-        if clean[k] in ";}":
-            return k + 1
+    def _find_signature_start(self, ident: int) -> int:
+        kinds = self.code.kinds
+        for tok in range(ident - 1, -1, -1):
+            kind = kinds[tok]
+            if kind == ";" or kind == "}":
+                return self.code.ends[tok]
         return 0
 
 
 class _StatementParser:
-    """Parses a function body into a hierarchical statement structure."""
+    """Parses a function body, given as a token range, into a hierarchical statement structure."""
 
     def __init__(self, code: _CodeView):
         self.code = code
 
     def parse_block(self, start: int, end: int) -> List[Statement]:
+        return run_stack(self._parse_block(start, end))
+
+    def _parse_block(self, start: int, end: int) -> Generator[object, object, List[Statement]]:
+        code = self.code
+        kinds = code.kinds
         statements: List[Statement] = []
-        i = start
-        while i < end:
-            i = self.code.skip_whitespace(i, end)
-            if i >= end:
-                break
-            snippet = self.code.cleaned[i:end]
-            if snippet.startswith("if") and self._is_word_boundary(i, i + 2):
-                stmt, i = self._parse_if(i, end)
-                statements.append(stmt)
-                continue
-            if snippet.startswith("for") and self._is_word_boundary(i, i + 3):
-                stmt, i = self._parse_loop(i, end, "for")
+        t = start
+        while t < end:
+            kind = kinds[t]
+            if kind == "if":
+                stmt, t = yield self._parse_if(t, end)
                 statements.append(stmt)
                 continue
-            if snippet.startswith("while") and self._is_word_boundary(i, i + 5):
-                stmt, i = self._parse_loop(i, end, "while")
+            if kind == "for" or kind == "while":
+                stmt, t = yield self._parse_loop(t, end, kind)
                 statements.append(stmt)
                 continue
-            if snippet.startswith("do") and self._is_word_boundary(i, i + 2):
-                stmt, i = self._parse_do_while(i, end)
+            if kind == "do":
+                stmt, t = yield self._parse_do_while(t, end)
                 statements.append(stmt)
                 continue
-            if snippet.startswith("return") and self._is_word_boundary(i, i + 6):
-                semi_idx = self._find_statement_end(i, end)
-                if semi_idx == -1:
+            if kind == "return":
+                semi = self._find_statement_end(t, end)
+                if semi == -1:
                     break
-                text = self.code.original[i:semi_idx + 1].strip()
-                statements.append(ReturnStatement(start=i, end=semi_idx + 1, text=text))
-                i = semi_idx + 1
+                statements.append(
+                    ReturnStatement(start=code.starts[t], end=code.ends[semi], text=code.span_text(t, semi))
+                )
+                t = semi + 1
                 continue
-            if snippet.startswith("{"):
-                block_end = self.code.find_matching(i, "{", "}")
+            if kind == "{":
+                block_end = code.match[t]
                 if block_end == -1:
                     break
-                inner = self.parse_block(i + 1, block_end)
-                statements.extend(inner)
-                i = block_end + 1
+                statements.extend((yield self._parse_block(t + 1, block_end)))
+                t = block_end + 1
                 continue
 
-            semi_idx = self._find_statement_end(i, end)
-            if semi_idx == -1:
+            semi = self._find_statement_end(t, end)
+            if semi == -1:
                 break
-            text = self.code.original[i:semi_idx + 1].strip()
-            statements.append(SimpleStatement(start=i, end=semi_idx + 1, text=text))
-            i = semi_idx + 1
+            statements.append(
+                SimpleStatement(start=code.starts[t], end=code.ends[semi], text=code.span_text(t, semi))
+            )
+            t = semi + 1
         return statements
 
-    def _parse_if(self, start: int, limit: int) -> Tuple[IfStatement, int]:
-        cond_start = self.code.skip_whitespace(start + 2, limit)
-        if cond_start >= limit or self.code.cleaned[cond_start] != "(":
+    def _parse_if(self, start: int, limit: int) -> Generator[object, object, Tuple[IfStatement, int]]:
+        code = self.code
+        cond_start = start + 1
+        if cond_start >= limit or code.kinds[cond_start] != "(":
             raise ValueError("Malformed if statement")
-        cond_end = self.code.find_matching(cond_start, "(", ")")
-        condition = self.code.original[cond_start + 1 : cond_end].strip()
-        body_start = self.code.skip_whitespace(cond_end + 1, limit)
-        true_block, next_index, body_end = self._parse_statement_block(body_start, limit)
+        cond_end = self._matching(cond_start)
+        condition = code.original[code.ends[cond_start] : code.starts[cond_end]].strip()
+        true_block, next_index, _ = yield self._parse_statement_block(cond_end + 1, limit)
         false_block: List[Statement] = []
-        next_index = self.code.skip_whitespace(next_index, limit)
-        if self.code.cleaned.startswith("else", next_index) and self._is_word_boundary(
-            next_index, next_index + 4
-        ):
-            else_start = self.code.skip_whitespace(next_index + 4, limit)
-            false_block, next_index, _ = self._parse_statement_block(else_start, limit)
+        if next_index < limit and code.kinds[next_index] == "else":
+            false_block, next_index, _ = yield self._parse_statement_block(next_index + 1, limit)
         stmt = IfStatement(
-            start=start,
-            end=next_index,
+            start=code.starts[start],
+            end=code.ends[next_index - 1],
             condition=condition,
             true_block=true_block,
             false_block=false_block,
         )
         return stmt, next_index
 
-    def _parse_loop(self, start: int, limit: int, loop_type: str) -> Tuple[LoopStatement, int]:
-        head_start = self.code.skip_whitespace(start + len(loop_type), limit)
-        if head_start >= limit or self.code.cleaned[head_start] != "(":
+    def _parse_loop(
+        self, start: int, limit: int, loop_type: str
+    ) -> Generator[object, object, Tuple[LoopStatement, int]]:
+        code = self.code
+        head_start = start + 1
+        if head_start >= limit or code.kinds[head_start] != "(":
             raise ValueError("Malformed loop")
-        head_end = self.code.find_matching(head_start, "(", ")")
-        header = self.code.original[start : head_end + 1].strip()
-        body_start = self.code.skip_whitespace(head_end + 1, limit)
-        body, next_index, _ = self._parse_statement_block(body_start, limit)
+        head_end = self._matching(head_start)
+        header = code.span_text(start, head_end)
+        body, next_index, _ = yield self._parse_statement_block(head_end + 1, limit)
         stmt = LoopStatement(
-            start=start,
-            end=next_index,
+            start=code.starts[start],
+            end=code.ends[next_index - 1],
             loop_type=loop_type,
             header=header,
             body=body,
@@ -367,21 +322,24 @@ class _StatementParser:
         )
         return stmt, next_index
 
-    def _parse_do_while(self, start: int, limit: int) -> Tuple[DoWhileStatement, int]:
-        body_start = self.code.skip_whitespace(start + 2, limit)
-        body, next_index, body_end = self._parse_statement_block(body_start, limit)
-        next_index = self.code.skip_whitespace(next_index, limit)
-        if not self.code.cleaned.startswith("while", next_index):
+    def _parse_do_while(
+        self, start: int, limit: int
+    ) -> Generator[object, object, Tuple[DoWhileStatement, int]]:
+        code = self.code
+        body, next_index, _ = yield self._parse_statement_block(start + 1, limit)
+        if next_index >= limit or code.kinds[next_index] != "while":
+            raise ValueError("Malformed do-while loop")
+        cond_head = next_index + 1
+        if cond_head >= limit or code.kinds[cond_head] != "(":
             raise ValueError("Malformed do-while loop")
-        cond_head = self.code.skip_whitespace(next_index + 5, limit)
-        cond_end = self.code.find_matching(cond_head, "(", ")")
-        condition = self.code.original[cond_head + 1 : cond_end].strip()
-        semi = self.code.skip_whitespace(cond_end + 1, limit)
-        if semi < limit and self.code.cleaned[semi] == ";":
+        cond_end = self._matching(cond_head)
+        condition = code.original[code.ends[cond_head] : code.starts[cond_end]].strip()
+        semi = cond_end + 1
+        if semi < limit and code.kinds[semi] == ";":
             semi += 1
         stmt = DoWhileStatement(
-            start=start,
-            end=semi,
+            start=code.starts[start],
+            end=code.ends[semi - 1],
             condition=condition,
             body=body,
         )
@@ -389,70 +347,73 @@ class _StatementParser:
 
     def _parse_statement_block(
         self, start: int, limit: int
-    ) -> Tuple[List[Statement], int, Optional[int]]:
+    ) -> Generator[object, object, Tuple[List[Statement], int, Optional[int]]]:
+        code = self.code
         if start >= limit:
             return [], start, None
-        if self.code.cleaned[start] == "{":
-            close = self.code.find_matching(start, "{", "}")
+        if code.kinds[start] == "{":
+            close = code.match[start]
             if close == -1:
                 raise ValueError("Unclosed block")
-            block_statements = self.parse_block(start + 1, close)
+            block_statements = yield self._parse_block(start + 1, close)
             return block_statements, close + 1, close
         semi = self._find_statement_end(start, limit)
         if semi == -1:
             raise ValueError("Unterminated statement")
-        stmt = self.code.original[start:semi + 1].strip()
-        return [SimpleStatement(start=start, end=semi + 1, text=stmt)], semi + 1, semi
+        stmt = SimpleStatement(start=code.starts[start], end=code.ends[semi], text=code.span_text(start, semi))
+        return [stmt], semi + 1, semi
+
+    def _matching(self, tok: int) -> int:
+        close = self.code.match[tok]
+        if close == -1:
+            raise ValueError("Unbalanced brackets")
+        return close
 
     def _find_statement_end(self, start: int, limit: int) -> int:
-        i = start
+        kinds = self.code.kinds
         depth_paren = depth_bracket = depth_brace = 0
-        in_string = False
-        in_char = False
-        while i < limit:
-            ch = self.code.cleaned[i]
-            if ch == '"' and not in_char:
-                in_string = not in_string
-            elif ch == "'" and not in_string:
-                in_char = not in_char
-            elif not in_string and not in_char:
-                if ch == "(":
-                    depth_paren += 1
-                elif ch == ")":
-                    depth_paren = max(0, depth_paren - 1)
-                elif ch == "[":
-                    depth_bracket += 1
-                elif ch == "]":
-                    depth_bracket = max(0, depth_bracket - 1)
-                elif ch == "{":
-                    depth_brace += 1
-                elif ch == "}":
-                    if depth_brace == 0:
-                        return i
-                    depth_brace = max(0, depth_brace - 1)
-                elif ch == ";" and depth_paren == depth_bracket == depth_brace == 0:
-                    return i
-            i += 1
+        for t in range(start, limit):
+            kind = kinds[t]
+            if kind == ";":
+                if depth_paren == depth_bracket == depth_brace == 0:
+                    return t
+            elif kind == "(":
+                depth_paren += 1
+            elif kind == ")":
+                depth_paren = max(0, depth_paren - 1)
+            elif kind == "[":
+                depth_bracket += 1
+            elif kind == "]":
+                depth_bracket = max(0, depth_bracket - 1)
+            elif kind == "{":
+                depth_brace += 1
+            elif kind == "}":
+                if depth_brace == 0:
+                    return t
+                depth_brace -= 1
         return -1
 
-    def _is_word_boundary(self, start: int, end: int) -> bool:
-        before = self.code.cleaned[start - 1] if start > 0 else " "
-        after = self.code.cleaned[end] if end < len(self.code.cleaned) else " "
-        return not _is_identifier_char(before) and not _is_identifier_char(after)
-
 
 class _CFlowBuilder:
-    def __init__(self, code: _CodeView, file_path: Optional[str]):
+    def __init__(self, code: _CodeView, file_path: Optional[str], join_threshold: Optional[int] = None):
         self.code = code
         self.file_path = file_path or "<memory>"
+        self.join_threshold = join_threshold
         self.nodes: List[NodeIR] = []
         self.edges: List[EdgeIR] = []
         self._counter = 0
         self._function_end_id: Optional[str] = None
+        self._summarize = profiling.timed("summarize", summarize_node)
 
-    def build_function(self, name: str, start: int, body_start: int, body_end: int) -> FunctionIR:
-        parser = _StatementParser(self.code)
-        statements = parser.parse_block(body_start, body_end)
+    def build_function(self, span: _FunctionSpan) -> FunctionIR:
+        with profiling.phase("parse_statements", span.name):
+            statements = _StatementParser(self.code).parse_block(span.body_open + 1, span.body_close)
+        with profiling.phase("build_cfg", span.name):
+            return self._build_graph(span, statements)
+
+    def _build_graph(self, span: _FunctionSpan, statements: List[Statement]) -> FunctionIR:
+        body_start = self.code.ends[span.body_open]
+        body_end = self.code.starts[span.body_close]
 
         self.nodes.clear()
         self.edges.clear()
@@ -464,12 +425,10 @@ class _CFlowBuilder:
         )
         self._function_end_id = end_node
 
-        exits = self._build_block(statements, [(start_node, None)])
-        for exit_id in exits:
-            if exit_id != end_node:
-                self.edges.append(EdgeIR(source=exit_id, target=end_node))
+        exits = run_stack(self._build_block(statements, [(start_node, None)]))
+        self._connect([(exit_id, None) for exit_id in exits if exit_id != end_node], [end_node])
 
-        signature = self.code.original[start:body_start - 1].strip()
+        signature = self.code.original[span.start : self.code.starts[span.body_open]].strip()
         params_match = re.search(r"\((.*)\)", signature, re.DOTALL)
         params = []
         if params_match:
@@ -478,7 +437,7 @@ class _CFlowBuilder:
                 params = [p.strip() for p in param_text.split(",")]
 
         return FunctionIR(
-            name=name,
+            name=span.name,
             parameters=params,
             nodes=list(self.nodes),
             edges=list(self.edges),
@@ -487,19 +446,24 @@ class _CFlowBuilder:
 
     def _build_block(
         self, statements: Sequence[Statement], incoming: List[Tuple[str, Optional[str]]]
-    ) -> List[str]:
+    ) -> Generator[object, object, List[str]]:
         if not statements:
             return [src for src, _ in incoming]
         current = list(incoming)
-        for stmt in statements:
+        exit_ids: List[str] = []
+        for index, stmt in enumerate(statements):
+            if index:
+                current = [(exit_id, None) for exit_id in exit_ids]
             slice_ = self._slice_for_statement(stmt)
+            if not isinstance(slice_, _GraphSlice):
+                slice_ = yield slice_
             self._connect(current, slice_.entry_ids)
-            current = [(exit_id, None) for exit_id in slice_.exit_ids]
-            if not current:
+            exit_ids = slice_.exit_ids
+            if not exit_ids:
                 break
-        return [src for src, _ in current]
+        return exit_ids
 
-    def _slice_for_statement(self, stmt: Statement) -> "_GraphSlice":
+    def _slice_for_statement(self, stmt: Statement) -> Union["_GraphSlice", "_Step"]:
         if isinstance(stmt, IfStatement):
             return self._handle_if(stmt)
         if isinstance(stmt, LoopStatement):
@@ -512,33 +476,36 @@ class _CFlowBuilder:
         node_id = self._add_node(NodeKind.STATEMENT, label, stmt.start)
         return _GraphSlice(entry_ids=[node_id], exit_ids=[node_id])
 
-    def _handle_if(self, stmt: IfStatement) -> "_GraphSlice":
+    def _handle_if(self, stmt: IfStatement) -> "_Step":
         label = f"if ({stmt.condition})"
         cond_id = self._add_node(NodeKind.CONDITIONAL, label, stmt.start)
-        true_exits = self._build_block(stmt.true_block, [(cond_id, "True")])
+        true_exits = yield self._build_block(stmt.true_block, [(cond_id, "True")])
         false_exits = (
-            self._build_block(stmt.false_block, [(cond_id, "False")])
+            (yield self._build_block(stmt.false_block, [(cond_id, "False")]))
             if stmt.false_block
             else [cond_id]
         )
-        exit_ids = list(dict.fromkeys(true_exits + false_exits))
+        # A non-empty branch only exits through nodes it created, so the exits can only
+        # overlap (on cond_id) when the true branch is empty.
+        if stmt.true_block:
+            exit_ids = true_exits + false_exits
+        else:
+            exit_ids = list(dict.fromkeys(true_exits + false_exits))
         return _GraphSlice(entry_ids=[cond_id], exit_ids=exit_ids)
 
-    def _handle_loop(self, stmt: LoopStatement) -> "_GraphSlice":
+    def _handle_loop(self, stmt: LoopStatement) -> "_Step":
         label = stmt.header
         loop_id = self._add_node(NodeKind.LOOP, label, stmt.start)
-        body_exits = self._build_block(stmt.body, [(loop_id, "Loop body")])
-        for exit_id in body_exits:
-            self.edges.append(EdgeIR(source=exit_id, target=loop_id, label="Iterate"))
+        body_exits = yield self._build_block(stmt.body, [(loop_id, "Loop body")])
+        self._connect([(exit_id, "Iterate") for exit_id in body_exits], [loop_id])
         exit_ids = [loop_id]
         return _GraphSlice(entry_ids=[loop_id], exit_ids=exit_ids)
 
-    def _handle_do_while(self, stmt: DoWhileStatement) -> "_GraphSlice":
+    def _handle_do_while(self, stmt: DoWhileStatement) -> "_Step":
         label = f"do-while ({stmt.condition})"
         loop_id = self._add_node(NodeKind.LOOP, label, stmt.start)
-        body_exits = self._build_block(stmt.body, [(loop_id, "Loop body")])
-        for exit_id in body_exits:
-            self.edges.append(EdgeIR(source=exit_id, target=loop_id, label="Iterate"))
+        body_exits = yield self._build_block(stmt.body, [(loop_id, "Loop body")])
+        self._connect([(exit_id, "Iterate") for exit_id in body_exits], [loop_id])
         exit_ids = [loop_id]
         return _GraphSlice(entry_ids=[loop_id], exit_ids=exit_ids)
 
@@ -549,12 +516,14 @@ class _CFlowBuilder:
         return _GraphSlice(entry_ids=[node_id], exit_ids=[])
 
     def _add_node(
-        self, kind: NodeKind, label: str, index: int, metadata: Optional[dict] = None
+        self, kind: NodeKind, label: str, index: Optional[int], metadata: Optional[dict] = None
     ) -> str:
         node_id = f"n{self._counter}"
         self._counter += 1
-        location = self.code.index_to_location(index)
-        location.file_path = self.file_path
+        location = None
+        if index is not None:
+            location = self.code.index_to_location(index)
+            location.file_path = self.file_path
         summary = self._summarize(kind, label)
         self.nodes.append(
             NodeIR(
@@ -563,23 +532,20 @@ class _CFlowBuilder:
                 label=label.strip(),
                 summary=summary,
                 location=location,
-                metadata=metadata or {},
+                metadata=metadata,
             )
         )
         return node_id
 
-    def _summarize(self, kind: NodeKind, label: str) -> str:
-        if kind is NodeKind.START:
-            return "Begin the function."
-        if kind is NodeKind.END:
-            return "Finish the function."
-        if kind is NodeKind.LOOP:
-            return summarize_loop(label)
-        if kind is NodeKind.CONDITIONAL:
-            return summarize_expression(label)
-        return summarize_statement(label)
-
     def _connect(self, sources: List[Tuple[str, Optional[str]]], targets: List[str]) -> None:
+        if not targets:
+            return
+        sources = list(dict.fromkeys(sources))
+        if self.join_threshold is not None and len(sources) > self.join_threshold:
+            join_id = self._add_node(NodeKind.JOIN, "Join", None)
+            for source, label in sources:
+                self.edges.append(EdgeIR(source=source, target=join_id, label=label))
+            sources = [(join_id, None)]
         for source, label in sources:
             for target in targets:
                 self.edges.append(EdgeIR(source=source, target=target, label=label))
@@ -591,27 +557,47 @@ class _GraphSlice:
     exit_ids: List[str]
 
 
+_Step = Generator[object, object, _GraphSlice]
+
+
 class CSimpleParser(LanguageParser):
     language = "c"
 
+    # Skip functions that fail to parse; they can be revisited with better heuristics.
+    skip_errors = (Exception,)
+
     def parse_code(self, code: str, *, file_path: Optional[str] = None) -> ModuleIR:
-        view = _CodeView(code)
-        extractor = _FunctionExtractor(view)
-        functions_meta = extractor.extract()
-        builder = _CFlowBuilder(view, file_path)
-        functions: List[FunctionIR] = []
-        for name, sig_start, brace_start, body_start, body_end in functions_meta:
-            try:
-                fn_ir = builder.build_function(name, sig_start, body_start, body_end)
-                functions.append(fn_ir)
-            except Exception:
-                # Skip functions that fail to parse; they can be revisited with better heuristics.
-                continue
+        functions = list(build_entries(self._function_entries(code, file_path), self.skip_errors))
         return ModuleIR(
             language=self.language,
             functions=functions,
             metadata={"file_path": file_path},
         )
 
+    def _function_entries(self, code: str, file_path: Optional[str]) -> List[FunctionEntry]:
+        with profiling.phase("tokenize"):
+            view = _CodeView(code)
+        with profiling.phase("extract_functions"):
+            spans = _FunctionExtractor(view).extract()
+        builder = _CFlowBuilder(view, file_path, self.join_threshold)
+        entries: List[FunctionEntry] = []
+        for span in spans:
+            line = view.lines.line_col(span.start)[0]
+            entries.append(FunctionEntry(span.name, partial(self._build_entry, builder, span), line=line))
+        return entries
+
+    def _build_entry(self, builder: _CFlowBuilder, span: _FunctionSpan) -> FunctionIR:
+        if self.cache is None:
+            return builder.build_function(span)
+        view = builder.code
+        line, column = view.lines.line_col(span.start)
+        return self._build_cached(
+            view.original[span.start : view.ends[span.body_close]],
+            lambda: builder.build_function(span),
+            line=line,
+            column=column,
+            file_path=builder.file_path,
+        )
+
 
-register_parser(CSimpleParser.language, CSimpleParser)
+register_parser(CSimpleParser.language, CSimpleParser, extensions=(".c", ".h"))
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
 import ast
+import re
 import textwrap
 from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from functools import partial
+from typing import Dict, Generator, Iterator, List, Optional, Sequence, Tuple, Union
 
+from .. import profiling
+from ..lazy import FunctionEntry
+from ..line_index import LineIndex
 from ..models import EdgeIR, FunctionIR, ModuleIR, NodeIR, NodeKind, SourceLocation
 from ..registry import register_parser
-from ..text_utils import (
-    summarize_condition,
-    summarize_expression,
-    summarize_loop,
-    summarize_statement,
-)
-from .base import LanguageParser
+from ..text_utils import summarize_node
+from .base import LanguageParser, run_stack
 
 
 @dataclass
@@ -22,18 +22,37 @@ class _GraphSlice:
     exit_ids: List[str]
 
 
+# Compound statements build their nested blocks as generators driven by ``run_stack``,
+# so nesting depth never grows the interpreter stack.
+_Step = Generator[object, object, _GraphSlice]
+
+
 class _PythonControlFlowBuilder:
     """Builds a simplified control-flow graph for Python functions."""
 
-    def __init__(self, code: str, file_path: Optional[str]):
+    def __init__(
+        self,
+        code: str,
+        file_path: Optional[str],
+        join_threshold: Optional[int] = None,
+        lines: Optional[LineIndex] = None,
+    ):
         self.code = code
         self.file_path = file_path or "<memory>"
+        self.join_threshold = join_threshold
+        self.lines = lines if lines is not None else LineIndex(code, universal_newlines=True)
+        self._dedented: Dict[str, str] = {}
         self.nodes: List[NodeIR] = []
         self.edges: List[EdgeIR] = []
         self._counter = 0
         self._function_end_id: Optional[str] = None
+        self._summarize = profiling.timed("summarize", summarize_node)
 
     def build_function(self, fn: ast.FunctionDef | ast.AsyncFunctionDef) -> FunctionIR:
+        with profiling.phase("build_cfg", fn.name):
+            return self._build_function(fn)
+
+    def _build_function(self, fn: ast.FunctionDef | ast.AsyncFunctionDef) -> FunctionIR:
         self.nodes.clear()
         self.edges.clear()
         self._counter = 0
@@ -42,10 +61,8 @@ class _PythonControlFlowBuilder:
         end_id = self._add_node(NodeKind.END, "End", fn, metadata={"reason": "function_terminator"})
         self._function_end_id = end_id
 
-        exits = self._build_block(fn.body, [(start_id, None)])
-        for exit_id in exits:
-            if exit_id != end_id:
-                self.edges.append(EdgeIR(source=exit_id, target=end_id))
+        exits = run_stack(self._build_block(fn.body, [(start_id, None)]))
+        self._connect_sources([(exit_id, None) for exit_id in exits if exit_id != end_id], [end_id])
 
         parameters = [arg.arg for arg in fn.args.args]
         returns = self._format_expression(fn.returns) if getattr(fn, "returns", None) else None
@@ -63,29 +80,44 @@ class _PythonControlFlowBuilder:
             },
         )
 
-    def _build_block(self, statements: Sequence[ast.stmt], incoming_edges: List[Tuple[str, Optional[str]]]) -> List[str]:
+    def _build_block(
+        self, statements: Sequence[ast.stmt], incoming_edges: List[Tuple[str, Optional[str]]]
+    ) -> Generator[object, object, List[str]]:
         if not statements:
             return [source for source, _ in incoming_edges]
 
         current_sources = list(incoming_edges)
-        for stmt in statements:
+        exit_ids: List[str] = []
+        for index, stmt in enumerate(statements):
+            if index:
+                current_sources = [(exit_id, None) for exit_id in exit_ids]
             slice_ = self._slice_for_statement(stmt)
+            if not isinstance(slice_, _GraphSlice):
+                slice_ = yield slice_
             self._connect_sources(current_sources, slice_.entry_ids)
-            current_sources = [(exit_id, None) for exit_id in slice_.exit_ids]
-            if not current_sources:
+            exit_ids = slice_.exit_ids
+            if not exit_ids:
                 # Return or raise terminates the flow; remaining statements are unreachable.
                 break
 
-        return [source for source, _ in current_sources]
+        # Handing the last slice's exits up unchanged keeps deeply nested blocks linear.
+        return exit_ids
 
     def _connect_sources(self, sources: List[Tuple[str, Optional[str]]], targets: List[str]) -> None:
         if not targets:
             return
+        sources = list(dict.fromkeys(sources))
+        if self.join_threshold is not None and len(sources) > self.join_threshold:
+            # Route the converging branches through one join node so edges stay linear.
+            join_id = self._add_node(NodeKind.JOIN, "Join", None)
+            for source, label in sources:
+                self.edges.append(EdgeIR(source=source, target=join_id, label=label))
+            sources = [(join_id, None)]
         for source, label in sources:
             for target in targets:
                 self.edges.append(EdgeIR(source=source, target=target, label=label))
 
-    def _slice_for_statement(self, stmt: ast.stmt) -> _GraphSlice:
+    def _slice_for_statement(self, stmt: ast.stmt) -> Union[_GraphSlice, _Step]:
         if isinstance(stmt, ast.If):
             return self._handle_if(stmt)
         if isinstance(stmt, (ast.For, ast.AsyncFor, ast.While)):
@@ -103,17 +135,18 @@ class _PythonControlFlowBuilder:
         node_id = self._add_node(NodeKind.STATEMENT, label, stmt)
         return _GraphSlice(entry_ids=[node_id], exit_ids=[node_id])
 
-    def _handle_if(self, stmt: ast.If) -> _GraphSlice:
+    def _handle_if(self, stmt: ast.If) -> _Step:
         label = f"if {self._format_expression(stmt.test)}"
         cond_id = self._add_node(NodeKind.CONDITIONAL, label, stmt.test)
 
-        true_exits = self._build_block(stmt.body, [(cond_id, "True")])
-        false_exits = self._build_block(stmt.orelse, [(cond_id, "False")]) if stmt.orelse else [cond_id]
+        true_exits = yield self._build_block(stmt.body, [(cond_id, "True")])
+        false_exits = (yield self._build_block(stmt.orelse, [(cond_id, "False")])) if stmt.orelse else [cond_id]
 
-        exit_ids = list(dict.fromkeys(true_exits + false_exits))
-        return _GraphSlice(entry_ids=[cond_id], exit_ids=exit_ids)
+        # The body is never empty and only exits through nodes it created, so the branch
+        # exits are disjoint and can be concatenated without deduplication.
+        return _GraphSlice(entry_ids=[cond_id], exit_ids=true_exits + false_exits)
 
-    def _handle_loop(self, stmt: ast.stmt) -> _GraphSlice:
+    def _handle_loop(self, stmt: ast.stmt) -> _Step:
         if isinstance(stmt, ast.While):
             label = f"while {self._format_expression(stmt.test)}"
         else:
@@ -123,19 +156,22 @@ class _PythonControlFlowBuilder:
             label = f"{prefix} {target} in {iter_}"
 
         loop_id = self._add_node(NodeKind.LOOP, label, stmt)
-        body_exits = self._build_block(stmt.body, [(loop_id, "Loop body")])
+        body_exits = yield self._build_block(stmt.body, [(loop_id, "Loop body")])
 
         # For now, connect body exits back to loop node to represent continuation.
-        for exit_id in body_exits:
-            self.edges.append(EdgeIR(source=exit_id, target=loop_id, label="Iterate"))
+        self._connect_sources([(exit_id, "Iterate") for exit_id in body_exits], [loop_id])
 
-        orelse_exits = self._build_block(stmt.orelse, [(loop_id, "Loop orelse")]) if getattr(stmt, "orelse", None) else [loop_id]
+        orelse_exits = (
+            (yield self._build_block(stmt.orelse, [(loop_id, "Loop orelse")]))
+            if getattr(stmt, "orelse", None)
+            else [loop_id]
+        )
         exit_ids = list(dict.fromkeys(orelse_exits + [loop_id]))
         return _GraphSlice(entry_ids=[loop_id], exit_ids=exit_ids)
 
-    def _handle_try(self, stmt: ast.Try) -> _GraphSlice:
+    def _handle_try(self, stmt: ast.Try) -> _Step:
         try_id = self._add_node(NodeKind.STATEMENT, "try", stmt)
-        body_exits = self._build_block(stmt.body, [(try_id, "Try body")])
+        body_exits = yield self._build_block(stmt.body, [(try_id, "Try body")])
 
         handler_exit_ids: List[str] = []
         for handler in stmt.handlers:
@@ -146,20 +182,22 @@ class _PythonControlFlowBuilder:
                 handler_label += f" as {handler.name}"
             handler_id = self._add_node(NodeKind.EXCEPTION, handler_label, handler)
             self.edges.append(EdgeIR(source=try_id, target=handler_id, label="Exception"))
-            exits = self._build_block(handler.body, [(handler_id, None)])
+            exits = yield self._build_block(handler.body, [(handler_id, None)])
             handler_exit_ids.extend(exits)
 
-        else_exit_ids = self._build_block(stmt.orelse, [(try_id, "Try else")]) if stmt.orelse else body_exits
-        finalizer_exits = self._build_block(stmt.finalbody, [(try_id, "Finally")]) if stmt.finalbody else else_exit_ids
+        else_exit_ids = (yield self._build_block(stmt.orelse, [(try_id, "Try else")])) if stmt.orelse else body_exits
+        finalizer_exits = (
+            (yield self._build_block(stmt.finalbody, [(try_id, "Finally")])) if stmt.finalbody else else_exit_ids
+        )
         exit_ids = list(dict.fromkeys(handler_exit_ids + finalizer_exits))
         return _GraphSlice(entry_ids=[try_id], exit_ids=exit_ids)
 
-    def _handle_with(self, stmt: ast.With | ast.AsyncWith) -> _GraphSlice:
+    def _handle_with(self, stmt: ast.With | ast.AsyncWith) -> _Step:
         prefix = "async with" if isinstance(stmt, ast.AsyncWith) else "with"
         items = ", ".join(self._format_withitem(item) for item in stmt.items)
         label = f"{prefix} {items}"
         with_id = self._add_node(NodeKind.STATEMENT, label, stmt)
-        exits = self._build_block(stmt.body, [(with_id, None)])
+        exits = yield self._build_block(stmt.body, [(with_id, None)])
         return _GraphSlice(entry_ids=[with_id], exit_ids=exits)
 
     def _handle_return(self, stmt: ast.Return) -> _GraphSlice:
@@ -218,36 +256,83 @@ class _PythonControlFlowBuilder:
                 label=label.strip(),
                 summary=summary,
                 location=location,
-                metadata=metadata or {},
+                metadata=metadata,
             )
         )
         return node_id
 
     def _get_source_segment(self, node: Optional[ast.AST]) -> str:
+        """Equivalent to ``ast.get_source_segment`` without re-splitting the source per call."""
         if node is None:
             return ""
         try:
-            return ast.get_source_segment(self.code, node) or ""
+            lineno, col_offset = node.lineno, node.col_offset
+            end_lineno, end_col_offset = node.end_lineno, node.end_col_offset
         except AttributeError:
             return ""
+        if end_lineno is None or end_col_offset is None:
+            return ""
+        lines = self.lines
+        return self.code[lines.utf8_offset(lineno, col_offset) : lines.utf8_offset(end_lineno, end_col_offset)]
 
     def _dedent(self, text: str) -> str:
-        return textwrap.dedent(text).strip()
-
-    def _summarize(self, kind: NodeKind, label: str) -> str:
-        if kind is NodeKind.START:
-            return "Begin the function."
-        if kind is NodeKind.END:
-            return "Finish the function."
-        if kind is NodeKind.CONDITIONAL:
-            return summarize_expression(label)
-        if kind is NodeKind.LOOP:
-            return summarize_loop(label)
-        if kind is NodeKind.RETURN:
-            return summarize_statement(label)
-        if kind is NodeKind.EXCEPTION:
-            return summarize_statement(label)
-        return summarize_statement(label)
+        if "\n" not in text:
+            # A single line has nothing to dedent relative to.
+            return text.strip()
+        dedented = self._dedented.get(text)
+        if dedented is None:
+            dedented = self._dedented[text] = textwrap.dedent(text).strip()
+        return dedented
+
+
+_TOP_LEVEL_START = re.compile(r"^(?:@|def\s|async\s+def\s|class\s)", re.MULTILINE)
+
+
+def _iter_top_level(code: str, lines: LineIndex) -> Iterator[ast.stmt]:
+    """Yield the module's top-level statements without building one AST for the whole file.
+
+    Lines that open a decorator, function or class at column 0 are candidate split
+    points. A piece that parses on its own cannot end inside a string or bracket,
+    so its end is a genuine statement boundary; pieces that fail are merged with
+    their successors, twice as many each time, until they parse. Line numbers are
+    shifted back to file coordinates, so the statements match ``ast.parse(code).body``.
+    """
+    bounds = [0]
+    for match in _TOP_LEVEL_START.finditer(code):
+        start = match.start()
+        if start == 0:
+            continue
+        # A definition directly below its decorator belongs to the decorator's piece.
+        if code[start] != "@" and code[code.rfind("\n", 0, start - 1) + 1] == "@":
+            continue
+        bounds.append(start)
+    bounds.append(len(code))
+
+    last = len(bounds) - 1
+    first = 0
+    while first < last:
+        step = 1
+        while True:
+            end = min(first + step, last)
+            try:
+                with profiling.phase("parse_source"):
+                    tree = ast.parse(code[bounds[first] : bounds[end]])
+                break
+            except SyntaxError:
+                if end == last:
+                    # Report the error exactly as a whole-file parse would; if that
+                    # parse succeeds after all, continue from its statements instead.
+                    line = lines.line_col(bounds[first])[0]
+                    with profiling.phase("parse_source"):
+                        module = ast.parse(code)
+                    yield from (stmt for stmt in module.body if stmt.lineno >= line)
+                    return
+                step *= 2
+        line = lines.line_col(bounds[first])[0]
+        if line > 1:
+            ast.increment_lineno(tree, line - 1)
+        yield from tree.body
+        first = end
 
 
 class PythonParser(LanguageParser):
@@ -256,14 +341,30 @@ class PythonParser(LanguageParser):
     language = "python"
 
     def parse_code(self, code: str, *, file_path: Optional[str] = None) -> ModuleIR:
-        module = ast.parse(code)
-        builder = _PythonControlFlowBuilder(code, file_path)
-        functions: List[FunctionIR] = []
-        for node in module.body:
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                functions.append(builder.build_function(node))
+        functions = [entry.build() for entry in self._function_entries(code, file_path)]
         return ModuleIR(language=self.language, functions=functions, metadata={"file_path": file_path})
 
+    def _function_entries(self, code: str, file_path: Optional[str]) -> Iterator[FunctionEntry]:
+        lines = LineIndex(code, universal_newlines=True)
+        builder = _PythonControlFlowBuilder(code, file_path, self.join_threshold, lines)
+        for node in _iter_top_level(code, lines):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                yield FunctionEntry(node.name, partial(self._build_entry, builder, node), line=node.lineno)
+
+    def _build_entry(
+        self, builder: _PythonControlFlowBuilder, node: ast.FunctionDef | ast.AsyncFunctionDef
+    ) -> FunctionIR:
+        if self.cache is None:
+            return builder.build_function(node)
+        lines = builder.lines
+        return self._build_cached(
+            builder.code[lines.offset(node.lineno) : lines.offset(node.end_lineno + 1)],
+            lambda: builder.build_function(node),
+            line=node.lineno,
+            column=node.col_offset,
+            file_path=builder.file_path,
+        )
+
 
 # Register the parser on import so it is available via the registry.
-register_parser(PythonParser.language, PythonParser)
+register_parser(PythonParser.language, PythonParser, extensions=(".py",))
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import textwrap
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import threading
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
+from .. import profiling
+from ..lazy import FunctionEntry
 from ..models import EdgeIR, FunctionIR, ModuleIR, NodeIR, NodeKind, SourceLocation
 from ..registry import register_parser
 from .base import LanguageParser
@@ -26,9 +30,60 @@ class TreeSitterLanguageConfig:
     function_query: str
     function_name_capture: str = "name"
     function_body_capture: str = "body"
+    extensions: Tuple[str, ...] = ()
 
 
 _TREE_SITTER_REGISTRY: Dict[str, TreeSitterLanguageConfig] = {}
+# Loaded grammars and compiled function queries, shared by every adapter in the process.
+_COMPILED: Dict[TreeSitterLanguageConfig, Tuple[object, object]] = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def _compiled(config: TreeSitterLanguageConfig) -> Tuple[object, object]:
+    """Return ``(language, query)`` for ``config``, loading and compiling them once per process."""
+    compiled = _COMPILED.get(config)
+    if compiled is None:
+        with _COMPILED_LOCK:
+            compiled = _COMPILED.get(config)
+            if compiled is None:
+                language = get_language(config.tree_sitter_language)
+                compiled = _COMPILED[config] = (language, language.query(config.function_query))
+    return compiled
+
+
+class _SourceBuffer:
+    """UTF-8 encoding of a source file, encoded once and sliced without copying.
+
+    Tree-sitter reports byte offsets, so every label is a decode of a byte span.
+    Spans are decoded straight from a ``memoryview`` and only when a label is requested.
+    """
+
+    __slots__ = ("data", "view")
+
+    def __init__(self, code: str):
+        self._set(code.encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "_SourceBuffer":
+        buffer = cls.__new__(cls)
+        buffer._set(data)
+        return buffer
+
+    def _set(self, data: bytes) -> None:
+        self.data = data
+        self.view = memoryview(data)
+
+    def point(self, byte_offset: int) -> Tuple[int, int]:
+        """Tree-sitter ``(row, column)`` point for a byte offset."""
+        row = self.data.count(b"\n", 0, byte_offset)
+        column = byte_offset - (self.data.rfind(b"\n", 0, byte_offset) + 1)
+        return row, column
+
+    def text(self, node) -> str:
+        return self.span_text(node.start_byte, node.end_byte)
+
+    def span_text(self, start_byte: int, end_byte: int) -> str:
+        return str(self.view[start_byte:end_byte], "utf-8")
 
 
 def register_tree_sitter_language(config: TreeSitterLanguageConfig) -> None:
@@ -38,7 +93,7 @@ def register_tree_sitter_language(config: TreeSitterLanguageConfig) -> None:
     def factory(config: TreeSitterLanguageConfig = config) -> TreeSitterAdapter:
         return TreeSitterAdapter(config)
 
-    register_parser(config.language, factory)
+    register_parser(config.language, factory, extensions=config.extensions)
 
 
 class TreeSitterAdapter(LanguageParser):
@@ -51,38 +106,80 @@ class TreeSitterAdapter(LanguageParser):
                 "Install them via the 'treesitter' extra (pip install flow-ir[treesitter])."
             )
         self.config = config
-        language = get_language(config.tree_sitter_language)
+        language, self._query = _compiled(config)
+        # Parsers keep per-parse state, so each adapter has its own.
         self._parser = Parser()
         self._parser.set_language(language)
-        self._query = language.query(config.function_query)
         self.language = config.language
         super().__init__()
 
     def parse_code(self, code: str, *, file_path: Optional[str] = None) -> ModuleIR:
-        tree = self._parser.parse(code.encode("utf-8"))
-        matches = self._query.matches(tree.root_node)
-
-        functions: List[FunctionIR] = []
-        for match in matches:
-            capture_map: Dict[str, List] = {}
-            for capture in match.captures:
-                name = getattr(capture, "name", None)
-                node = getattr(capture, "node", None)
-                if name is None or node is None:
-                    continue
-                capture_map.setdefault(name, []).append(node)
+        functions = [entry.build() for entry in self._function_entries(code, file_path)]
+        return ModuleIR(language=self.language, functions=functions, metadata={"file_path": file_path})
 
+    def _function_entries(self, code: str, file_path: Optional[str]) -> List[FunctionEntry]:
+        source = _SourceBuffer(code)
+        with profiling.phase("parse_source"):
+            tree = self._parser.parse(source.data)
+        with profiling.phase("extract_functions"):
+            pairs = self._function_nodes(tree)
+        entries: List[FunctionEntry] = []
+        for name_node, body_node in pairs:
+            name_text = source.text(name_node)
+            build = partial(self._build_entry, name_text, name_node, body_node, source, file_path)
+            entries.append(FunctionEntry(name_text, build, line=name_node.start_point[0] + 1))
+        return entries
+
+    def _build_entry(
+        self, name: str, name_node, body_node, source: _SourceBuffer, file_path: Optional[str]
+    ) -> FunctionIR:
+        if self.cache is None:
+            return self._build_function(name, body_node, source, file_path)
+        return self._build_cached(
+            source.span_text(name_node.start_byte, body_node.end_byte),
+            lambda: self._build_function(name, body_node, source, file_path),
+            line=name_node.start_point[0] + 1,
+            column=name_node.start_point[1],
+            file_path=file_path or "<unknown>",
+        )
+
+    def _function_nodes(self, tree) -> List[Tuple[object, object]]:
+        """Return ``(name_node, body_node)`` pairs for every function the query matches."""
+        pairs = []
+        for match in self._query.matches(tree.root_node):
+            capture_map = self._capture_map(match)
             name_nodes = capture_map.get(self.config.function_name_capture)
             body_nodes = capture_map.get(self.config.function_body_capture)
             if not name_nodes or not body_nodes:
                 continue
+            pairs.append((name_nodes[0], body_nodes[0]))
+        return pairs
 
-            name_text = self._slice(code, name_nodes[0])
-            functions.append(self._build_function(name_text, body_nodes[0], code, file_path))
+    @staticmethod
+    def _capture_map(match) -> Dict[str, List]:
+        capture_map: Dict[str, List] = {}
+        if isinstance(match, tuple):
+            # py-tree-sitter >= 0.21 returns (pattern_index, {capture_name: node(s)}).
+            for name, nodes in match[1].items():
+                capture_map[name] = list(nodes) if isinstance(nodes, list) else [nodes]
+            return capture_map
+        for capture in match.captures:
+            name = getattr(capture, "name", None)
+            node = getattr(capture, "node", None)
+            if name is None or node is None:
+                continue
+            capture_map.setdefault(name, []).append(node)
+        return capture_map
 
-        return ModuleIR(language=self.language, functions=functions, metadata={"file_path": file_path})
+    def _build_function(
+        self, name: str, body_node, source: _SourceBuffer, file_path: Optional[str]
+    ) -> FunctionIR:
+        with profiling.phase("build_cfg", name):
+            return self._build_graph(name, body_node, source, file_path)
 
-    def _build_function(self, name: str, body_node, code: str, file_path: Optional[str]) -> FunctionIR:
+    def _build_graph(
+        self, name: str, body_node, source: _SourceBuffer, file_path: Optional[str]
+    ) -> FunctionIR:
         nodes: List[NodeIR] = []
         edges: List[EdgeIR] = []
 
@@ -108,7 +205,7 @@ class TreeSitterAdapter(LanguageParser):
 
         statements = [child for child in body_node.named_children if child.is_named]
         for stmt in statements:
-            label = self._normalize_label(self._slice(code, stmt))
+            label = self._normalize_label(source.text(stmt))
             stmt_id = add_node(NodeKind.STATEMENT, label, stmt)
             for prev in prev_ids:
                 edges.append(EdgeIR(source=prev, target=stmt_id))
@@ -124,17 +221,126 @@ class TreeSitterAdapter(LanguageParser):
             edges=edges,
         )
 
-    def _slice(self, code: str, node) -> str:
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-        return code.encode("utf-8")[start_byte:end_byte].decode("utf-8")
-
     def _normalize_label(self, text: str) -> str:
         return textwrap.dedent(text).strip().replace("\n", " ")
 
 
+@dataclass
+class _FunctionRecord:
+    start_byte: int
+    end_byte: int
+    start_row: int
+    function: FunctionIR
+
+
+class TreeSitterSession:
+    """Stateful parse of one document that is kept current through incremental edits.
+
+    The previous syntax tree is edited in place and handed back to tree-sitter so
+    only the changed region is reparsed. Function graphs are rebuilt only for
+    functions that overlap the edit or a range tree-sitter reports as changed;
+    all other functions are reused, with their line numbers shifted when the edit
+    added or removed lines above them.
+    """
+
+    def __init__(self, adapter: TreeSitterAdapter, code: str, *, file_path: Optional[str] = None):
+        self.adapter = adapter
+        self.file_path = file_path
+        self.rebuilt: List[str] = []
+        self._source = _SourceBuffer(code)
+        self._tree = adapter._parser.parse(self._source.data)
+        self._records = self._build_records(self._tree, self._source, {}, [])
+
+    @property
+    def text(self) -> str:
+        return self._source.data.decode("utf-8")
+
+    @property
+    def module(self) -> ModuleIR:
+        return ModuleIR(
+            language=self.adapter.language,
+            functions=[record.function for record in self._records],
+            metadata={"file_path": self.file_path},
+        )
+
+    def edit(self, start_byte: int, old_end_byte: int, new_text: str) -> ModuleIR:
+        """Replace bytes ``[start_byte, old_end_byte)`` with ``new_text`` and return the updated module."""
+        old = self._source
+        if not 0 <= start_byte <= old_end_byte <= len(old.data):
+            raise ValueError(f"Edit range {start_byte}..{old_end_byte} is outside the document.")
+        inserted = new_text.encode("utf-8")
+        new_end_byte = start_byte + len(inserted)
+        new = _SourceBuffer.from_bytes(old.data[:start_byte] + inserted + old.data[old_end_byte:])
+
+        start_point = old.point(start_byte)
+        old_end_point = old.point(old_end_byte)
+        new_end_point = new.point(new_end_byte)
+        self._tree.edit(
+            start_byte=start_byte,
+            old_end_byte=old_end_byte,
+            new_end_byte=new_end_byte,
+            start_point=start_point,
+            old_end_point=old_end_point,
+            new_end_point=new_end_point,
+        )
+        new_tree = self.adapter._parser.parse(new.data, self._tree)
+        changed = [(start_byte, new_end_byte)]
+        changed.extend((r.start_byte, r.end_byte) for r in self._tree.changed_ranges(new_tree))
+
+        byte_delta = new_end_byte - old_end_byte
+        reusable: Dict[int, _FunctionRecord] = {}
+        for record in self._records:
+            if record.end_byte <= start_byte:
+                reusable[record.start_byte] = record
+            elif record.start_byte >= old_end_byte and record.start_row > old_end_point[0]:
+                # Starts on a later line than the edit, so only its row can have moved.
+                reusable[record.start_byte + byte_delta] = record
+
+        self.rebuilt = []
+        self._records = self._build_records(new_tree, new, reusable, changed)
+        self._source = new
+        self._tree = new_tree
+        return self.module
+
+    def _build_records(
+        self,
+        tree,
+        source: _SourceBuffer,
+        reusable: Dict[int, _FunctionRecord],
+        changed: List[Tuple[int, int]],
+    ) -> List[_FunctionRecord]:
+        records: List[_FunctionRecord] = []
+        for name_node, body_node in self.adapter._function_nodes(tree):
+            start, end = name_node.start_byte, body_node.end_byte
+            row = name_node.start_point[0]
+            previous = reusable.get(start)
+            touched = any(lo <= end and start <= hi for lo, hi in changed)
+            if previous is not None and not touched and previous.end_byte - previous.start_byte == end - start:
+                function = _shift_rows(previous.function, row - previous.start_row)
+            else:
+                function = self.adapter._build_function(
+                    source.text(name_node), body_node, source, self.file_path
+                )
+                self.rebuilt.append(function.name)
+            records.append(_FunctionRecord(start, end, row, function))
+        return records
+
+
+def _shift_rows(function: FunctionIR, delta: int) -> FunctionIR:
+    if delta == 0:
+        return function
+    nodes = [
+        node.copy(location=replace(node.location, line=node.location.line + delta))
+        if node.location is not None
+        else node
+        for node in function.nodes
+    ]
+    return replace(function, nodes=nodes)
+
+
 __all__ = [
     "TreeSitterAdapter",
     "TreeSitterLanguageConfig",
+    "TreeSitterSession",
     "register_tree_sitter_language",
 ]
@@ -0,0 +1,269 @@
+"""Per-phase parse profiling.
+
+Parsers and serializers mark their phases with :func:`phase`; the calls cost a
+context-variable lookup unless a :class:`Profiler` is active::
+
+    with profiling.profile() as profiler:
+        module = parser.parse_code(code)
+    print(profiler.format_table())
+
+Each record holds wall time and the net change in allocated memory blocks
+(``sys.getallocatedblocks``) for one phase, attributed to the function being
+processed when there is one. Work that runs once per node, such as
+summarization, is wrapped with :func:`timed` and folded into one record per
+enclosing phase.
+
+Phases recorded by the built-in parsers:
+
+``tokenize``           C tokenization, which also drops comments
+``parse_source``       Python ``ast.parse`` of top-level chunks; tree-sitter parsing
+``extract_functions``  locating function spans
+``parse_statements``   C statement structure of one function body
+``build_cfg``          building one function's graph (including ``summarize``)
+``summarize``          node summaries, nested in ``build_cfg``
+``serialize``          writing one function (or a whole binary module)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+_ACTIVE: ContextVar[Optional["Profiler"]] = ContextVar("flow_ir_profiler", default=None)
+_NULL = nullcontext()
+
+
+@dataclass
+class PhaseRecord:
+    """One timed phase. ``start_ns`` is relative to when the profiler was created."""
+
+    phase: str
+    function: Optional[str]
+    start_ns: int
+    duration_ns: int
+    allocations: int
+    calls: int = 1
+    thread: int = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+
+@dataclass
+class PhaseTotals:
+    duration_ns: int = 0
+    allocations: int = 0
+    calls: int = 0
+
+
+@dataclass
+class Profiler:
+    """Collects :class:`PhaseRecord` objects while active (see :func:`profile`)."""
+
+    records: List[PhaseRecord] = field(default_factory=list)
+    origin_ns: int = field(default_factory=perf_counter_ns)
+
+    def __post_init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def phase(self, name: str, function: Optional[str] = None) -> "_Phase":
+        """Context manager timing ``name``; ``function`` defaults to the enclosing phase's."""
+        return _Phase(self, name, function)
+
+    def timed(self, name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Wrap ``func`` so its calls are accumulated into one ``name`` record per enclosing phase."""
+
+        def wrapper(*args: Any) -> T:
+            start = perf_counter_ns()
+            blocks = sys.getallocatedblocks()
+            try:
+                return func(*args)
+            finally:
+                self._accumulate(name, perf_counter_ns() - start, sys.getallocatedblocks() - blocks)
+
+        return wrapper
+
+    def totals(self) -> Dict[str, PhaseTotals]:
+        """Totals per phase, in the order phases first ran."""
+        totals: Dict[str, PhaseTotals] = {}
+        for record in self.records:
+            entry = totals.setdefault(record.phase, PhaseTotals())
+            entry.duration_ns += record.duration_ns
+            entry.allocations += record.allocations
+            entry.calls += record.calls
+        return totals
+
+    def by_function(self) -> Dict[str, Dict[str, PhaseTotals]]:
+        """Totals per function, then per phase."""
+        functions: Dict[str, Dict[str, PhaseTotals]] = {}
+        for record in self.records:
+            if record.function is None:
+                continue
+            entry = functions.setdefault(record.function, {}).setdefault(record.phase, PhaseTotals())
+            entry.duration_ns += record.duration_ns
+            entry.allocations += record.allocations
+            entry.calls += record.calls
+        return functions
+
+    def format_table(self, *, top: int = 10) -> str:
+        """Phase totals followed by the ``top`` slowest functions."""
+        totals = self.totals()
+        lines = [f"{'phase':<20}{'calls':>8}{'ms':>12}{'alloc blocks':>15}"]
+        for name, entry in totals.items():
+            lines.append(f"{name:<20}{entry.calls:>8}{entry.duration_ns / 1e6:>12.2f}{entry.allocations:>15}")
+
+        functions = self.by_function()
+        if functions and top:
+            phases = [name for name in totals if any(name in per for per in functions.values())]
+            # ``summarize`` runs inside ``build_cfg``, so it is not added again to the total.
+            nested = {"summarize"}
+
+            def total_ns(per: Dict[str, PhaseTotals]) -> int:
+                return sum(entry.duration_ns for name, entry in per.items() if name not in nested)
+
+            ranked = sorted(functions.items(), key=lambda item: total_ns(item[1]), reverse=True)[:top]
+            lines.append("")
+            lines.append(f"{'function':<32}{'total ms':>10}" + "".join(f"{name:>18}" for name in phases))
+            for name, per in ranked:
+                cells = "".join(
+                    f"{per[phase].duration_ns / 1e6:>18.2f}" if phase in per else f"{'-':>18}" for phase in phases
+                )
+                lines.append(f"{_truncate(name, 31):<32}{total_ns(per) / 1e6:>10.2f}{cells}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace-event JSON for ``chrome://tracing`` or Perfetto (complete ``X`` events)."""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args: Dict[str, Any] = {"allocations": record.allocations, "calls": record.calls}
+            if record.function is not None:
+                args["function"] = record.function
+            events.append(
+                {
+                    "name": record.phase if record.function is None else f"{record.phase}:{record.function}",
+                    "cat": record.phase,
+                    "ph": "X",
+                    "ts": record.start_ns / 1000,
+                    "dur": record.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": record.thread,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+
+    def _stack(self) -> List["_Phase"]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _accumulate(self, name: str, duration_ns: int, allocations: int) -> None:
+        stack = self._stack()
+        if not stack:
+            start = perf_counter_ns() - duration_ns - self.origin_ns
+            self._add(PhaseRecord(name, None, start, duration_ns, allocations))
+            return
+        entry = stack[-1].children.setdefault(name, [0, 0, 0])
+        entry[0] += duration_ns
+        entry[1] += allocations
+        entry[2] += 1
+
+    def _add(self, record: PhaseRecord) -> None:
+        record.thread = threading.get_ident()
+        with self._lock:
+            self.records.append(record)
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "function", "children", "_start", "_blocks")
+
+    def __init__(self, profiler: Profiler, name: str, function: Optional[str]):
+        self.profiler = profiler
+        self.name = name
+        self.function = function
+        self.children: Dict[str, List[int]] = {}
+
+    def __enter__(self) -> "_Phase":
+        stack = self.profiler._stack()
+        if self.function is None and stack:
+            self.function = stack[-1].function
+        stack.append(self)
+        self._blocks = sys.getallocatedblocks()
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        end = perf_counter_ns()
+        allocations = sys.getallocatedblocks() - self._blocks
+        profiler = self.profiler
+        profiler._stack().pop()
+        start = self._start - profiler.origin_ns
+        profiler._add(PhaseRecord(self.name, self.function, start, end - self._start, allocations))
+        # Accumulated per-call work is laid out back to back from the phase start.
+        offset = start
+        for name, (duration_ns, child_allocations, calls) in self.children.items():
+            profiler._add(PhaseRecord(name, self.function, offset, duration_ns, child_allocations, calls))
+            offset += duration_ns
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _ACTIVE.get()
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Activate ``profiler`` (a new one by default) for the duration of the block."""
+    profiler = profiler if profiler is not None else Profiler()
+    token = _ACTIVE.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE.reset(token)
+
+
+def phase(name: str, function: Optional[str] = None):
+    """Time ``name`` on the active profiler; a shared no-op context when none is active."""
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        return _NULL
+    return profiler.phase(name, function)
+
+
+def timed(name: str, func: Callable[..., T]) -> Callable[..., T]:
+    """``func`` wrapped for the active profiler, or ``func`` itself when none is active."""
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        return func
+    return profiler.timed(name, func)
+
+
+def _truncate(text: str, width: int) -> str:
+    return text if len(text) <= width else text[: width - 1] + "…"
+
+
+__all__ = [
+    "PhaseRecord",
+    "PhaseTotals",
+    "Profiler",
+    "active_profiler",
+    "phase",
+    "profile",
+    "timed",
+]
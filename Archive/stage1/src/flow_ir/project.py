@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .models import ModuleIR
+from .registry import language_for_path, pooled_parser
+
+# Directories that never contain first-party sources worth parsing.
+DEFAULT_EXCLUDED_DIRS = frozenset(
+    {"node_modules", "__pycache__", "build", "dist", "venv", ".venv", "site-packages"}
+)
+
+
+@dataclass
+class ProjectFileResult:
+    """Outcome of parsing one file in a project run."""
+
+    path: str
+    language: str
+    module: Optional[ModuleIR] = None
+    error: Optional[str] = None
+
+
+def discover_sources(
+    root: Union[str, Path],
+    *,
+    languages: Optional[Iterable[str]] = None,
+    excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+) -> List[Tuple[Path, str]]:
+    """Walk ``root`` and return ``(path, language)`` pairs for files with a registered parser.
+
+    Hidden directories are skipped. Results are sorted so runs are reproducible.
+    """
+    wanted = {language.lower() for language in languages} if languages else None
+    excluded = set(excluded_dirs)
+    found: List[Tuple[Path, str]] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in excluded]
+        for filename in filenames:
+            language = language_for_path(filename)
+            if language is None or (wanted is not None and language not in wanted):
+                continue
+            found.append((Path(dirpath) / filename, language))
+    found.sort(key=lambda item: str(item[0]))
+    return found
+
+
+def _parse_one(job: Tuple[str, str]) -> ProjectFileResult:
+    path, language = job
+    try:
+        with pooled_parser(language) as parser:
+            module = parser.parse_file(path)
+    except Exception as exc:  # a single bad file must not abort the whole project
+        return ProjectFileResult(path=path, language=language, error=f"{type(exc).__name__}: {exc}")
+    return ProjectFileResult(path=path, language=language, module=module)
+
+
+def parse_paths(
+    jobs: Sequence[Tuple[Union[str, Path], str]],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+) -> Iterator[ProjectFileResult]:
+    """Parse ``(path, language)`` jobs, fanning out across processes when ``workers`` > 1.
+
+    Results are yielded in job order. ``workers=None`` uses one process per CPU.
+    """
+    normalized = [(str(path), language) for path, language in jobs]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(normalized) or 1))
+    if workers == 1:
+        for job in normalized:
+            yield _parse_one(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_parse_one, normalized, chunksize=max(1, chunksize))
+
+
+def parse_project(
+    root: Union[str, Path],
+    *,
+    languages: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+) -> Iterator[ProjectFileResult]:
+    """Discover and parse every supported source file below ``root``."""
+    jobs = discover_sources(root, languages=languages)
+    return parse_paths(jobs, workers=workers, chunksize=chunksize)
+
+
+__all__ = [
+    "DEFAULT_EXCLUDED_DIRS",
+    "ProjectFileResult",
+    "discover_sources",
+    "parse_paths",
+    "parse_project",
+]
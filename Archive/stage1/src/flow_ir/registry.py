@@ -1,20 +1,91 @@
+"""Language → parser registry.
+
+Parsers are imported on first use. Built-in parsers and third-party plugins are
+declared by module path: the built-ins in ``_BUILTIN_PARSERS`` and plugins
+through the ``flow_ir.parsers`` entry-point group, e.g.::
+
+    [project.entry-points."flow_ir.parsers"]
+    rust = "flow_ir_rust.parser"            # module registers itself on import
+    go = "flow_ir_go:GoParser"              # factory registered under the entry name
+
+so importing :mod:`flow_ir` or listing languages does not import any parser.
+Batch and server code can reuse parser instances through :func:`pooled_parser`.
+"""
+
 from __future__ import annotations
 
-from typing import Callable, Dict, Iterable
+import importlib
+import threading
+from contextlib import contextmanager
+from functools import reduce
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
 
-from .parsers.base import LanguageParser
+if TYPE_CHECKING:
+    from .parsers.base import LanguageParser
 
-ParserFactory = Callable[[], LanguageParser]
+ParserFactory = Callable[[], "LanguageParser"]
+
+ENTRY_POINT_GROUP = "flow_ir.parsers"
+
+_BUILTIN_PARSERS = {
+    "python": (f"{__package__}.parsers.python_parser", (".py",)),
+    "c": (f"{__package__}.parsers.c_simple_parser", (".c", ".h")),
+}
 
 _REGISTRY: Dict[str, ParserFactory] = {}
+_LAZY: Dict[str, str] = {}
+_EXTENSIONS: Dict[str, str] = {}
+_POOLS: Dict[str, List["LanguageParser"]] = {}
+# Languages whose lazy target failed to load, with the error, and extensions known to
+# match no parser after every pending parser was tried.
+_FAILED: Dict[str, str] = {}
+_UNKNOWN_EXTENSIONS: Set[str] = set()
+_entry_points_scanned = False
+# Guards lazy loading and the parser pools. Reentrant because importing a parser
+# module calls register_parser.
+_LOCK = threading.RLock()
 
 
-def register_parser(language: str, parser_factory: ParserFactory) -> None:
-    """Register a parser implementation for the given language key."""
+def register_parser(
+    language: str, parser_factory: ParserFactory, *, extensions: Iterable[str] = ()
+) -> None:
+    """Register a parser implementation for the given language key.
+
+    ``extensions`` (e.g. ``(".c", ".h")``) let project-wide commands pick the parser
+    from a file name. An extension already claimed by another language is left as is.
+    A language declared with :func:`register_lazy_parser` may only be registered by
+    the module it names.
+    """
     normalized = language.lower()
     if normalized in _REGISTRY:
         raise ValueError(f"Parser already registered for language '{language}'.")
+    target = _LAZY.get(normalized)
+    if target is not None:
+        if getattr(parser_factory, "__module__", None) != target.partition(":")[0]:
+            raise ValueError(f"Parser already registered for language '{language}'.")
+        del _LAZY[normalized]
     _REGISTRY[normalized] = parser_factory
+    _FAILED.pop(normalized, None)
+    for extension in extensions:
+        _EXTENSIONS.setdefault(_normalize_extension(extension), normalized)
+    _UNKNOWN_EXTENSIONS.clear()
+
+
+def register_lazy_parser(language: str, target: str, *, extensions: Iterable[str] = ()) -> None:
+    """Declare a parser that is imported the first time it is requested.
+
+    ``target`` is either a module path, whose import must call :func:`register_parser`,
+    or ``"module:attribute"`` naming the parser factory.
+    """
+    normalized = language.lower()
+    if normalized in _REGISTRY or normalized in _LAZY:
+        raise ValueError(f"Parser already registered for language '{language}'.")
+    _LAZY[normalized] = target
+    _FAILED.pop(normalized, None)
+    for extension in extensions:
+        _EXTENSIONS.setdefault(_normalize_extension(extension), normalized)
+    _UNKNOWN_EXTENSIONS.clear()
 
 
 def get_parser(language: str) -> LanguageParser:
@@ -22,11 +93,124 @@ def get_parser(language: str) -> LanguageParser:
     normalized = language.lower()
     factory = _REGISTRY.get(normalized)
     if factory is None:
-        available = ", ".join(sorted(_REGISTRY)) or "<none>"
-        raise KeyError(f"No parser registered for '{language}'. Available: {available}")
+        if normalized not in _LAZY:
+            _scan_entry_points()
+        factory = _load(normalized)
+    if factory is None:
+        available = ", ".join(list_languages()) or "<none>"
+        failure = _FAILED.get(normalized)
+        detail = f" (loading it failed: {failure})" if failure else ""
+        raise KeyError(f"No parser registered for '{language}'{detail}. Available: {available}")
     return factory()
 
 
+@contextmanager
+def pooled_parser(language: str) -> Iterator[LanguageParser]:
+    """Check out a parser for ``language`` from a per-language pool.
+
+    Each parser is used by one caller at a time and returned to the pool on exit,
+    so concurrent threads never share an instance while repeated calls skip the
+    parser's setup. Pooled parsers are shared across uses: configure a parser
+    obtained from :func:`get_parser` instead when changing ``cache`` or
+    ``join_threshold``.
+    """
+    normalized = language.lower()
+    with _LOCK:
+        idle = _POOLS.get(normalized)
+        parser = idle.pop() if idle else None
+    if parser is None:
+        parser = get_parser(normalized)
+    try:
+        yield parser
+    finally:
+        with _LOCK:
+            _POOLS.setdefault(normalized, []).append(parser)
+
+
 def list_languages() -> Iterable[str]:
-    """List languages with registered parsers."""
-    return sorted(_REGISTRY.keys())
+    """List languages with registered parsers, without importing them."""
+    _scan_entry_points()
+    return sorted({*_REGISTRY, *_LAZY})
+
+
+def language_for_path(path: Union[str, Path]) -> Optional[str]:
+    """Return the language registered for the file's extension, if any.
+
+    Entry-point plugins only declare their extensions once imported, so an unknown
+    extension imports any plugins that have not been loaded yet. A plugin that fails
+    to load is logged and skipped, and extensions still unknown afterwards are
+    remembered until another parser is registered.
+    """
+    extension = _normalize_extension(Path(path).suffix)
+    language = _EXTENSIONS.get(extension)
+    if language is None and extension and extension not in _UNKNOWN_EXTENSIONS:
+        _scan_entry_points()
+        for pending in list(_LAZY):
+            try:
+                _load(pending)
+            except Exception as exc:
+                # Imported here to keep logging out of ``import flow_ir``.
+                import logging
+
+                logging.getLogger(__name__).warning("Skipping parser plugin '%s': %s", pending, exc)
+        with _LOCK:
+            language = _EXTENSIONS.get(extension)
+            if language is None:
+                _UNKNOWN_EXTENSIONS.add(extension)
+    return language
+
+
+def _load(normalized: str) -> Optional[ParserFactory]:
+    with _LOCK:
+        target = _LAZY.get(normalized)
+        if target is None:
+            return _REGISTRY.get(normalized)
+        module_name, _, attribute = target.partition(":")
+        try:
+            module = importlib.import_module(module_name)
+            if normalized not in _REGISTRY:
+                # The module did not register itself; register the named factory instead.
+                if not attribute:
+                    raise KeyError(f"Module '{module_name}' did not register a parser for '{normalized}'.")
+                factory = reduce(getattr, attribute.split("."), module)
+                del _LAZY[normalized]
+                register_parser(normalized, factory)
+        except Exception as exc:
+            # Forget the target so later lookups do not retry a broken import.
+            _LAZY.pop(normalized, None)
+            _FAILED[normalized] = f"{type(exc).__name__}: {exc}"
+            raise
+        return _REGISTRY[normalized]
+
+
+def _scan_entry_points() -> None:
+    global _entry_points_scanned
+    if _entry_points_scanned:
+        return
+    with _LOCK:
+        if _entry_points_scanned:
+            return
+        from importlib.metadata import entry_points
+
+        found = entry_points()
+        if hasattr(found, "select"):
+            group = found.select(group=ENTRY_POINT_GROUP)
+        else:  # Python < 3.10
+            group = found.get(ENTRY_POINT_GROUP, ())
+        for entry_point in group:
+            normalized = entry_point.name.lower()
+            if normalized not in _REGISTRY and normalized not in _LAZY:
+                _LAZY[normalized] = entry_point.value
+        _entry_points_scanned = True
+
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.lower()
+    if extension and not extension.startswith("."):
+        extension = "." + extension
+    return extension
+
+
+for _language, (_module, _extensions) in _BUILTIN_PARSERS.items():
+    register_lazy_parser(_language, _module, extensions=_extensions)
+del _language, _module, _extensions
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import json
+import mmap
+import re
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, TextIO, Tuple, Union
 
-from .models import ModuleIR
+from . import profiling
+from .lazy import DEFAULT_MAX_CACHED, FunctionEntry, LazyModuleIR
+from .models import FunctionIR, ModuleIR
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .parsers.base import LanguageParser
 
 
 def module_to_dict(module: ModuleIR) -> Dict[str, Any]:
@@ -19,4 +27,278 @@ def module_to_json(module: ModuleIR, *, indent: int = 2) -> str:
 
 def dump_module(module: ModuleIR, path: Union[str, Path], *, indent: int = 2) -> None:
     """Write the ModuleIR JSON representation to disk."""
-    Path(path).write_text(module_to_json(module, indent=indent), encoding="utf-8")
+    with Path(path).open("w", encoding="utf-8") as handle:
+        write_module_json(module, handle, indent=indent)
+
+
+def write_module_json(module: ModuleIR, fp: TextIO, *, indent: Optional[int] = 2) -> None:
+    """Stream a ModuleIR as JSON to ``fp``, one function at a time.
+
+    The output is identical to :func:`module_to_json`, but only a single function's
+    dictionary is alive at any moment.
+    """
+    write_functions_json(fp, module.language, module.metadata, module.functions, indent=indent)
+
+
+def write_functions_json(
+    fp: TextIO,
+    language: str,
+    metadata: Dict[str, Any],
+    functions: Iterable[FunctionIR],
+    *,
+    indent: Optional[int] = 2,
+) -> None:
+    """Write a module document whose functions are produced lazily by ``functions``."""
+    if indent is None:
+        fp.write(f'{{"language": {json.dumps(language)}, "metadata": {json.dumps(metadata)}, "functions": [')
+        for index, function in enumerate(functions):
+            with profiling.phase("serialize", function.name):
+                if index:
+                    fp.write(", ")
+                fp.write(json.dumps(function.to_dict()))
+        fp.write("]}")
+        return
+
+    pad = " " * indent
+    item_pad = pad * 2
+    fp.write("{\n")
+    fp.write(f'{pad}"language": {json.dumps(language)},\n')
+    fp.write(f'{pad}"metadata": {_nest(json.dumps(metadata, indent=indent), pad)},\n')
+    fp.write(f'{pad}"functions": [')
+    wrote_any = False
+    for function in functions:
+        with profiling.phase("serialize", function.name):
+            fp.write(",\n" if wrote_any else "\n")
+            fp.write(item_pad + _nest(json.dumps(function.to_dict(), indent=indent), item_pad))
+        wrote_any = True
+    fp.write(f"\n{pad}]" if wrote_any else "]")
+    fp.write("\n}")
+
+
+def write_module_ndjson(module: ModuleIR, fp: TextIO) -> None:
+    """Write a ModuleIR as newline-delimited JSON.
+
+    The first line holds the module header (``language`` and ``metadata``); every
+    following line is one serialized function.
+    """
+    write_functions_ndjson(fp, module.language, module.metadata, module.functions)
+
+
+def write_functions_ndjson(
+    fp: TextIO, language: str, metadata: Dict[str, Any], functions: Iterable[FunctionIR]
+) -> None:
+    fp.write(json.dumps({"language": language, "metadata": metadata}))
+    fp.write("\n")
+    for function in functions:
+        with profiling.phase("serialize", function.name):
+            fp.write(json.dumps(function.to_dict()))
+            fp.write("\n")
+
+
+def write_parsed_json(
+    parser: "LanguageParser",
+    code: str,
+    fp: TextIO,
+    *,
+    file_path: Optional[str] = None,
+    indent: Optional[int] = 2,
+) -> None:
+    """Parse ``code`` and write its module JSON while functions are still being built.
+
+    The output matches ``module_to_json(parser.parse_code(code, file_path=file_path))``.
+    """
+    functions = parser.iter_functions(code, file_path=file_path)
+    write_functions_json(fp, parser.language, {"file_path": file_path}, functions, indent=indent)
+
+
+def write_parsed_ndjson(
+    parser: "LanguageParser", code: str, fp: TextIO, *, file_path: Optional[str] = None
+) -> None:
+    """NDJSON counterpart of :func:`write_parsed_json`."""
+    functions = parser.iter_functions(code, file_path=file_path)
+    write_functions_ndjson(fp, parser.language, {"file_path": file_path}, functions)
+
+
+def load_module(path: Union[str, Path], *, max_cached: int = DEFAULT_MAX_CACHED) -> LazyModuleIR:
+    """Open a JSON or NDJSON module file and index its functions without decoding them.
+
+    The file is memory-mapped. Only the module header and each function's byte span
+    (plus its name) are read on open; a function's ``FunctionIR`` and nodes are
+    decoded the first time it is accessed, so pulling one function out of a large
+    dump costs little more than that function.
+    """
+    with Path(path).open("rb") as handle:
+        try:
+            buffer: Any = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file cannot be mapped
+            buffer = b""
+    return _index_module(buffer, max_cached)
+
+
+def loads_module(data: Union[str, bytes], *, max_cached: int = DEFAULT_MAX_CACHED) -> LazyModuleIR:
+    """In-memory counterpart of :func:`load_module`."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return _index_module(data, max_cached)
+
+
+# JSON strings never contain raw newlines or unescaped quotes, so skipping whole
+# strings is enough to track nesting without decoding anything.
+_JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+_KEY_COLON_ARRAY = re.compile(rb"\s*:\s*\[")
+_INDENTED_ITEM = re.compile(rb"\n( *)\{")
+_ARRAY_CLOSE = re.compile(rb"\s*\]")
+_ITEM_GAP = re.compile(r"\s*,?\s*")
+_DECODER = json.JSONDecoder()
+_LEADING_NAME = re.compile(rb'\{\s*"name":\s*("(?:[^"\\]|\\.)*")')
+
+
+def _index_module(buffer: Any, max_cached: int) -> LazyModuleIR:
+    found = _ndjson_spans(buffer)
+    if found is None:
+        found = _json_spans(buffer)
+    header, spans = found
+    entries = [
+        FunctionEntry(_function_name(buffer, start, end), partial(_decode_function, buffer, start, end))
+        for start, end in spans
+    ]
+    return LazyModuleIR(header["language"], entries, dict(header.get("metadata") or {}), max_cached=max_cached)
+
+
+def _ndjson_spans(buffer: Any) -> Optional[Tuple[Dict[str, Any], List[Tuple[int, int]]]]:
+    first_end = buffer.find(b"\n")
+    if first_end == -1:
+        return None
+    try:
+        header = json.loads(buffer[:first_end])
+    except ValueError:
+        return None
+    if not isinstance(header, dict) or "functions" in header:
+        return None
+    spans: List[Tuple[int, int]] = []
+    start = first_end + 1
+    size = len(buffer)
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = size
+        if end > start:
+            spans.append((start, end))
+        start = end + 1
+    return header, spans
+
+
+def _json_spans(buffer: Any) -> Tuple[Dict[str, Any], List[Tuple[int, int]]]:
+    array_start = _functions_array(buffer)
+    if array_start is None:
+        raise ValueError("Not a flow IR module document: no top-level 'functions' array.")
+    found = _indented_spans(buffer, array_start)
+    if found is None:
+        found = _scanned_spans(buffer, array_start)
+    spans, array_end = found
+    # Decode the header with the functions array emptied out.
+    header = json.loads(buffer[:array_start] + b"]" + buffer[array_end:])
+    return header, spans
+
+
+def _functions_array(buffer: Any) -> Optional[int]:
+    """Offset just past the ``[`` of the top-level ``"functions"`` array."""
+    depth = 0
+    for match in _JSON_TOKEN.finditer(buffer):
+        token = match.group()
+        if token in (b"{", b"["):
+            depth += 1
+        elif token in (b"}", b"]"):
+            depth -= 1
+        elif depth == 1 and token == b'"functions"':
+            array = _KEY_COLON_ARRAY.match(buffer, match.end())
+            if array is not None:
+                return array.end()
+    return None
+
+
+def _indented_spans(buffer: Any, array_start: int) -> Optional[Tuple[List[Tuple[int, int]], int]]:
+    """Function spans of an indented document, found by their opening and closing lines.
+
+    With ``json.dumps``-style indentation every nested value is indented deeper, so
+    the first line holding just the item's indentation and ``}`` closes the item.
+    Returns None when the document is not laid out that way.
+    """
+    first = _INDENTED_ITEM.match(buffer, array_start)
+    if first is None or not first.group(1):
+        # Without indentation nested closing braces look the same as the item's own.
+        return None
+    pad = first.group(1)
+    opener = b"\n" + pad + b"{"
+    closer = b"\n" + pad + b"}"
+    spans: List[Tuple[int, int]] = []
+    position = array_start
+    while True:
+        if buffer[position : position + len(opener)] != opener:
+            return None
+        start = position + len(opener) - 1
+        close = buffer.find(closer, start)
+        if close == -1:
+            return None
+        end = close + len(closer)
+        spans.append((start, end))
+        if buffer[end : end + 1] != b",":
+            break
+        position = end + 1
+    array_close = _ARRAY_CLOSE.match(buffer, end)
+    if array_close is None:
+        return None
+    return spans, array_close.end()
+
+
+def _scanned_spans(buffer: Any, array_start: int) -> Tuple[List[Tuple[int, int]], int]:
+    """Function spans of a compact document, found by letting the C decoder skip each item."""
+    try:
+        # json.dumps escapes non-ASCII by default, so character and byte offsets agree.
+        text = buffer[:].decode("ascii")
+    except UnicodeDecodeError:
+        return _tokenized_spans(buffer, array_start)
+    spans: List[Tuple[int, int]] = []
+    position = array_start
+    while True:
+        position = _ITEM_GAP.match(text, position).end()
+        if text.startswith("]", position):
+            return spans, position + 1
+        _, end = _DECODER.raw_decode(text, position)
+        spans.append((position, end))
+        position = end
+
+
+def _tokenized_spans(buffer: Any, array_start: int) -> Tuple[List[Tuple[int, int]], int]:
+    spans: List[Tuple[int, int]] = []
+    depth = 0
+    start = array_start
+    for match in _JSON_TOKEN.finditer(buffer, array_start):
+        token = match.group()
+        if token in (b"{", b"["):
+            if depth == 0:
+                start = match.start()
+            depth += 1
+        elif token in (b"}", b"]"):
+            if depth == 0:
+                return spans, match.end()
+            depth -= 1
+            if depth == 0:
+                spans.append((start, match.end()))
+    raise ValueError("Not a flow IR module document: unterminated 'functions' array.")
+
+
+def _function_name(buffer: Any, start: int, end: int) -> str:
+    leading = _LEADING_NAME.match(buffer, start)
+    if leading is not None:
+        return json.loads(leading.group(1))
+    return json.loads(buffer[start:end])["name"]
+
+
+def _decode_function(buffer: Any, start: int, end: int) -> FunctionIR:
+    return FunctionIR.from_dict(json.loads(buffer[start:end]))
+
+
+def _nest(text: str, pad: str) -> str:
+    # json.dumps escapes newlines inside strings, so every raw newline is structural.
+    return text.replace("\n", "\n" + pad)
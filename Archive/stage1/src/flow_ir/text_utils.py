@@ -1,24 +1,81 @@
 from __future__ import annotations
 
 import re
-
-_CAMEL_CASE_PATTERN = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
-_UNDERSCORE_PATTERN = re.compile(r"_+")
+from functools import lru_cache
+
+from .models import NodeKind
+
+SUMMARY_CACHE_SIZE = 4096
+
+# Each summarizer rewrites its input with one precompiled alternation and then
+# collapses whitespace with ``str.split``. Alternatives are ordered (and guarded
+# with lookaheads) so that overlapping operators resolve as they would if each
+# operator were replaced in turn.
+_IDENTIFIER_TOKENS = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|_+|->|::|[.\[\]()]")
+_IDENTIFIER_WORDS = {"->": " to ", "(": "", ")": ""}
+_CONDITION_TOKENS = re.compile(r"==|(?:!=|>=|<=)(?!=)|[<>]")
+_CONDITION_WORDS = {
+    "==": " equals ",
+    "!=": " does not equal ",
+    ">=": " is at least ",
+    "<=": " is at most ",
+    ">": " is greater than ",
+    "<": " is less than ",
+}
+_VALUE_TOKENS = re.compile(r"\*\*|[*/+\-%]")
+_VALUE_WORDS = {
+    "**": " to the power of ",
+    "*": " multiplied by ",
+    "/": " divided by ",
+    "+": " plus ",
+    "-": " minus ",
+    "%": " modulo ",
+}
 _ARG_SPLIT_PATTERN = re.compile(r"\s*,\s*")
 
 
+def _identifier_word(match: "re.Match[str]") -> str:
+    return _IDENTIFIER_WORDS.get(match.group(), " ")
+
+
+def _condition_word(match: "re.Match[str]") -> str:
+    return _CONDITION_WORDS[match.group()]
+
+
+def _value_word(match: "re.Match[str]") -> str:
+    return _VALUE_WORDS[match.group()]
+
+
+def _collapse_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
 def _humanize_identifier(identifier: str) -> str:
     identifier = identifier.strip()
     if not identifier:
         return identifier
-    identifier = _CAMEL_CASE_PATTERN.sub(" ", identifier)
-    identifier = _UNDERSCORE_PATTERN.sub(" ", identifier)
-    identifier = identifier.replace(".", " ").replace("->", " to ")
-    identifier = identifier.replace("::", " ")
-    identifier = identifier.replace("[", " ").replace("]", " ")
-    identifier = identifier.replace("(", "").replace(")", "")
-    identifier = re.sub(r"\s+", " ", identifier)
-    return identifier.strip()
+    return _collapse_whitespace(_IDENTIFIER_TOKENS.sub(_identifier_word, identifier))
+
+
+@lru_cache(maxsize=SUMMARY_CACHE_SIZE)
+def summarize_node(kind: NodeKind, label: str) -> str:
+    """Summary for a node of ``kind`` labelled ``label``.
+
+    Results are kept in a bounded LRU cache keyed by ``(kind, label)``, so
+    labels that recur across functions and files (``i++``, ``return 0;``,
+    ``Start``) are summarized once.
+    """
+    if kind is NodeKind.START:
+        return "Begin the function."
+    if kind is NodeKind.END:
+        return "Finish the function."
+    if kind is NodeKind.JOIN:
+        return "Continue once the branches above rejoin."
+    if kind is NodeKind.CONDITIONAL:
+        return summarize_expression(label)
+    if kind is NodeKind.LOOP:
+        return summarize_loop(label)
+    return summarize_statement(label)
 
 
 def summarize_expression(expr: str) -> str:
@@ -42,15 +99,7 @@ def summarize_condition(cond: str) -> str:
     cond = cond.strip()
     if not cond:
         return "the condition holds"
-    tokens = cond.replace("==", " equals ").replace("!=", " does not equal ")
-    tokens = tokens.replace(">=", " is at least ").replace("<=", " is at most ")
-    tokens = tokens.replace(">", " is greater than ").replace("<", " is less than ")
-    tokens = tokens.replace(" and ", " and ").replace(" or ", " or ")
-    tokens = tokens.replace(" not ", " not ")
-    tokens = tokens.replace(" in ", " in ")
-    tokens = tokens.replace(" is ", " is ")
-    tokens = re.sub(r"\s+", " ", tokens)
-    return tokens.strip()
+    return _collapse_whitespace(_CONDITION_TOKENS.sub(_condition_word, cond))
 
 
 def summarize_loop(header: str) -> str:
@@ -118,11 +167,4 @@ def summarize_value(expr: str) -> str:
     if expr.startswith(("\"", "'")) and expr.endswith(("\"", "'")):
         return expr.strip("\"'")
 
-    expr = expr.replace("**", " to the power of ")
-    expr = expr.replace("*", " multiplied by ")
-    expr = expr.replace("/", " divided by ")
-    expr = expr.replace("+", " plus ")
-    expr = expr.replace("-", " minus ")
-    expr = expr.replace("%", " modulo ")
-    expr = re.sub(r"\s+", " ", expr)
-    return expr.strip()
+    return _collapse_whitespace(_VALUE_TOKENS.sub(_value_word, expr))
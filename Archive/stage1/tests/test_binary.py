@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from flow_ir.binary import dump_module_binary, load_module_binary
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+
+
+class BinaryFormatTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        fixture = Path(__file__).parents[1] / "test_code" / "Flash.c"
+        self.module = CSimpleParser().parse_file(fixture)
+        self.path = self.directory / "flash.firb"
+        dump_module_binary(self.module, self.path)
+
+    def test_round_trip(self) -> None:
+        with load_module_binary(self.path) as loaded:
+            self.assertEqual(len(loaded), len(self.module.functions))
+            self.assertEqual(loaded.function_names, [fn.name for fn in self.module.functions])
+            self.assertEqual(loaded.to_module().to_dict(), self.module.to_dict())
+
+    def test_single_function_lookup(self) -> None:
+        expected = next(fn for fn in self.module.functions if fn.name == "Flash_Task")
+        with load_module_binary(self.path) as loaded:
+            self.assertEqual(loaded.get("Flash_Task").to_dict(), expected.to_dict())
+            self.assertIsNone(loaded.get("missing"))
+
+    def test_rejects_other_files(self) -> None:
+        bogus = self.directory / "bogus.bin"
+        bogus.write_bytes(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            load_module_binary(bogus)
+
+    def test_rejects_truncated_files(self) -> None:
+        data = self.path.read_bytes()
+        truncated = self.directory / "truncated.firb"
+        for size in (10, len(data) // 2, len(data) - 1):
+            truncated.write_bytes(data[:size])
+            with self.assertRaises(ValueError):
+                load_module_binary(truncated)
+
+    def test_close_tolerates_live_slices(self) -> None:
+        loaded = load_module_binary(self.path)
+        view = loaded._buffer[:4]
+        loaded.close()
+        self.assertEqual(bytes(view), b"FIRB")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import textwrap
+import unittest
+
+from flow_ir.blocks import BlockStats, merge_basic_blocks
+from flow_ir.models import NodeKind
+from flow_ir.parsers.python_parser import PythonParser
+
+
+class BasicBlockTests(unittest.TestCase):
+    def _function(self, code: str):
+        return PythonParser().parse_code(textwrap.dedent(code), file_path="sample.py").functions[0]
+
+    def test_straight_line_chain_becomes_one_node(self) -> None:
+        function = self._function(
+            """
+            def f(x):
+                a = x + 1
+                b = a * 2
+                c = b - 3
+                if c:
+                    d = 1
+                return c
+            """
+        )
+        stats = BlockStats()
+        merged = merge_basic_blocks(function, stats)
+
+        block = next(node for node in merged.nodes if node.label.startswith("a = x + 1"))
+        self.assertEqual(block.label, "a = x + 1\nb = a * 2\nc = b - 3")
+        self.assertEqual(block.location.line, 3)
+        self.assertEqual(block.metadata["basic_block"]["end"]["line"], 5)
+        self.assertEqual(len(block.metadata["basic_block"]["node_ids"]), 3)
+
+        self.assertEqual(stats.nodes_before - stats.nodes_after, 2)
+        self.assertEqual(stats.edges_before - stats.edges_after, 2)
+        self.assertGreater(stats.node_reduction, 0)
+
+        ids = {node.id for node in merged.nodes}
+        self.assertTrue(all(edge.source in ids and edge.target in ids for edge in merged.edges))
+        conditional = next(node for node in merged.nodes if node.kind is NodeKind.CONDITIONAL)
+        self.assertIn(
+            (block.id, conditional.id), {(edge.source, edge.target) for edge in merged.edges}
+        )
+
+    def test_branch_targets_are_not_merged(self) -> None:
+        function = self._function(
+            """
+            def g(flag):
+                if flag:
+                    x = 1
+                else:
+                    x = 2
+                y = x
+                return y
+            """
+        )
+        merged = merge_basic_blocks(function)
+        labels = [node.label for node in merged.nodes]
+        self.assertIn("x = 1", labels)
+        self.assertIn("x = 2", labels)
+        self.assertIn("y = x", labels)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -23,6 +23,40 @@ class CSimpleParserTests(unittest.TestCase):
         summaries = [node.summary for node in fn.nodes]
         self.assertTrue(any(summary and ("Repeat" in summary or "Loop" in summary) for summary in summaries))
 
+    def test_node_locations(self) -> None:
+        fn = self.parser.parse_file(self.fixture).functions[0]
+        locations = {node.label.split(" ")[0]: node.location for node in fn.nodes}
+        self.assertEqual((locations["for"].line, locations["for"].column), (3, 4))
+        self.assertEqual((locations["if"].line, locations["if"].column), (4, 8))
+        self.assertEqual(locations["return"].line, 10)
+
+    def test_ignores_brackets_in_comments_and_strings(self) -> None:
+        code = (
+            "/* int fake(void) { */\n"
+            "int greet(int n) {\n"
+            "    // closing brace in a comment }\n"
+            "    const char *s = \"{ ; }\";\n"
+            "    if (n > 0) { puts(s); }\n"
+            "    return n;\n"
+            "}\n"
+        )
+        module = self.parser.parse_code(code)
+        self.assertEqual([fn.name for fn in module.functions], ["greet"])
+        labels = [node.label for node in module.functions[0].nodes]
+        self.assertIn('const char *s = "{ ; }";', labels)
+        self.assertIn("if (n > 0)", labels)
+        self.assertIn("return n;", labels)
+
+    def test_deep_nesting_does_not_hit_recursion_limit(self) -> None:
+        depth = 3000
+        opening = "".join(f"if (x > {i}) {{\n" for i in range(depth))
+        code = f"int deep(int x) {{\n{opening}x++;\n{'}' * depth}\nreturn x;\n}}\n"
+        fn = self.parser.parse_code(code).functions[0]
+        self.assertEqual(len(fn.nodes), depth + 4)
+        ret = next(node for node in fn.nodes if node.label == "return x;")
+        # Every condition's false branch plus the innermost statement falls through to the return.
+        self.assertEqual(sum(edge.target == ret.id for edge in fn.edges), depth + 1)
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
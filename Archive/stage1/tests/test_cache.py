@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from flow_ir.cache import FunctionCache
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+from flow_ir.parsers.python_parser import PythonParser
+
+
+class FunctionCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.fixtures = Path(__file__).parent / "fixtures"
+
+    def _parser(self, parser_cls, **kwargs):
+        parser = parser_cls()
+        parser.cache = FunctionCache(self.directory, **kwargs)
+        return parser
+
+    def test_second_parse_hits_and_matches(self) -> None:
+        code = (self.fixtures / "sample_c.c").read_text(encoding="utf-8")
+        expected = CSimpleParser().parse_code(code, file_path="sum.c").to_dict()
+
+        first = self._parser(CSimpleParser)
+        self.assertEqual(first.parse_code(code, file_path="sum.c").to_dict(), expected)
+        self.assertEqual((first.cache.stats.hits, first.cache.stats.misses), (0, 1))
+
+        second = self._parser(CSimpleParser)
+        self.assertEqual(second.parse_code(code, file_path="sum.c").to_dict(), expected)
+        self.assertEqual((second.cache.stats.hits, second.cache.stats.misses), (1, 0))
+
+    def test_hit_is_rebased_when_function_moves(self) -> None:
+        code = (self.fixtures / "sample_python.py").read_text(encoding="utf-8")
+        self._parser(PythonParser).parse_code(code, file_path="a.py")
+
+        shifted = "import os\n\n\n" + code
+        parser = self._parser(PythonParser)
+        module = parser.parse_code(shifted, file_path="b.py")
+        self.assertEqual(parser.cache.stats.hits, 1)
+        self.assertEqual(module.to_dict(), PythonParser().parse_code(shifted, file_path="b.py").to_dict())
+
+    def test_malformed_entry_is_a_miss_and_is_rebuilt(self) -> None:
+        code = "def a():\n    return 1\n"
+        self._parser(PythonParser).parse_code(code)
+        (entry,) = self.directory.glob("*/*.json")
+        for payload in ('{"line": 1}', '{"line": 1, "function": []}', "[]"):
+            entry.write_text(payload, encoding="utf-8")
+            parser = self._parser(PythonParser)
+            module = parser.parse_code(code)
+            self.assertEqual((parser.cache.stats.hits, parser.cache.stats.misses), (0, 1))
+            self.assertEqual(module.to_dict(), PythonParser().parse_code(code).to_dict())
+
+    def test_evicts_least_recently_used_entries(self) -> None:
+        parser = self._parser(PythonParser, max_bytes=1)
+        parser.parse_code("def a():\n    return 1\n\n\ndef b():\n    return 2\n")
+        self.assertGreaterEqual(parser.cache.stats.evictions, 1)
+        self.assertLessEqual(len(list(self.directory.glob("*/*.json"))), 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
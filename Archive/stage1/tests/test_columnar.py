@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+
+from flow_ir.columnar import ColumnarFunctionIR, compact_module
+from flow_ir.models import EdgeIR, NodeIR, NodeKind
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+
+
+class ColumnarFunctionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fixture = Path(__file__).parents[1] / "test_code" / "Flash.c"
+        self.module = CSimpleParser().parse_file(fixture)
+
+    def test_columnar_module_serializes_identically(self) -> None:
+        compact = compact_module(self.module)
+        self.assertEqual(compact.to_dict(), self.module.to_dict())
+        for original, columnar in zip(self.module.functions, compact.functions):
+            self.assertEqual(columnar.to_function(), original)
+
+    def test_views_expose_node_and_edge_attributes(self) -> None:
+        function = self.module.functions[0]
+        columnar = ColumnarFunctionIR.from_function(function)
+        self.assertEqual(len(columnar.nodes), len(function.nodes))
+        end = next(i for i, node in enumerate(function.nodes) if node.kind is NodeKind.END)
+        view = columnar.nodes[end]
+        self.assertEqual(view.kind, NodeKind.END)
+        self.assertEqual(view.metadata, {"reason": "function_terminator"})
+        self.assertEqual(view.location, function.nodes[end].location)
+        self.assertEqual([(e.source, e.target, e.label) for e in columnar.edges],
+                         [(e.source, e.target, e.label) for e in function.edges])
+
+    def test_metadata_is_allocated_lazily(self) -> None:
+        node = NodeIR(id="n0", kind=NodeKind.STATEMENT, label="x = 1")
+        edge = EdgeIR(source="n0", target="n1")
+        self.assertFalse(node.has_metadata)
+        self.assertEqual(node.to_dict()["metadata"], {})
+        self.assertFalse(node.has_metadata)
+        edge.metadata["weight"] = 2
+        self.assertEqual(edge.to_dict()["metadata"], {"weight": 2})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+
+from flow_ir import serializer
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+from flow_ir.parsers.python_parser import PythonParser
+
+
+class LazyModuleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.code = (Path(__file__).parents[1] / "test_code" / "Flash.c").read_text(encoding="utf-8")
+        self.parser = CSimpleParser()
+
+    def test_functions_are_built_on_access_and_cached(self) -> None:
+        module = self.parser.parse_lazy(self.code, file_path="Flash.c", max_cached=2)
+        self.assertEqual(module.builds, 0)
+        name = module.function_names[3]
+        function = module.get(name)
+        self.assertEqual(function.name, name)
+        self.assertIs(module.get(name), function)
+        self.assertEqual(module.builds, 1)
+
+        module.function(0)
+        module.function(1)
+        # Only two graphs are retained, so the first one we built has been evicted.
+        module.get(name)
+        self.assertEqual(module.builds, 4)
+
+    def test_lazy_module_serializes_like_eager_parse(self) -> None:
+        eager = self.parser.parse_code(self.code, file_path="Flash.c")
+        lazy = self.parser.parse_lazy(self.code, file_path="Flash.c", max_cached=1)
+        self.assertEqual(serializer.module_to_json(lazy), serializer.module_to_json(eager))
+        self.assertEqual(lazy.to_module(), eager)
+
+    def test_python_parser_indexes_function_lines(self) -> None:
+        module = PythonParser().parse_lazy("x = 1\n\ndef a():\n    pass\n\nasync def b():\n    return 2\n")
+        self.assertEqual([(e.name, e.line) for e in module.entries], [("a", 3), ("b", 6)])
+        self.assertEqual(module.functions[-1].metadata, {"async": True})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import io
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from flow_ir import profiling, serializer
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.code = (Path(__file__).parents[1] / "test_code" / "Flash.c").read_text(encoding="utf-8")
+
+    def test_phases_are_recorded_per_function(self) -> None:
+        parser = CSimpleParser()
+        with profiling.profile() as profiler:
+            serializer.write_parsed_json(parser, self.code, io.StringIO(), file_path="Flash.c")
+
+        totals = profiler.totals()
+        for phase in ("tokenize", "extract_functions", "parse_statements", "build_cfg", "summarize", "serialize"):
+            self.assertIn(phase, totals)
+        module = parser.parse_code(self.code, file_path="Flash.c")
+        self.assertEqual(totals["serialize"].calls, len(module.functions))
+        self.assertEqual(totals["summarize"].calls, sum(len(fn.nodes) for fn in module.functions))
+
+        per_function = profiler.by_function()
+        first = module.functions[0].name
+        self.assertEqual(set(per_function[first]), {"parse_statements", "build_cfg", "summarize", "serialize"})
+        self.assertIn(first, profiler.format_table(top=len(per_function)))
+
+        events = profiler.to_chrome_trace()["traceEvents"]
+        self.assertEqual(len(events), len(profiler.records))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+
+    def _patch(self, target, attribute, new=mock.DEFAULT):
+        patcher = mock.patch.object(target, attribute, new)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_disabled_path_uses_shared_no_ops(self) -> None:
+        phases = []
+        timed = []
+        real_phase, real_timed = profiling.phase, profiling.timed
+
+        def spy_phase(name, function=None):
+            context = real_phase(name, function)
+            phases.append(context)
+            return context
+
+        def spy_timed(name, func):
+            wrapped = real_timed(name, func)
+            timed.append((func, wrapped))
+            return wrapped
+
+        profiler_phase = self._patch(profiling.Profiler, "phase")
+        profiler_timed = self._patch(profiling.Profiler, "timed")
+        self._patch(profiling, "phase", spy_phase)
+        self._patch(profiling, "timed", spy_timed)
+        CSimpleParser().parse_code(self.code)
+
+        self.assertIsNone(profiling.active_profiler())
+        profiler_phase.assert_not_called()
+        profiler_timed.assert_not_called()
+        self.assertTrue(phases)
+        self.assertTrue(all(context is profiling._NULL for context in phases))
+        self.assertTrue(timed)
+        self.assertTrue(all(wrapped is func for func, wrapped in timed))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import flow_ir  # noqa: F401  (registers the default parsers)
+from flow_ir.project import discover_sources, parse_project
+
+
+class ParseProjectTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        fixtures = Path(__file__).parent / "fixtures"
+        (self.root / "pkg").mkdir()
+        (self.root / ".hidden").mkdir()
+        shutil.copy(fixtures / "sample_python.py", self.root / "pkg" / "orders.py")
+        shutil.copy(fixtures / "sample_c.c", self.root / "sum.c")
+        shutil.copy(fixtures / "sample_c.c", self.root / ".hidden" / "skipped.c")
+        (self.root / "notes.txt").write_text("not source", encoding="utf-8")
+        (self.root / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+
+    def test_discovers_sources_by_extension(self) -> None:
+        found = [(path.relative_to(self.root).as_posix(), lang) for path, lang in discover_sources(self.root)]
+        self.assertEqual(found, [("broken.py", "python"), ("pkg/orders.py", "python"), ("sum.c", "c")])
+        only_c = discover_sources(self.root, languages=["C"])
+        self.assertEqual([lang for _, lang in only_c], ["c"])
+
+    def test_serial_and_parallel_runs_agree(self) -> None:
+        serial = list(parse_project(self.root, workers=1))
+        parallel = list(parse_project(self.root, workers=2, chunksize=1))
+        self.assertEqual([r.path for r in serial], [r.path for r in parallel])
+        for left, right in zip(serial, parallel):
+            self.assertEqual(left.error is None, right.error is None)
+            if left.module is not None:
+                self.assertEqual(left.module.to_dict(), right.module.to_dict())
+        errors = {Path(r.path).name: r.error for r in serial if r.error}
+        self.assertEqual(list(errors), ["broken.py"])
+        self.assertIn("SyntaxError", errors["broken.py"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
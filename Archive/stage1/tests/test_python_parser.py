@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import unittest
+from collections import Counter
 from pathlib import Path
 
+from flow_ir.models import NodeKind
 from flow_ir.parsers.python_parser import PythonParser
 
 
@@ -24,6 +26,37 @@ class PythonParserTests(unittest.TestCase):
         summaries = [node.summary for node in fn.nodes]
         self.assertTrue(any(summary and "Check whether" in summary for summary in summaries))
 
+    def test_join_threshold_routes_converging_branches(self) -> None:
+        branches = "".join(f"    elif x == {i}:\n        y = {i}\n" for i in range(1, 8))
+        code = f"def f(x):\n    if x == 0:\n        y = 0\n{branches}    return y\n"
+        baseline = self.parser.parse_code(code).functions[0]
+
+        self.parser.join_threshold = 3
+        joined = self.parser.parse_code(code).functions[0]
+
+        joins = [node for node in joined.nodes if node.kind is NodeKind.JOIN]
+        self.assertEqual(len(joins), 1)
+        fan_in = Counter(edge.target for edge in joined.edges)
+        ret = next(node for node in joined.nodes if node.kind is NodeKind.RETURN)
+        self.assertEqual(fan_in[ret.id], 1)
+        self.assertEqual(fan_in[joins[0].id], max(Counter(e.target for e in baseline.edges).values()))
+        self.assertEqual(len(joined.edges), len(baseline.edges) + 1)
+
+    def test_long_elif_chain_does_not_hit_recursion_limit(self) -> None:
+        # Each elif is a nested ast.If; 400 levels overflowed the old recursive builder.
+        branches = "".join(f"    elif x == {i}:\n        y = {i}\n" for i in range(1, 400))
+        code = f"def f(x):\n    if x == 0:\n        y = 0\n{branches}    return y\n"
+        fn = self.parser.parse_code(code).functions[0]
+        conditionals = [node for node in fn.nodes if node.kind is NodeKind.CONDITIONAL]
+        self.assertEqual(len(conditionals), 400)
+
+    def test_source_segments_handle_crlf_and_non_ascii(self) -> None:
+        code = "def f(x):\r\n    s = 'h\u00e9llo'  ;  t = s\r\n    if x and \\\r\n       s:\r\n        return s\r\n"
+        labels = [node.label for node in self.parser.parse_code(code).functions[0].nodes]
+        self.assertIn("s = 'h\u00e9llo'", labels)
+        self.assertIn("t = s", labels)
+        self.assertIn("if x and \\\r\n       s", labels)
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from flow_ir import registry
+
+SRC = Path(__file__).parents[1] / "src"
+
+
+class LazyRegistryTests(unittest.TestCase):
+    def test_importing_flow_ir_does_not_import_parsers(self) -> None:
+        script = textwrap.dedent(
+            """
+            import sys
+            import flow_ir
+            languages = list(flow_ir.list_languages())
+            assert "c" in languages and "python" in languages, languages
+            loaded = [name for name in sys.modules if name.startswith("flow_ir.parsers.")]
+            assert not loaded, loaded
+            flow_ir.get_parser("python")
+            assert "flow_ir.parsers.python_parser" in sys.modules
+            assert "flow_ir.parsers.c_simple_parser" not in sys.modules
+            """
+        )
+        env = dict(os.environ, PYTHONPATH=str(SRC))
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_module_attribute_target_is_registered_on_first_use(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "toy_flow_parser.py").write_text(
+                "from flow_ir.parsers.python_parser import PythonParser\n"
+                "class ToyParser(PythonParser):\n"
+                "    language = 'toy'\n",
+                encoding="utf-8",
+            )
+            sys.path.insert(0, tmp)
+            try:
+                registry.register_lazy_parser("Toy", "toy_flow_parser:ToyParser", extensions=(".toy",))
+                self.assertIn("toy", registry.list_languages())
+                self.assertEqual(registry.language_for_path("x.toy"), "toy")
+                self.assertNotIn("toy_flow_parser", sys.modules)
+                self.assertEqual(registry.get_parser("toy").language, "toy")
+                with self.assertRaises(ValueError):
+                    registry.register_lazy_parser("toy", "elsewhere")
+            finally:
+                sys.path.remove(tmp)
+                sys.modules.pop("toy_flow_parser", None)
+                registry._REGISTRY.pop("toy", None)
+                registry._EXTENSIONS.pop(".toy", None)
+
+    def test_broken_plugin_is_logged_and_not_retried(self) -> None:
+        registry.register_lazy_parser("broken", "flow_ir_missing_plugin_module")
+        try:
+            with mock.patch.object(registry.importlib, "import_module", wraps=registry.importlib.import_module) as imports:
+                with self.assertLogs("flow_ir.registry", "WARNING") as logs:
+                    self.assertIsNone(registry.language_for_path("notes.txt"))
+                self.assertIsNone(registry.language_for_path("notes.txt"))
+                self.assertIsNone(registry.language_for_path("README.md"))
+            attempted = [call.args[0] for call in imports.call_args_list]
+            self.assertEqual(attempted.count("flow_ir_missing_plugin_module"), 1)
+            self.assertIn("broken", logs.output[0])
+            self.assertNotIn("broken", registry.list_languages())
+            self.assertEqual(registry.language_for_path("x.py"), "python")
+            with self.assertRaises(KeyError) as raised:
+                registry.get_parser("broken")
+            self.assertIn("ModuleNotFoundError", str(raised.exception))
+        finally:
+            registry._LAZY.pop("broken", None)
+            registry._FAILED.pop("broken", None)
+
+    def test_pooled_parsers_are_reused_but_never_shared(self) -> None:
+        with registry.pooled_parser("python") as first:
+            with registry.pooled_parser("Python") as second:
+                self.assertIsNot(first, second)
+        with registry.pooled_parser("python") as again:
+            self.assertIn(again, (first, second))
+
+        seen = []
+        barrier = threading.Barrier(4)
+
+        def work() -> None:
+            with registry.pooled_parser("python") as parser:
+                barrier.wait()
+                seen.append(parser)
+                parser.parse_code("def f():\n    return 1\n")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(parser) for parser in seen}), 4)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from flow_ir import cli, serializer
+from flow_ir.models import ModuleIR
+from flow_ir.parsers.c_simple_parser import CSimpleParser
+from flow_ir.parsers.python_parser import PythonParser
+
+
+class StreamingSerializerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fixture = Path(__file__).parents[1] / "test_code" / "Flash.c"
+        self.module = CSimpleParser().parse_file(fixture)
+
+    def test_streamed_json_matches_module_to_json(self) -> None:
+        for indent in (None, 2):
+            buffer = io.StringIO()
+            serializer.write_module_json(self.module, buffer, indent=indent)
+            self.assertEqual(buffer.getvalue(), json.dumps(self.module.to_dict(), indent=indent))
+
+    def test_ndjson_writes_header_then_one_function_per_line(self) -> None:
+        buffer = io.StringIO()
+        serializer.write_module_ndjson(self.module, buffer)
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(len(lines), len(self.module.functions) + 1)
+        header = json.loads(lines[0])
+        self.assertEqual(header["language"], "c")
+        self.assertEqual(json.loads(lines[1]), self.module.functions[0].to_dict())
+
+
+class StreamingParseTests(unittest.TestCase):
+    CODE = (
+        "import os\n"
+        "\n"
+        "@decorator\n"
+        "def a(x):\n"
+        "    return x\n"
+        "\n"
+        "TEXT = \"\"\"\n"
+        "def not_a_function():\n"
+        "    pass\n"
+        "\"\"\"\n"
+        "\n"
+        "class C:\n"
+        "    def method(self):\n"
+        "        pass\n"
+        "\n"
+        "async def b():\n"
+        "    if os.sep:\n"
+        "        return 1\n"
+    )
+
+    def test_written_json_matches_eager_parse(self) -> None:
+        parser = PythonParser()
+        buffer = io.StringIO()
+        serializer.write_parsed_json(parser, self.CODE, buffer, file_path="sample.py")
+        eager = parser.parse_code(self.CODE, file_path="sample.py")
+        self.assertEqual(buffer.getvalue(), serializer.module_to_json(eager))
+        self.assertEqual([fn.name for fn in eager.functions], ["a", "b"])
+        self.assertEqual(eager.functions[1].nodes[0].location.line, 16)
+
+    def test_iter_functions_is_lazy_and_reports_syntax_errors(self) -> None:
+        functions = PythonParser().iter_functions("def ok():\n    pass\n\ndef broken(:\n    pass\n")
+        self.assertEqual(next(functions).name, "ok")
+        with self.assertRaises(SyntaxError) as raised:
+            next(functions)
+        self.assertEqual(raised.exception.lineno, 4)
+
+    def test_cli_parse_keeps_previous_output_when_parsing_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp, "broken.py")
+            source.write_text("def ok():\n    pass\n\ndef broken(:\n    pass\n", encoding="utf-8")
+            out = Path(tmp, "broken.json")
+            out.write_text('{"previous": true}', encoding="utf-8")
+            with self.assertRaises(SyntaxError):
+                cli.main(["parse", str(source), "-l", "python", "--out", str(out)])
+            self.assertEqual(out.read_text(encoding="utf-8"), '{"previous": true}')
+            self.assertEqual(sorted(path.name for path in Path(tmp).iterdir()), ["broken.json", "broken.py"])
+
+    def test_cli_parse_to_stdout_streams_unless_buffered(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp, "broken.py")
+            source.write_text("def ok():\n    pass\n\ndef broken(:\n    pass\n", encoding="utf-8")
+            argv = ["parse", str(source), "-l", "python"]
+            for extra, expect_output in (([], True), (["--buffer"], False)):
+                stdout = io.StringIO()
+                with redirect_stdout(stdout), self.assertRaises(SyntaxError):
+                    cli.main(argv + extra)
+                self.assertEqual(bool(stdout.getvalue()), expect_output)
+
+            source.write_text("def ok():\n    pass\n", encoding="utf-8")
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                cli.main(argv + ["--buffer"])
+            self.assertEqual(json.loads(stdout.getvalue())["functions"][0]["name"], "ok")
+
+    def test_c_functions_stream_like_parse_code(self) -> None:
+        parser = CSimpleParser()
+        code = (Path(__file__).parents[1] / "test_code" / "Flash.c").read_text(encoding="utf-8")
+        buffer = io.StringIO()
+        serializer.write_parsed_ndjson(parser, code, buffer, file_path="Flash.c")
+        expected = io.StringIO()
+        serializer.write_module_ndjson(parser.parse_code(code, file_path="Flash.c"), expected)
+        self.assertEqual(buffer.getvalue(), expected.getvalue())
+
+
+class LoadModuleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        fixture = Path(__file__).parents[1] / "test_code" / "Flash.c"
+        self.module = CSimpleParser().parse_file(fixture)
+        # Braces and a "functions" key inside metadata must not confuse the index.
+        self.module.metadata["notes"] = {"functions": ["}{", '"functions": [']}
+
+    def test_every_layout_round_trips(self) -> None:
+        documents = [json.dumps(self.module.to_dict(), indent=indent) for indent in (2, 4, 0, None)]
+        buffer = io.StringIO()
+        serializer.write_module_ndjson(self.module, buffer)
+        documents.append(buffer.getvalue())
+        for document in documents:
+            loaded = ModuleIR.from_json(document)
+            self.assertEqual(loaded.function_names, [fn.name for fn in self.module.functions])
+            self.assertEqual(loaded.to_module(), self.module)
+
+    def test_load_module_decodes_only_requested_functions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "flash.flow.json"
+            serializer.dump_module(self.module, path)
+            loaded = serializer.load_module(path)
+            self.assertEqual(loaded.metadata, self.module.metadata)
+            target = self.module.functions[-1]
+            self.assertEqual(loaded.get(target.name), target)
+            self.assertEqual(loaded.builds, 1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import unittest
+
+from flow_ir.models import NodeKind
+from flow_ir.text_utils import (
+    _humanize_identifier,
+    summarize_condition,
+    summarize_node,
+    summarize_value,
+)
+
+
+class SummarizerTests(unittest.TestCase):
+    def test_operators_are_rewritten_in_one_pass(self) -> None:
+        self.assertEqual(summarize_condition("a>=b  and c!=d"), "a is at least b and c does not equal d")
+        # ``==`` wins over a ``!=``/``<=`` that overlaps it, as with ordered replacement.
+        self.assertEqual(summarize_condition("x!==y"), "x! equals y")
+        self.assertEqual(summarize_condition("x<==y"), "x is less than equals y")
+        self.assertEqual(summarize_value("a ** b-c"), "a to the power of b minus c")
+        self.assertEqual(_humanize_identifier("self.itemCount[i]->next_node"), "self item Count i to next node")
+
+    def test_summaries_are_cached_by_kind_and_label(self) -> None:
+        summarize_node.cache_clear()
+        self.assertEqual(summarize_node(NodeKind.STATEMENT, "i++;"), "i++")
+        self.assertEqual(summarize_node(NodeKind.STATEMENT, "i++;"), "i++")
+        self.assertEqual(summarize_node(NodeKind.LOOP, "while x < 3"), "Loop while x is less than 3.")
+        info = summarize_node.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
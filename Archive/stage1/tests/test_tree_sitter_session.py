@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import unittest
+import warnings
+
+from flow_ir.parsers import tree_sitter_adapter as ts
+
+C_QUERY = """
+(function_definition
+  declarator: (function_declarator
+    declarator: (identifier) @name)
+  body: (compound_statement) @body)
+"""
+
+SOURCE = """int first(int a) {
+    a = a + 1;
+    return a;
+}
+
+int second(int b) {
+    return b * 2;
+}
+
+int third(void) {
+    return 3;
+}
+"""
+
+
+def _make_adapter():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return ts.TreeSitterAdapter(
+            ts.TreeSitterLanguageConfig(language="c", tree_sitter_language="c", function_query=C_QUERY)
+        )
+
+
+@unittest.skipIf(ts.Parser is None, "tree_sitter is not installed")
+class TreeSitterSessionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.adapter = _make_adapter()
+        self.session = ts.TreeSitterSession(self.adapter, SOURCE, file_path="demo.c")
+
+    def _assert_matches_full_parse(self) -> None:
+        full = self.adapter.parse_code(self.session.text, file_path="demo.c")
+        self.assertEqual(self.session.module.to_dict(), full.to_dict())
+
+    def test_edit_inside_function_rebuilds_only_that_function(self) -> None:
+        offset = SOURCE.index("b * 2")
+        self.session.edit(offset, offset + len("b * 2"), "b * 4")
+        self.assertEqual(self.session.rebuilt, ["second"])
+        self._assert_matches_full_parse()
+
+    def test_inserted_lines_shift_later_functions(self) -> None:
+        offset = SOURCE.index("    return a;")
+        self.session.edit(offset, offset, "    a = a * 3;\n    a = a - 1;\n")
+        self.assertEqual(self.session.rebuilt, ["first"])
+        self._assert_matches_full_parse()
+        third = self.session.module.functions[2]
+        self.assertEqual(third.nodes[1].location.line, 13)
+
+    def test_adapters_share_compiled_query(self) -> None:
+        other = _make_adapter()
+        self.assertIs(other._query, self.adapter._query)
+        self.assertIsNot(other._parser, self.adapter._parser)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
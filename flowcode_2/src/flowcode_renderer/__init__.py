@@ -3,7 +3,8 @@
 from .models import FlowGraph, GraphEdge, GraphNode
 from .parser import parse_graph
 from .renderer import render_graphviz, render_terminal
-from .converter import graph_to_stage2_module
+from .converter import graph_to_dict, graph_to_stage2_module
+from .ir_bridge import function_to_graph, module_to_graph, module_to_graphs
 
 __all__ = [
     "FlowGraph",
@@ -13,4 +14,8 @@ __all__ = [
     "render_terminal",
     "render_graphviz",
     "graph_to_stage2_module",
+    "graph_to_dict",
+    "function_to_graph",
+    "module_to_graph",
+    "module_to_graphs",
 ]
@@ -0,0 +1,157 @@
+"""On-disk cache of model responses.
+
+Responses are stored one JSON file per request under the cache directory,
+addressed by a SHA-256 of (model, instructions, prompt), so an unchanged source
+file, prompt and model never reach the API twice. Entries expire after ``ttl``
+seconds; when the directory grows beyond ``max_bytes`` the least recently used
+entries are removed (hits refresh an entry's modification time).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 30 * 24 * 3600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """``$FLOWCODE_CACHE_DIR``, else ``$XDG_CACHE_HOME/flowcode`` (``~/.cache/flowcode``)."""
+    configured = os.getenv("FLOWCODE_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "flowcode"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+
+class ResponseCache:
+    """Content-addressed response store; ``refresh`` skips lookups but still stores results."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        refresh: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(model: str, instructions: str, prompt: str) -> str:
+        digest = hashlib.sha256()
+        for part in (str(CACHE_VERSION), model, instructions, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, model: str, instructions: str, prompt: str) -> Optional[str]:
+        if self.refresh:
+            self.stats.misses += 1
+            return None
+        path = self._path(self.key(model, instructions, prompt))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            text = entry["text"]
+            created = float(entry["created"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.stats.misses += 1
+            return None
+        if self._expired(created, time.time()):
+            self._remove(path)
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats.hits += 1
+        return text
+
+    def put(self, model: str, instructions: str, prompt: str, text: str) -> None:
+        path = self._path(self.key(model, instructions, prompt))
+        entry = {"version": CACHE_VERSION, "model": model, "created": time.time(), "text": text}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so concurrent runs never read a partial entry.
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except (OSError, TypeError, ValueError):
+            self._remove(Path(tmp_name))
+            return
+        self.stats.writes += 1
+        self.evict()
+
+    def discard(self, model: str, instructions: str, prompt: str) -> None:
+        """Remove the entry for a request, e.g. when its cached reply turned out to be unusable."""
+        self._remove(self._path(self.key(model, instructions, prompt)))
+
+    def evict(self) -> int:
+        """Remove expired entries, then the least recently used ones beyond ``max_bytes``."""
+        now = time.time()
+        entries: List[Tuple[float, int, Path]] = []
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            # Hits only move the modification time forward, so an entry unused for ``ttl`` has expired;
+            # entries that expired while in use are dropped by ``get``.
+            if self._expired(stat.st_mtime, now):
+                removed += self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda item: item[0]):
+                if total <= self.max_bytes:
+                    break
+                removed += self._remove(path)
+                total -= size
+        self.stats.evictions += removed
+        return removed
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        try:
+            path.unlink()
+        except OSError:
+            return 0
+        return 1
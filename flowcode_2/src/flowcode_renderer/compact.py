@@ -0,0 +1,136 @@
+"""Compact text encoding of a ``FlowGraph`` for model prompts.
+
+The graph structure is already known (it comes from the Stage 1 parsers), so
+the model only needs to see each step once and refer to it by a short id::
+
+    # check
+    1 start Start -> 3
+    2 end End
+    3 decision if value > 10 -> 4 (True), 5 (False)
+    4 process return "big" -> 2
+
+:func:`encode_graph` returns that text and the node id behind each short id;
+:func:`apply_labels` takes the model's reply (new titles and summaries, plus
+runs of straight-line steps to merge) and applies it without ever letting the
+reply add nodes or change edges.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .models import FlowGraph, GraphEdge
+
+# Only straight-line steps may be merged; decisions, loops and terminators keep their shape.
+_MERGEABLE_TYPES = frozenset({"process", "call"})
+
+
+def encode_graph(graph: FlowGraph) -> Tuple[str, List[str]]:
+    """Return the compact text and the node ids, where short id ``n`` is ``ids[n - 1]``."""
+    ids = list(graph.nodes)
+    alias = {node_id: str(index) for index, node_id in enumerate(ids, start=1)}
+    adjacency = graph.adjacency()
+
+    lines: List[str] = []
+    function: Optional[str] = None
+    for node_id in ids:
+        group = node_id.rpartition(":")[0]
+        if group and group != function:
+            function = group
+            lines.append(f"# {group}")
+        node = graph.nodes[node_id]
+        line = f"{alias[node_id]} {node.type} {_one_line(node.title)}"
+        targets = [
+            alias.get(edge.target, edge.target) + (f" ({edge.label})" if edge.label else "")
+            for edge in adjacency.get(node_id, ())
+        ]
+        if targets:
+            line += " -> " + ", ".join(targets)
+        lines.append(line)
+    return "\n".join(lines), ids
+
+
+def apply_labels(graph: FlowGraph, data: Dict[str, Any], ids: Sequence[str]) -> None:
+    """Apply a labelling reply (see :func:`encode_graph`) to ``graph`` in place.
+
+    ``data`` may hold ``metadata`` (``title``/``summary``), ``nodes`` (``id``,
+    ``title``, ``summary``, optional ``detail``) and ``merge`` (lists of short
+    ids). Unknown ids are ignored, and a merge is applied only when its ids form
+    a chain of ``process``/``call`` steps in which each step's single successor
+    is the next one.
+    """
+    def resolve(short_id: Any) -> Optional[str]:
+        try:
+            index = int(str(short_id).strip())
+        except ValueError:
+            return None
+        if 1 <= index <= len(ids) and ids[index - 1] in graph.nodes:
+            return ids[index - 1]
+        return None
+
+    for group in data.get("merge") or []:
+        if isinstance(group, list):
+            chain = [resolve(item) for item in group]
+            if None not in chain:
+                _merge_chain(graph, chain)  # type: ignore[arg-type]
+
+    metadata = data.get("metadata")
+    if isinstance(metadata, dict):
+        for key in ("title", "summary"):
+            text = _text(metadata.get(key))
+            if text:
+                graph.metadata[key] = text
+
+    for item in data.get("nodes") or []:
+        if not isinstance(item, dict):
+            continue
+        node_id = resolve(item.get("id"))
+        if node_id is None:
+            continue
+        node = graph.nodes[node_id]
+        node.title = _text(item.get("title")) or node.title
+        node.summary = _text(item.get("summary")) or node.summary
+        node.detail = _text(item.get("detail")) or node.detail
+
+
+def _merge_chain(graph: FlowGraph, chain: List[str]) -> bool:
+    if len(chain) < 2 or len(set(chain)) != len(chain):
+        return False
+    if any(graph.nodes[node_id].type not in _MERGEABLE_TYPES for node_id in chain):
+        return False
+    outgoing: Dict[str, List[GraphEdge]] = graph.adjacency()
+    incoming: Dict[str, int] = {}
+    for edge in graph.edges:
+        incoming[edge.target] = incoming.get(edge.target, 0) + 1
+    for current, following in zip(chain, chain[1:]):
+        edges = outgoing.get(current, [])
+        if len(edges) != 1 or edges[0].target != following or incoming.get(following) != 1:
+            return False
+
+    head = graph.nodes[chain[0]]
+    merged = [graph.nodes[node_id] for node_id in chain]
+    head.summary = " ".join(node.summary for node in merged)
+    head.detail = "\n".join(node.title for node in merged)
+    removed = set(chain[1:])
+    internal = set(chain[:-1])
+    edges_out = []
+    for edge in graph.edges:
+        if edge.source in internal:
+            continue
+        if edge.source == chain[-1]:
+            edge.source = chain[0]
+        edges_out.append(edge)
+    graph.edges = edges_out
+    for node_id in removed:
+        del graph.nodes[node_id]
+    return True
+
+
+def _one_line(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
@@ -73,3 +73,33 @@ def graph_to_stage2_module(graph: FlowGraph) -> Dict[str, object]:
     }
 
     return module
+
+
+def graph_to_dict(graph: FlowGraph) -> Dict[str, object]:
+    """Flowchart JSON for ``graph``, in the format read by ``parse_graph_json``."""
+    nodes_payload = [
+        {
+            "id": node.id,
+            "title": node.title,
+            "summary": node.summary,
+            "detail": node.detail,
+            "type": node.type,
+        }
+        for node in graph.nodes.values()
+    ]
+
+    edges_payload = []
+    for edge in graph.edges:
+        payload: Dict[str, Any] = {"source": edge.source, "target": edge.target}
+        if edge.label:
+            payload["label"] = edge.label
+        if edge.metadata:
+            payload["metadata"] = edge.metadata
+        edges_payload.append(payload)
+
+    return {
+        "metadata": graph.metadata.copy(),
+        "entry_node": graph.entry_node,
+        "nodes": nodes_payload,
+        "edges": edges_payload,
+    }
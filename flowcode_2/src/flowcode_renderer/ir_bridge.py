@@ -0,0 +1,100 @@
+"""Build ``FlowGraph`` objects directly from Stage 1 ``flow_ir`` IR.
+
+The bridge reads ``ModuleIR``/``FunctionIR`` attributes only, so it needs no
+``flow_ir`` import and accepts lazily loaded modules as well (functions are
+built one at a time by :func:`module_to_graphs`). Node ids, labels and
+summaries are reused as-is, and edge metadata dictionaries are shared with the
+IR rather than copied.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Optional
+
+from .models import FlowGraph, GraphEdge, GraphNode
+
+# ``flow_ir.models.NodeKind`` values → renderer node types.
+NODE_KIND_MAP: Dict[str, str] = {
+    "start": "start",
+    "end": "end",
+    "statement": "process",
+    "conditional": "decision",
+    "loop": "loop",
+    "call": "call",
+    "return": "process",
+    "exception": "process",
+    "join": "process",
+    "unknown": "process",
+}
+
+
+def function_to_graph(function: Any, *, language: Optional[str] = None, prefix: str = "") -> FlowGraph:
+    """Convert one ``FunctionIR`` into a ``FlowGraph``.
+
+    ``prefix`` is prepended to every node id, which keeps ids unique when several
+    functions share one graph (see :func:`module_to_graph`).
+    """
+    graph = FlowGraph(metadata=_function_metadata(function, language))
+    _add_function(graph, function, prefix)
+    return graph
+
+
+def module_to_graphs(module: Any) -> Iterator[FlowGraph]:
+    """Yield one ``FlowGraph`` per function of a ``ModuleIR`` or ``LazyModuleIR``."""
+    for function in module.functions:
+        yield function_to_graph(function, language=module.language)
+
+
+def module_to_graph(module: Any) -> FlowGraph:
+    """Convert a whole module into a single ``FlowGraph``.
+
+    Node ids are prefixed with ``"<function name>:"`` and the entry node is the
+    first function's start node. A name seen again (C ``#ifdef``/``#else``
+    bodies, Python redefinitions) gets ``"<name>#2:"``, ``"<name>#3:"`` and so on,
+    so each definition keeps its own nodes.
+    """
+    metadata: Dict[str, str] = {"language": module.language}
+    file_path = (module.metadata or {}).get("file_path")
+    if file_path:
+        metadata["title"] = str(file_path)
+    graph = FlowGraph(metadata=metadata)
+    seen: Dict[str, int] = {}
+    for function in module.functions:
+        count = seen[function.name] = seen.get(function.name, 0) + 1
+        name = function.name if count == 1 else f"{function.name}#{count}"
+        _add_function(graph, function, f"{name}:")
+    return graph
+
+
+def _function_metadata(function: Any, language: Optional[str]) -> Dict[str, str]:
+    metadata = {"title": function.name}
+    if function.docstring:
+        metadata["summary"] = function.docstring
+    if language:
+        metadata["language"] = language
+    return metadata
+
+
+def _add_function(graph: FlowGraph, function: Any, prefix: str) -> None:
+    nodes = graph.nodes
+    for node in function.nodes:
+        node_id = prefix + node.id if prefix else node.id
+        # ``NodeKind`` is a ``str`` enum, so its members hash and compare like their values.
+        node_type = NODE_KIND_MAP.get(node.kind, "process")
+        if node_type == "start" and graph.entry_node is None:
+            graph.entry_node = node_id
+        nodes[node_id] = GraphNode(
+            id=node_id,
+            title=node.label,
+            summary=node.summary or node.label,
+            type=node_type,
+        )
+
+    edges = graph.edges
+    for edge in function.edges:
+        # ``has_metadata`` avoids allocating the IR edge's lazy metadata dict.
+        metadata = edge.metadata if edge.has_metadata else {}
+        if prefix:
+            edges.append(GraphEdge(prefix + edge.source, prefix + edge.target, edge.label, metadata))
+        else:
+            edges.append(GraphEdge(edge.source, edge.target, edge.label, metadata))
@@ -6,19 +6,29 @@ import os
 from importlib import resources
 import sys
 from pathlib import Path
-from typing import Optional
-
-try:
-    from openai import OpenAI
-except ImportError as exc:  # pragma: no cover
-    raise SystemExit("Missing dependency 'openai'. Install it with `pip install openai`.") from exc
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
+from .cache import DEFAULT_MAX_BYTES, DEFAULT_TTL, ResponseCache, default_cache_dir
+from .models import FlowGraph
 from .parser import parse_graph
-from .converter import graph_to_stage2_module
+from .compact import apply_labels, encode_graph
+from .converter import graph_to_dict, graph_to_stage2_module
+from .ir_bridge import module_to_graph
+
+if TYPE_CHECKING:  # pragma: no cover
+    from openai import OpenAI
 
 
 DEFAULT_STAGE1_MODEL = "gpt-5"
 DEFAULT_STAGE2_MODEL = "gpt-5-nano"
+ENGINES = ("llm", "local")
+STAGE2_INPUTS = ("narrative", "ir")
+
+# Set by ``main`` from the cache flags; None disables caching.
+_RESPONSE_CACHE: Optional[ResponseCache] = None
+# Fresh API replies by cache key, stored only once their caller has accepted them.
+_PENDING_RESPONSES: Dict[str, Tuple[str, str, str, str]] = {}
 
 
 TEXT_SYSTEM_PROMPT = """You are a senior software architect tasked with documenting codebases for cross-functional teams.
@@ -70,6 +80,24 @@ You will receive a flowchart JSON object in English. Return the same JSON struct
 Do not alter IDs, node types, or add/remove fields. Return only JSON without code fences.
 """
 
+LABEL_SYSTEM_PROMPT_EN = """You are a senior software architect turning a parsed control-flow graph into a flowchart for non-developers.
+The structure is already correct: you only write the human-readable text and may combine trivial consecutive steps.
+All text must be in English and understandable to non-developers."""
+
+LABEL_INSTRUCTION_EN = """
+Each graph line is `<id> <type> <source code> -> <next id> (<edge label>), ...`; a `#` line names the function whose steps follow.
+Return ONLY JSON matching this schema:
+{
+  "metadata": {"title": "Concise title", "summary": "1-2 sentence overview"},
+  "nodes": [{"id": "id from the graph", "title": "Short descriptive title", "summary": "One-sentence description of this step"}],
+  "merge": [["id", "id"]]
+}
+Guidelines:
+- Give every node a title and summary; use the function's purpose for start and end nodes.
+- `merge` optionally lists runs of consecutive straight-line steps (in order) to show as one node; label the merged node under its first id.
+- Do not invent ids, nodes or edges. Do not wrap the JSON in code fences or add commentary.
+"""
+
 
 def _ensure_api_key() -> str:
     key = os.getenv("OPENAI_API_KEY")
@@ -98,6 +126,11 @@ def _ensure_api_key() -> str:
 
 
 def _openai_client() -> OpenAI:
+    try:
+        from openai import OpenAI
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit("Missing dependency 'openai'. Install it with `pip install openai`.") from exc
+
     _ensure_api_key()
     return OpenAI(api_key=os.environ["OPENAI_API_KEY"])  # type: ignore[literal-required]
 
@@ -117,58 +150,194 @@ def _stage1_generate_narrative(include_file: Path, *, model: str, show_prompt: b
 
     prompt = f"{base_prompt}\n\n===== Included File: {include_file} =====\n{included}\n===== End Included File =====\n"
 
-    client = _openai_client()
     if show_prompt:
         print("--- Stage 1 Prompt ---")
         print(prompt)
         print("----------------------")
-    response = client.responses.create(model=model, instructions=TEXT_SYSTEM_PROMPT, input=prompt)
-    text = getattr(response, "output_text", None)
-    if not text:
-        # fallback
-        try:
-            text = response.output[0].content[0].text  # type: ignore[attr-defined]
-        except Exception as exc:  # pragma: no cover
-            raise SystemExit(f"Unexpected API response format: {response}") from exc
-    return text.strip()
+    text = _response_text(prompt, TEXT_SYSTEM_PROMPT, model=model).strip()
+    if text:
+        _keep_response(prompt, TEXT_SYSTEM_PROMPT, model=model)
+    return text
 
 
 def _call_model(prompt: str, instructions: str, *, model: str, show_prompt: bool) -> str:
-    client = _openai_client()
     if show_prompt:
         print("--- Prompt being sent ---")
         print(prompt)
         print("--------------------------")
+    return _response_text(prompt, instructions, model=model)
+
+
+def _response_text(prompt: str, instructions: str, *, model: str) -> str:
+    """Model output for ``prompt``, served from the response cache when possible.
+
+    A fresh reply is cached only when the caller accepts it with :func:`_keep_response`,
+    so a reply that fails to parse is requested again on the next run.
+    """
+    cache = _RESPONSE_CACHE
+    if cache is not None:
+        cached = cache.get(model, instructions, prompt)
+        if cached is not None:
+            return cached
+
+    client = _openai_client()
     response = client.responses.create(model=model, instructions=instructions, input=prompt)
     text = getattr(response, "output_text", None)
-    if text:
-        return text
+    if not text:
+        try:
+            text = response.output[0].content[0].text  # type: ignore[attr-defined]
+        except Exception as exc:  # pragma: no cover
+            raise SystemExit(f"Unexpected API response format: {response}") from exc
+    if cache is not None and text:
+        _PENDING_RESPONSES[cache.key(model, instructions, prompt)] = (model, instructions, prompt, text)
+    return text
+
+
+def _keep_response(prompt: str, instructions: str, *, model: str) -> None:
+    cache = _RESPONSE_CACHE
+    if cache is None:
+        return
+    pending = _PENDING_RESPONSES.pop(cache.key(model, instructions, prompt), None)
+    if pending is not None:
+        cache.put(*pending)
+
+
+def _drop_response(prompt: str, instructions: str, *, model: str) -> None:
+    cache = _RESPONSE_CACHE
+    if cache is None:
+        return
+    _PENDING_RESPONSES.pop(cache.key(model, instructions, prompt), None)
+    cache.discard(model, instructions, prompt)
+
+
+def _decode_reply(raw: str, prompt: str, instructions: str, *, model: str, failure: str) -> Any:
+    """Parse a JSON reply, caching it on success and dropping any cached copy on failure."""
     try:
-        return response.output[0].content[0].text  # type: ignore[attr-defined]
-    except Exception as exc:  # pragma: no cover
-        raise SystemExit(f"Unexpected API response format: {response}") from exc
+        data = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        _drop_response(prompt, instructions, model=model)
+        raise SystemExit(f"{failure}: {exc}\nRaw output:\n{raw}") from exc
+    _keep_response(prompt, instructions, model=model)
+    return data
+
+
+def _configure_cache(args: argparse.Namespace) -> None:
+    global _RESPONSE_CACHE
+    if args.no_cache:
+        _RESPONSE_CACHE = None
+        return
+    _RESPONSE_CACHE = ResponseCache(
+        args.cache_dir or default_cache_dir(),
+        ttl=args.cache_ttl_days * 24 * 3600 if args.cache_ttl_days > 0 else None,
+        max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb > 0 else None,
+        refresh=args.refresh,
+    )
+
+
+def _report_cache() -> None:
+    cache = _RESPONSE_CACHE
+    if cache is None or not cache.stats.lookups:
+        return
+    stats = cache.stats
+    rate = stats.hits / stats.lookups
+    print(f"Response cache: {stats.hits} hit(s), {stats.misses} miss(es) ({rate:.0%} hit rate), {stats.evictions} evicted — {cache.directory}")
 
 
 def _stage2_generate_graphs(explanation: str, *, model: str, show_prompt: bool) -> tuple[dict, dict]:
     prompt_en = f"{explanation}\n\n{GRAPH_OUTPUT_INSTRUCTION_EN.strip()}"
     raw_en = _call_model(prompt_en, GRAPH_SYSTEM_PROMPT_EN, model=model, show_prompt=show_prompt)
-    try:
-        data_en = json.loads(raw_en)
-    except json.JSONDecodeError as exc:
-        raise SystemExit(f"English graph generation failed: {exc}\nRaw output:\n{raw_en}") from exc
+    data_en = _decode_reply(raw_en, prompt_en, GRAPH_SYSTEM_PROMPT_EN, model=model, failure="English graph generation failed")
     if isinstance(data_en, dict):
         data_en.setdefault("metadata", {}).update({"language": "en"})
+    return data_en, _translate_graph_zh(data_en, model=model, show_prompt=show_prompt)
+
 
+def _translate_graph_zh(data_en: dict, *, model: str, show_prompt: bool) -> dict:
     english_json = json.dumps(data_en, ensure_ascii=False, indent=2)
     prompt_zh = f"Here is a flowchart JSON object in English:\n{english_json}\n\n{TRANSLATION_INSTRUCTION_ZH.strip()}"
     raw_zh = _call_model(prompt_zh, TRANSLATION_SYSTEM_PROMPT_ZH, model=model, show_prompt=show_prompt)
-    try:
-        data_zh = json.loads(raw_zh)
-    except json.JSONDecodeError as exc:
-        raise SystemExit(f"Chinese translation failed: {exc}\nRaw output:\n{raw_zh}") from exc
+    data_zh = _decode_reply(raw_zh, prompt_zh, TRANSLATION_SYSTEM_PROMPT_ZH, model=model, failure="Chinese translation failed")
     if isinstance(data_zh, dict):
         data_zh.setdefault("metadata", {}).update({"language": "zh"})
-    return data_en, data_zh
+    return data_zh
+
+
+def _local_build_graph(include_path: Path, *, language: Optional[str]) -> FlowGraph:
+    try:
+        from flow_ir import registry
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit("Missing dependency 'flow_ir'. Install it with `pip install -e Archive/stage1` (the `local` extra).") from exc
+
+    language = language or registry.language_for_path(include_path)
+    if language is None:
+        raise SystemExit(f"No flow_ir parser for {include_path}; pass --language (available: {', '.join(registry.list_languages())}).")
+    try:
+        parser = registry.get_parser(language)
+    except KeyError as exc:
+        raise SystemExit(exc.args[0]) from exc
+
+    try:
+        module = parser.parse_file(include_path)
+    except SyntaxError as exc:
+        raise SystemExit(f"flow_ir could not parse {include_path}: {exc}") from exc
+    except UnicodeDecodeError as exc:
+        raise SystemExit(f"Failed to read {include_path} as UTF-8: {exc}") from exc
+    if not module.functions:
+        raise SystemExit(f"flow_ir found no functions in {include_path}.")
+    graph = module_to_graph(module)
+    count = len(module.functions)
+    graph.metadata["title"] = include_path.name
+    graph.metadata["summary"] = f"Control flow of {count} function{'s' if count != 1 else ''} in {include_path.name}."
+    return graph
+
+
+def _label_graph(graph: FlowGraph, *, model: str, show_prompt: bool) -> None:
+    """Let the model write titles and summaries for a parsed graph; ids, types and edges stay local."""
+    encoded, ids = encode_graph(graph)
+    prompt = f"Control-flow graph of {graph.metadata.get('title', 'the source file')}:\n{encoded}\n\n{LABEL_INSTRUCTION_EN.strip()}"
+    raw = _call_model(prompt, LABEL_SYSTEM_PROMPT_EN, model=model, show_prompt=show_prompt)
+    data = _decode_reply(raw, prompt, LABEL_SYSTEM_PROMPT_EN, model=model, failure="Graph labelling failed")
+    if not isinstance(data, dict):
+        _drop_response(prompt, LABEL_SYSTEM_PROMPT_EN, model=model)
+        raise SystemExit(f"Graph labelling failed: expected a JSON object\nRaw output:\n{raw}")
+    apply_labels(graph, data, ids)
+
+
+def _local_pipeline(include_path: Path, *, output_prefix: str, language: Optional[str], polish: bool, model: str, show_prompts: bool) -> Path:
+    """Build the English flowchart from flow_ir's CFGs, without the Stage 1/2 model calls."""
+    if not include_path.exists():
+        raise SystemExit(f"Input file not found: {include_path}")
+
+    start = perf_counter()
+    graph = _local_build_graph(include_path, language=language)
+    elapsed = perf_counter() - start
+    print(f"Built {len(graph.nodes)} nodes locally in {elapsed * 1000:.0f} ms.")
+    if polish:
+        _label_graph(graph, model=model, show_prompt=show_prompts)
+
+    en_path = Path(f"{output_prefix}_en.json")
+    en_path.write_text(json.dumps(graph_to_dict(graph), ensure_ascii=False, indent=2), encoding="utf-8")
+    en_stage2 = Path(f"{output_prefix}_en.stage2.json")
+    en_stage2.write_text(json.dumps(graph_to_stage2_module(graph), indent=2), encoding="utf-8")
+    print(f"Wrote flowcharts: {en_path}, {en_stage2}")
+    return en_stage2
+
+
+def _add_engine_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--engine", choices=ENGINES, default="llm", help="llm: explanation and graph from the models; local: graph from flow_ir parsers, no network (default: llm).")
+    p.add_argument("--language", type=str, help="flow_ir parser language for --engine local (default: from the file extension).")
+    p.add_argument("--polish", action="store_true", help="With --engine local, reword titles and summaries with the Stage 2 model.")
+    p.add_argument("--stage2-input", choices=STAGE2_INPUTS, default="narrative", help="With --engine llm, build the graph from the Stage 1 narrative or label the flow_ir CFG (ir: skips Stage 1; default: narrative).")
+    _add_cache_arguments(p)
+
+
+def _add_cache_arguments(p: argparse.ArgumentParser) -> None:
+    group = p.add_argument_group("response cache")
+    group.add_argument("--no-cache", action="store_true", help="Always call the API; neither read nor write cached responses.")
+    group.add_argument("--refresh", action="store_true", help="Ignore cached responses but store the new ones.")
+    group.add_argument("--cache-dir", type=Path, help="Cache directory (default: $FLOWCODE_CACHE_DIR or ~/.cache/flowcode).")
+    group.add_argument("--cache-ttl-days", type=float, default=DEFAULT_TTL / 86400, help="Expire cached responses after this many days; 0 keeps them (default: %(default)g).")
+    group.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024), help="Evict least recently used responses beyond this size; 0 is unlimited (default: %(default)g).")
 
 
 def build_generate_parser() -> argparse.ArgumentParser:
@@ -180,6 +349,7 @@ def build_generate_parser() -> argparse.ArgumentParser:
     p.add_argument("--model-stage1", type=str, default=DEFAULT_STAGE1_MODEL, help=f"Model for Stage 1 (default: {DEFAULT_STAGE1_MODEL}).")
     p.add_argument("--model-stage2", type=str, default=DEFAULT_STAGE2_MODEL, help=f"Model for Stage 2 (default: {DEFAULT_STAGE2_MODEL}).")
     p.add_argument("--show-prompts", action="store_true", help="Echo prompts sent to the model.")
+    _add_engine_arguments(p)
     return p
 
 
@@ -192,18 +362,27 @@ def build_view_parser() -> argparse.ArgumentParser:
     p.add_argument("--model-stage2", type=str, default=DEFAULT_STAGE2_MODEL, help=f"Model for Stage 2 (default: {DEFAULT_STAGE2_MODEL}).")
     p.add_argument("--lang", choices=("en", "zh"), default="en", help="Language to view (default: en).")
     p.add_argument("--show-prompts", action="store_true", help="Echo prompts sent to the model.")
+    _add_engine_arguments(p)
     return p
 
 
-def _generate_pipeline(include_path: Path, *, explanation: Path, output_prefix: str, model_stage1: str, model_stage2: str, show_prompts: bool) -> tuple[Path, Path]:
+def _generate_pipeline(include_path: Path, *, explanation: Path, output_prefix: str, model_stage1: str, model_stage2: str, show_prompts: bool, stage2_input: str = "narrative", language: Optional[str] = None) -> tuple[Path, Path]:
     if not include_path.exists():
         raise SystemExit(f"Input file not found: {include_path}")
 
-    narrative = _stage1_generate_narrative(include_path, model=model_stage1, show_prompt=show_prompts)
-    explanation.write_text(narrative, encoding="utf-8")
-    print(f"Wrote explanation to {explanation}")
+    if stage2_input == "ir":
+        # The parser supplies the structure, so Stage 1 is skipped and the model only labels nodes.
+        graph = _local_build_graph(include_path, language=language)
+        _label_graph(graph, model=model_stage2, show_prompt=show_prompts)
+        graph.metadata["language"] = "en"
+        en = graph_to_dict(graph)
+        zh = _translate_graph_zh(en, model=model_stage2, show_prompt=show_prompts)
+    else:
+        narrative = _stage1_generate_narrative(include_path, model=model_stage1, show_prompt=show_prompts)
+        explanation.write_text(narrative, encoding="utf-8")
+        print(f"Wrote explanation to {explanation}")
 
-    en, zh = _stage2_generate_graphs(narrative, model=model_stage2, show_prompt=show_prompts)
+        en, zh = _stage2_generate_graphs(narrative, model=model_stage2, show_prompt=show_prompts)
     en_path = Path(f"{output_prefix}_en.json")
     zh_path = Path(f"{output_prefix}_zh.json")
     en_path.write_text(json.dumps(en, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -223,15 +402,22 @@ def _generate_pipeline(include_path: Path, *, explanation: Path, output_prefix:
     return en_stage2, zh_stage2
 
 
-def _view_pipeline(include_path: Path, *, lang: str, explanation: Path, output_prefix: str, model_stage1: str, model_stage2: str, show_prompts: bool) -> None:
+def _view_pipeline(include_path: Path, *, lang: str, explanation: Path, output_prefix: str, model_stage1: str, model_stage2: str, show_prompts: bool, engine: str = "llm", language: Optional[str] = None, polish: bool = False, stage2_input: str = "narrative") -> None:
     # If user passed a Stage2 JSON file directly, use it
     if str(include_path).endswith(".stage2.json") and include_path.exists():
         src = include_path
+    elif engine == "local":
+        if lang != "en":
+            raise SystemExit("--engine local only produces English flowcharts; use --engine llm for --lang zh.")
+        # Rebuilding locally is cheap, so the graph always reflects the current source.
+        src = _local_pipeline(include_path, output_prefix=output_prefix, language=language, polish=polish, model=model_stage2, show_prompts=show_prompts)
+        _report_cache()
     else:
         en_stage2 = Path(f"{output_prefix}_en.stage2.json")
         zh_stage2 = Path(f"{output_prefix}_zh.stage2.json")
         if not (en_stage2.exists() and zh_stage2.exists()):
-            _generate_pipeline(include_path, explanation=explanation, output_prefix=output_prefix, model_stage1=model_stage1, model_stage2=model_stage2, show_prompts=show_prompts)
+            _generate_pipeline(include_path, explanation=explanation, output_prefix=output_prefix, model_stage1=model_stage1, model_stage2=model_stage2, show_prompts=show_prompts, stage2_input=stage2_input, language=language)
+            _report_cache()
         src = en_stage2 if lang == "en" else zh_stage2
 
     # Copy selected language file into Vite public dir for serving
@@ -267,12 +453,23 @@ def main(argv: Optional[list[str]] = None) -> None:
     if argv_list and argv_list[0] == "view":
         parser = build_view_parser()
         args = parser.parse_args(argv_list[1:])
-        _view_pipeline(args.filename, lang=args.lang, explanation=args.explanation, output_prefix=args.output_prefix, model_stage1=args.model_stage1, model_stage2=args.model_stage2, show_prompts=args.show_prompts)
+        _configure_cache(args)
+        _view_pipeline(args.filename, lang=args.lang, explanation=args.explanation, output_prefix=args.output_prefix, model_stage1=args.model_stage1, model_stage2=args.model_stage2, show_prompts=args.show_prompts, engine=args.engine, language=args.language, polish=args.polish, stage2_input=args.stage2_input)
         return
 
     parser = build_generate_parser()
     args = parser.parse_args(argv_list)
-    _generate_pipeline(args.filename, explanation=args.explanation, output_prefix=args.output_prefix, model_stage1=args.model_stage1, model_stage2=args.model_stage2, show_prompts=args.show_prompts)
+    _configure_cache(args)
+    if args.engine == "local":
+        _local_pipeline(args.filename, output_prefix=args.output_prefix, language=args.language, polish=args.polish, model=args.model_stage2, show_prompts=args.show_prompts)
+        _report_cache()
+        if args.open_ui:
+            # The local graph was just written, so the view reuses it instead of rebuilding.
+            _view_pipeline(Path(f"{args.output_prefix}_en.stage2.json"), lang="en", explanation=args.explanation, output_prefix=args.output_prefix, model_stage1=args.model_stage1, model_stage2=args.model_stage2, show_prompts=args.show_prompts)
+        return
+
+    _generate_pipeline(args.filename, explanation=args.explanation, output_prefix=args.output_prefix, model_stage1=args.model_stage1, model_stage2=args.model_stage2, show_prompts=args.show_prompts, stage2_input=args.stage2_input, language=args.language)
+    _report_cache()
     if args.open_ui:
         _view_pipeline(args.filename, lang="en", explanation=args.explanation, output_prefix=args.output_prefix, model_stage1=args.model_stage1, model_stage2=args.model_stage2, show_prompts=args.show_prompts)
 
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import unittest
+
+from flowcode_renderer.compact import apply_labels, encode_graph
+from flowcode_renderer.models import FlowGraph, GraphEdge, GraphNode
+
+
+def build_graph() -> FlowGraph:
+    steps = [
+        ("total:n0", "Start", "start"),
+        ("total:n1", "End", "end"),
+        ("total:n2", "count = 0", "process"),
+        ("total:n3", "count += len(items)", "process"),
+        ("total:n4", "if count > 3", "decision"),
+        ("total:n5", "print(count)", "process"),
+    ]
+    graph = FlowGraph(entry_node="total:n0", metadata={"title": "total.py"})
+    for node_id, title, node_type in steps:
+        graph.nodes[node_id] = GraphNode(id=node_id, title=title, summary=title, type=node_type)
+    graph.edges = [
+        GraphEdge("total:n0", "total:n2"),
+        GraphEdge("total:n2", "total:n3"),
+        GraphEdge("total:n3", "total:n4"),
+        GraphEdge("total:n4", "total:n5", "True"),
+        GraphEdge("total:n4", "total:n1", "False"),
+        GraphEdge("total:n5", "total:n1"),
+    ]
+    return graph
+
+
+class CompactEncodingTests(unittest.TestCase):
+    def test_encode_graph(self) -> None:
+        text, ids = encode_graph(build_graph())
+        lines = text.splitlines()
+        self.assertEqual(lines[0], "# total")
+        self.assertEqual(lines[1], "1 start Start -> 3")
+        self.assertEqual(lines[5], "5 decision if count > 3 -> 6 (True), 2 (False)")
+        self.assertEqual(ids[4], "total:n4")
+
+    def test_apply_labels_and_merge(self) -> None:
+        graph = build_graph()
+        _, ids = encode_graph(graph)
+        apply_labels(
+            graph,
+            {
+                "metadata": {"title": "Count items"},
+                "nodes": [{"id": "3", "title": "Count the items"}, {"id": "99", "title": "Ignored"}],
+                # 5 → 6 is a branch, not a chain, so the second group is rejected.
+                "merge": [["3", "4"], ["5", "6"]],
+            },
+            ids,
+        )
+        self.assertEqual(graph.metadata["title"], "Count items")
+        self.assertNotIn("total:n3", graph.nodes)
+        self.assertIn("total:n5", graph.nodes)
+        head = graph.nodes["total:n2"]
+        self.assertEqual(head.title, "Count the items")
+        self.assertEqual(head.detail, "count = 0\ncount += len(items)")
+        self.assertIn(("total:n2", "total:n4"), {(edge.source, edge.target) for edge in graph.edges})
+        self.assertTrue(all(edge.source in graph.nodes and edge.target in graph.nodes for edge in graph.edges))
+
+    def test_merge_never_swallows_a_decision_or_terminator(self) -> None:
+        graph = build_graph()
+        _, ids = encode_graph(graph)
+        # Both are single-successor chains, but they include the decision and the start.
+        apply_labels(graph, {"merge": [["4", "5"], ["1", "3"]]}, ids)
+        self.assertEqual(len(graph.nodes), 6)
+        self.assertEqual(graph.nodes["total:n4"].type, "decision")
+        self.assertEqual(graph.nodes["total:n0"].type, "start")
+        self.assertEqual({edge.label for edge in graph.edges if edge.source == "total:n4"}, {"True", "False"})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
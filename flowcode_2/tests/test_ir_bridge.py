@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import unittest
+
+from flowcode_renderer.converter import graph_to_stage2_module
+from flowcode_renderer.ir_bridge import function_to_graph, module_to_graph, module_to_graphs
+
+try:
+    from flow_ir.parsers.python_parser import PythonParser
+except ImportError:  # pragma: no cover - Stage 1 package not on the path
+    PythonParser = None
+
+SAMPLE_CODE = '''
+def check(value):
+    """Classify a value."""
+    if value > 10:
+        return "big"
+    return "small"
+
+
+def loop(items):
+    for item in items:
+        print(item)
+'''
+
+
+@unittest.skipIf(PythonParser is None, "flow_ir is not importable")
+class IRBridgeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = PythonParser().parse_code(SAMPLE_CODE, file_path="sample.py")
+
+    def test_function_to_graph(self) -> None:
+        function = self.module.functions[0]
+        graph = function_to_graph(function, language=self.module.language)
+        self.assertEqual(list(graph.nodes), [node.id for node in function.nodes])
+        self.assertEqual(len(graph.edges), len(function.edges))
+        self.assertEqual(graph.nodes[graph.entry_node].type, "start")
+        self.assertIn("decision", {node.type for node in graph.nodes.values()})
+        self.assertEqual(graph.metadata["title"], "check")
+        self.assertEqual(graph.metadata["summary"], "Classify a value.")
+
+        module = graph_to_stage2_module(graph)
+        kinds = {node["kind"] for node in module["functions"][0]["nodes"]}
+        self.assertLessEqual({"start", "end", "conditional"}, kinds)
+
+    def test_module_graphs(self) -> None:
+        graphs = list(module_to_graphs(self.module))
+        self.assertEqual([graph.metadata["title"] for graph in graphs], ["check", "loop"])
+
+        merged = module_to_graph(self.module)
+        self.assertEqual(len(merged.nodes), sum(len(fn.nodes) for fn in self.module.functions))
+        self.assertEqual(merged.entry_node, "check:n0")
+        self.assertTrue(all(edge.source in merged.nodes and edge.target in merged.nodes for edge in merged.edges))
+        self.assertIn("loop", {node.type for node in merged.nodes.values()})
+
+    def test_module_graph_keeps_functions_with_the_same_name_apart(self) -> None:
+        code = "def f(x):\n    if x:\n        return 1\n    return 2\n\n\ndef f(x):\n    return x\n"
+        module = PythonParser().parse_code(code)
+        self.assertEqual([fn.name for fn in module.functions], ["f", "f"])
+
+        merged = module_to_graph(module)
+        self.assertEqual(len(merged.nodes), sum(len(fn.nodes) for fn in module.functions))
+        self.assertIn("f#2:n0", merged.nodes)
+        self.assertEqual(len(merged.edges), sum(len(fn.edges) for fn in module.functions))
+        for edge in merged.edges:
+            self.assertEqual(edge.source.partition(":")[0], edge.target.partition(":")[0])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
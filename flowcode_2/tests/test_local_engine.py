@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from flowcode_renderer import orchestrator
+from flowcode_renderer.parser import parse_graph
+
+try:
+    import flow_ir  # noqa: F401
+except ImportError:  # pragma: no cover - Stage 1 package not on the path
+    flow_ir = None
+
+SAMPLE_CODE = '''
+def check(value):
+    if value > 10:
+        return "big"
+    return "small"
+'''
+
+
+@unittest.skipIf(flow_ir is None, "flow_ir is not importable")
+class LocalEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = Path(self.tmp.name) / "sample.py"
+        self.source.write_text(SAMPLE_CODE, encoding="utf-8")
+        self.prefix = str(Path(self.tmp.name) / "flowchart")
+
+    def run_main(self, *extra: str) -> None:
+        with mock.patch.object(orchestrator, "_openai_client", side_effect=AssertionError("network used")):
+            with redirect_stdout(StringIO()):
+                orchestrator.main([str(self.source), "--engine", "local", "--output-prefix", self.prefix, *extra])
+
+    def test_local_engine_writes_graph_without_model_calls(self) -> None:
+        self.run_main()
+        graph = parse_graph(Path(f"{self.prefix}_en.json"))
+        self.assertEqual(graph.entry_node, "check:n0")
+        self.assertIn("decision", {node.type for node in graph.nodes.values()})
+
+        stage2 = json.loads(Path(f"{self.prefix}_en.stage2.json").read_text(encoding="utf-8"))
+        self.assertEqual(len(stage2["functions"][0]["nodes"]), len(graph.nodes))
+        self.assertFalse(Path(f"{self.prefix}_zh.json").exists())
+
+    def test_syntax_error_is_reported_without_a_traceback(self) -> None:
+        self.source.write_text("def broken(:\n    pass\n", encoding="utf-8")
+        with self.assertRaises(SystemExit) as raised:
+            self.run_main()
+        self.assertIn("could not parse", str(raised.exception.code))
+        self.assertFalse(Path(f"{self.prefix}_en.json").exists())
+
+    def test_polish_only_changes_text(self) -> None:
+        polished = {
+            "metadata": {"title": "Size check", "summary": "Classifies a value."},
+            # Short ids from the compact encoding: 3 is check:n2, the ``if`` node.
+            "nodes": [
+                {"id": "3", "title": "Is it large?", "summary": "Checks whether the value exceeds 10.", "type": "end"},
+                {"id": "invented", "title": "Extra", "summary": "Not in the graph."},
+            ],
+            "edges": [],
+        }
+        with mock.patch.object(orchestrator, "_call_model", return_value=json.dumps(polished)) as call:
+            self.run_main("--polish")
+        call.assert_called_once()
+        self.assertIn("3 decision if value > 10", call.call_args.args[0])
+
+        graph = parse_graph(Path(f"{self.prefix}_en.json"))
+        self.assertEqual(graph.metadata["title"], "Size check")
+        self.assertEqual(graph.nodes["check:n2"].title, "Is it large?")
+        self.assertEqual(graph.nodes["check:n2"].type, "decision")
+        self.assertEqual(len(graph.nodes), 5)
+        self.assertTrue(graph.edges)
+
+    def test_ir_stage2_input_skips_the_narrative(self) -> None:
+        labels = json.dumps({"metadata": {"title": "Size check"}, "nodes": [{"id": "3", "title": "Is it large?"}]})
+        translated = json.dumps({"metadata": {"title": "大小检查"}, "nodes": [], "edges": []})
+        explanation = Path(self.tmp.name) / "explanation.txt"
+        with mock.patch.object(orchestrator, "_stage1_generate_narrative", side_effect=AssertionError("stage 1 used")):
+            with mock.patch.object(orchestrator, "_call_model", side_effect=[labels, translated]) as call:
+                with redirect_stdout(StringIO()):
+                    orchestrator.main(
+                        [str(self.source), "--stage2-input", "ir", "--output-prefix", self.prefix, "--explanation", str(explanation)]
+                    )
+        self.assertEqual(call.call_count, 2)
+        self.assertFalse(explanation.exists())
+
+        graph = parse_graph(Path(f"{self.prefix}_en.json"))
+        self.assertEqual(graph.metadata["language"], "en")
+        self.assertEqual(graph.nodes["check:n2"].title, "Is it large?")
+        self.assertTrue(Path(f"{self.prefix}_zh.stage2.json").exists())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from flowcode_renderer import orchestrator
+from flowcode_renderer.cache import ResponseCache
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+
+    def test_round_trip_and_expiry(self) -> None:
+        cache = ResponseCache(self.directory, ttl=60)
+        self.assertIsNone(cache.get("m", "inst", "prompt"))
+        cache.put("m", "inst", "prompt", "answer")
+        self.assertEqual(cache.get("m", "inst", "prompt"), "answer")
+        self.assertIsNone(cache.get("other-model", "inst", "prompt"))
+        self.assertEqual((cache.stats.hits, cache.stats.misses, cache.stats.writes), (1, 2, 1))
+
+        with mock.patch("flowcode_renderer.cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.get("m", "inst", "prompt"))
+        self.assertFalse(list(self.directory.glob("*/*.json")))
+
+        refreshing = ResponseCache(self.directory, refresh=True)
+        refreshing.put("m", "inst", "prompt", "answer")
+        self.assertIsNone(refreshing.get("m", "inst", "prompt"))
+        self.assertEqual(ResponseCache(self.directory).get("m", "inst", "prompt"), "answer")
+
+    def test_size_eviction_drops_least_recently_used(self) -> None:
+        cache = ResponseCache(self.directory, max_bytes=None)
+        for index in range(3):
+            cache.put("m", "inst", f"prompt {index}", "x" * 1000)
+        now = time.time()
+        for index in range(3):
+            path = cache._path(cache.key("m", "inst", f"prompt {index}"))
+            os.utime(path, (now - 100 + index, now - 100 + index))
+        cache.get("m", "inst", "prompt 0")
+
+        cache.max_bytes = 2500
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNotNone(cache.get("m", "inst", "prompt 0"))
+        self.assertIsNone(cache.get("m", "inst", "prompt 1"))
+        self.assertIsNotNone(cache.get("m", "inst", "prompt 2"))
+
+    def test_put_removes_its_temp_file_when_the_write_fails(self) -> None:
+        cache = ResponseCache(self.directory)
+        with mock.patch("flowcode_renderer.cache.json.dump", side_effect=OSError("disk full")):
+            cache.put("m", "inst", "prompt", "answer")
+        self.assertEqual([path for path in self.directory.rglob("*") if path.is_file()], [])
+        self.assertEqual(cache.stats.writes, 0)
+
+    def test_orchestrator_caches_only_replies_that_parse(self) -> None:
+        client = mock.Mock()
+        client.responses.create.side_effect = [
+            SimpleNamespace(output_text="not json"),
+            SimpleNamespace(output_text='{"nodes": []}'),
+        ]
+        args = SimpleNamespace(no_cache=False, refresh=False, cache_dir=self.directory, cache_ttl_days=1, cache_max_mb=1)
+
+        def ask() -> object:
+            raw = orchestrator._call_model("prompt", "inst", model="m", show_prompt=False)
+            return orchestrator._decode_reply(raw, "prompt", "inst", model="m", failure="Graph labelling failed")
+
+        with mock.patch.object(orchestrator, "_RESPONSE_CACHE", None):
+            orchestrator._configure_cache(args)
+            with mock.patch.object(orchestrator, "_openai_client", return_value=client) as make_client:
+                with self.assertRaises(SystemExit):
+                    ask()
+                self.assertEqual(ask(), {"nodes": []})
+                self.assertEqual(ask(), {"nodes": []})
+            self.assertEqual(make_client.call_count, 2)
+            self.assertEqual(orchestrator._RESPONSE_CACHE.stats.hits, 1)
+
+            orchestrator._configure_cache(SimpleNamespace(**{**vars(args), "no_cache": True}))
+            self.assertIsNone(orchestrator._RESPONSE_CACHE)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    unittest.main()